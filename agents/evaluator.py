@@ -1,15 +1,192 @@
+import random
 import re
+from typing import Optional
 from models.llm_factory import LLMProvider, LLMFactory
+from models.scheduler import Priority, scheduled
+from models.schemas import EvaluatorResult
 from core.prompts import get_evaluator_prompt
+from core.steps import LLMCall, Steps, run_steps
+from storage.reference_answers import ReferenceAnswerStore
+from storage.answer_index import AnswerIndex
+from utils.text_fingerprint import normalize_tokens
+from utils.validators import RobustnessValidator
+from config import settings
+
+
+def _llm_result_schema() -> dict:
+    # Reuse bookkeeping fields are filled locally, never by the model
+    schema = EvaluatorResult.model_json_schema()
+    for field in ('reused_from', 'similarity'):
+        schema['properties'].pop(field, None)
+    return schema
 
 
 class EvaluatorAgent:
-    def __init__(self, llm_provider: LLMProvider = None):
-        self.llm = llm_provider or LLMFactory.create_cheap_provider()
+    RESULT_SCHEMA = _llm_result_schema()
+    # The Interviewer's next question waits for the score, so it is not background work
+    PRIORITY = Priority.STANDARD
+    
+    def __init__(self, llm_provider: LLMProvider = None,
+                 reference_store: ReferenceAnswerStore = None,
+                 answer_index: AnswerIndex = None):
+        self.llm = scheduled(llm_provider or LLMFactory.create_cheap_provider(), self.PRIORITY,
+                             hints={'agent': 'evaluator'})
+        self.reference_store = reference_store
+        self.answer_index = answer_index
     
     def evaluate_response(self, state: dict, interviewer_question: str) -> dict:
-        system_prompt = get_evaluator_prompt(state, interviewer_question)
+        return run_steps(self.evaluate_steps(state, interviewer_question))
+    
+    def evaluate_steps(self, state: dict, interviewer_question: str) -> Steps[dict]:
+        """Steps of evaluate_response()."""
+        user_message = state.get('user_message', '')
+        
+        # Near-duplicate of an already graded answer: reuse it, except on a verification sample
+        match = None
+        if self.answer_index is not None and interviewer_question:
+            match = self.answer_index.find(interviewer_question, user_message)
+            if match is not None and random.random() >= settings.ANSWER_REUSE_VERIFY_RATE:
+                return self._reused_output(match)
+        
+        reference_answer = self._reference_answer(state, interviewer_question)
+        system_prompt = get_evaluator_prompt(state, interviewer_question, reference_answer)
+        max_tokens = settings.EVALUATOR_MAX_TOKENS_WITH_REFERENCE if reference_answer else settings.EVALUATOR_MAX_TOKENS
+        # The router gives answers to hard questions to the main model
+        llm = self.llm.hinted(difficulty=state.get('current_difficulty', 3))
+        
+        result = None
+        if settings.STRUCTURED_OUTPUT:
+            result = yield from self._evaluate_structured(system_prompt, max_tokens, llm)
+        
+        structured = result is not None
+        if not structured:
+            evaluation = yield from self._evaluate_text(system_prompt, max_tokens, llm)
+            result = EvaluatorResult(
+                correctness=self._extract_correctness(evaluation),
+                score=self._extract_score(evaluation),
+                comment=evaluation,
+                correct_answer=self._extract_correct_answer(evaluation)
+            )
+        
+        if reference_answer:
+            if result.correctness != 'correct':
+                result.correct_answer = reference_answer
+        elif self.reference_store is not None and result.correct_answer and interviewer_question:
+            self.reference_store.save(interviewer_question, result.correct_answer)
+        
+        if self.answer_index is not None and interviewer_question:
+            if match is not None:
+                self.answer_index.record_verification(match[0], match[1], result)
+            self.answer_index.add(interviewer_question, user_message, result)
+        
+        evaluation = self._format_evaluation(result) if structured else result.comment
+        return self._build_output(result, evaluation)
+    
+    def evaluate_heuristic(self, state: dict, interviewer_question: str) -> dict:
+        """Score the answer without an LLM call (SLO degrade mode).
+        
+        A near-duplicate graded answer is reused as is. Otherwise the score
+        is the share of reference answer terms the candidate used, or a
+        neutral score from the answer's technical content when there is
+        no reference answer. Results are not added to the answer index.
         
+        Args:
+            state: Current interview state
+            interviewer_question: Question the candidate answered
+            
+        Returns:
+            Dict in the same format as evaluate_response
+        """
+        user_message = state.get('user_message', '')
+        if self.answer_index is not None and interviewer_question:
+            match = self.answer_index.find(interviewer_question, user_message)
+            if match is not None:
+                return self._reused_output(match)
+        
+        reference_answer = self._reference_answer(state, interviewer_question)
+        if RobustnessValidator.detect_evasion(user_message):
+            score, basis = 0.2, "кандидат не ответил по существу"
+        elif reference_answer:
+            reference_terms = set(normalize_tokens(reference_answer))
+            coverage = len(reference_terms & set(normalize_tokens(user_message))) / max(1, len(reference_terms))
+            # Half of the reference terms already counts as a full answer
+            score = round(0.2 + 0.7 * min(1.0, coverage * 2), 2)
+            basis = f"покрытие эталонного ответа {coverage:.0%}"
+        elif RobustnessValidator.contains_technical_content(user_message) and \
+                not RobustnessValidator.is_too_short(user_message, min_words=8):
+            score, basis = 0.6, "развернутый технический ответ, эталона нет"
+        else:
+            score, basis = 0.4, "короткий ответ, эталона нет"
+        
+        correctness = 'correct' if score >= settings.PERFORMANCE_THRESHOLD_HIGH else \
+            'partial' if score >= settings.PERFORMANCE_THRESHOLD_LOW else 'incorrect'
+        result = EvaluatorResult(correctness=correctness, score=score,
+                                 comment=f"Эвристическая оценка без LLM: {basis}",
+                                 correct_answer=reference_answer if correctness != 'correct' else '')
+        return self._build_output(result, self._format_evaluation(result))
+    
+    def _reference_answer(self, state: dict, interviewer_question: str) -> str:
+        # Bank questions carry their reference answer; otherwise try the cache
+        reference_answer = state.get('reference_answer', '')
+        if not reference_answer and self.reference_store is not None and interviewer_question:
+            reference_answer = self.reference_store.lookup(interviewer_question) or ''
+        return reference_answer
+    
+    def _reused_output(self, match: tuple) -> dict:
+        evaluation_id, result, similarity = match
+        result.reused_from = evaluation_id
+        result.similarity = round(similarity, 3)
+        evaluation = (f"{self._format_evaluation(result)}\n"
+                      f"(оценка повторно использована: #{evaluation_id}, сходство {similarity:.2f})")
+        return self._build_output(result, evaluation)
+    
+    def _build_output(self, result: EvaluatorResult, evaluation: str) -> dict:
+        return {
+            'evaluation': evaluation,
+            'score': result.score,
+            'correctness': result.correctness,
+            'correct_answer': result.correct_answer,
+            'feedback': evaluation,
+            'result': result
+        }
+    
+    def _evaluate_structured(self, system_prompt: str, max_tokens: int,
+                             llm: LLMProvider) -> Steps[Optional[EvaluatorResult]]:
+        """Request the evaluation as a schema-validated JSON object.
+        
+        Args:
+            system_prompt: Evaluator system prompt
+            max_tokens: Output token limit
+            llm: Provider view carrying this answer's routing hints
+            
+        Returns:
+            EvaluatorResult or None if the provider returned invalid JSON
+        """
+        prompt = """Оцените технический ответ кандидата.
+
+Верните JSON-объект:
+{
+  "correctness": "correct" | "partial" | "incorrect",
+  "score": число от 0.0 до 1.0,
+  "comment": "краткий комментарий: полнота и глубина понимания",
+  "correct_answer": "правильный ответ, если в ответе кандидата есть ошибки, иначе пустая строка"
+}"""
+        
+        try:
+            data = yield LLMCall(
+                llm,
+                'generate_json',
+                prompt=prompt,
+                schema=self.RESULT_SCHEMA,
+                system_prompt=system_prompt,
+                temperature=0.3,
+                max_tokens=max_tokens
+            )
+            return EvaluatorResult.model_validate(data)
+        except ValueError:
+            return None
+    
+    def _evaluate_text(self, system_prompt: str, max_tokens: int, llm: LLMProvider) -> Steps[str]:
         prompt = """Оцените технический ответ кандидата по следующим критериям:
 
 1. Фактическая корректность (correct/incorrect/partial)
@@ -19,28 +196,32 @@ class EvaluatorAgent:
 
 Если ответ содержит ошибки, укажите ПРАВИЛЬНЫЙ ответ.
 
-Формат: [Evaluator]: <корректность> | Балл: <число> | <комментарий>
+Формат: <корректность> | Балл: <число> | <комментарий>
 Правильный ответ (если нужен): <ответ>"""
         
-        evaluation = self.llm.generate(
+        evaluation = yield LLMCall(
+            llm,
+            'generate',
             prompt=prompt,
             system_prompt=system_prompt,
             temperature=0.3,
-            max_tokens=500
+            max_tokens=max_tokens
         )
+        return evaluation.strip()
+    
+    def _format_evaluation(self, result: EvaluatorResult) -> str:
+        """Render a structured evaluation as a one-line log entry.
         
-        # Parse evaluation
-        score = self._extract_score(evaluation)
-        correctness = self._extract_correctness(evaluation)
-        correct_answer = self._extract_correct_answer(evaluation)
-        
-        return {
-            'evaluation': evaluation.strip(),
-            'score': score,
-            'correctness': correctness,
-            'correct_answer': correct_answer,
-            'feedback': evaluation.strip()
-        }
+        Args:
+            result: Structured evaluation
+            
+        Returns:
+            Human-readable evaluation text
+        """
+        text = f"{result.correctness} | Балл: {result.score:.2f} | {result.comment}"
+        if result.correct_answer:
+            text += f"\nПравильный ответ: {result.correct_answer}"
+        return text
     
     def _extract_score(self, evaluation: str) -> float:
         """Extract numerical score from evaluation.
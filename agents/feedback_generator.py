@@ -1,15 +1,44 @@
 import json
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from models.llm_factory import LLMProvider, LLMFactory
-from models.schemas import FinalFeedback, KnowledgeGap
-from core.prompts import get_feedback_prompt
+from models.scheduler import Priority, scheduled
+from models.schemas import FinalFeedback, KnowledgeGap, Turn
+from core.prompts import get_feedback_prompt, get_feedback_section_prompt
+from utils.json_stream import StreamingJSONParser
+from config import settings
 
 
 class FeedbackGeneratorAgent:
-    def __init__(self, llm_provider: LLMProvider = None):
-        self.llm = llm_provider or LLMFactory.create_provider()
+    REQUIRED_FIELDS = [
+        'grade',
+        'hiring_recommendation',
+        'confidence_score',
+        'confirmed_skills',
+        'knowledge_gaps',
+        'soft_skills',
+        'roadmap'
+    ]
+    # Large report calls yield to the turns of live interviews
+    PRIORITY = Priority.BACKGROUND
     
-    def generate_feedback(self, state: dict) -> FinalFeedback:
+    def __init__(self, llm_provider: LLMProvider = None, cheap_llm_provider: LLMProvider = None):
+        hints = {'agent': 'feedback'}
+        self.llm = scheduled(llm_provider or LLMFactory.create_provider(), self.PRIORITY, hints=hints)
+        self.cheap_llm = scheduled(cheap_llm_provider or LLMFactory.create_cheap_provider(), self.PRIORITY,
+                                   hints=hints)
+    
+    def generate_feedback(self, state: dict,
+                          on_field: Optional[Callable[[str, Any], None]] = None) -> FinalFeedback:
+        """Generate the final report, streaming fields as they are produced.
+        
+        Args:
+            state: Interview state
+            on_field: Called with (field, value) as soon as a report field closes
+            
+        Returns:
+            FinalFeedback object
+        """
         interview_history = self._build_interview_history(state)
         
         system_prompt = get_feedback_prompt(state, interview_history)
@@ -39,30 +68,335 @@ class FeedbackGeneratorAgent:
 
 Будьте объективны и конструктивны."""
         
-        response = self.llm.generate(
+        parser = StreamingJSONParser(on_field=on_field)
+        for chunk in self.llm.stream(
             prompt=prompt,
             system_prompt=system_prompt,
             temperature=0.5,
             max_tokens=2000
-        )
+        ):
+            parser.feed(chunk)
         
-        # Parse JSON response
-        feedback_data = self._parse_feedback_json(response)
-        
-        # Create FinalFeedback object
-        feedback = FinalFeedback(
-            grade=feedback_data.get('grade', 'Junior'),
-            hiring_recommendation=feedback_data.get('hiring_recommendation', 'No Hire'),
-            confidence_score=float(feedback_data.get('confidence_score', 50)),
-            confirmed_skills=feedback_data.get('confirmed_skills', []),
-            knowledge_gaps=[
-                KnowledgeGap(**gap) for gap in feedback_data.get('knowledge_gaps', [])
-            ],
-            soft_skills=feedback_data.get('soft_skills', {}),
-            roadmap=feedback_data.get('roadmap', [])
-        )
+        feedback_data = dict(parser.finish())
+        
+        # Single-shot repair: ask only for the fields the stream did not deliver
+        missing = [field for field in self.REQUIRED_FIELDS if field not in feedback_data]
+        if missing:
+            recovered = self._request_missing_fields(missing, feedback_data, system_prompt)
+            for field, value in recovered.items():
+                feedback_data[field] = value
+                if on_field:
+                    on_field(field, value)
+        
+        defaults = self._fallback_parse(parser.buffer)
+        for field in self.REQUIRED_FIELDS:
+            if field not in feedback_data:
+                feedback_data[field] = defaults[field]
+        
+        return self._build_feedback(feedback_data)
+    
+    def generate_sectioned_feedback(self, state: dict,
+                                    on_field: Optional[Callable[[str, Any], None]] = None) -> FinalFeedback:
+        """Generate the final report as several smaller concurrent calls.
+        
+        The verdict comes from the main model; knowledge gaps, soft skills
+        and roadmap come from the cheap model. Gaps are built only from
+        turns the Evaluator marked incorrect or partial.
+        
+        Args:
+            state: Interview state
+            on_field: Called with (field, value) as each section completes
+            
+        Returns:
+            FinalFeedback object
+        """
+        system_prompt = get_feedback_section_prompt(state, self._build_interview_history(state))
+        failed_turns = self._get_failed_turns(state)
+        
+        failed_summary = "\n".join(
+            f"- Вопрос: {question}\n  Ответ: {turn.user_message}"
+            + (f"\n  Правильный ответ: {turn.evaluator_result.correct_answer}"
+               if turn.evaluator_result and turn.evaluator_result.correct_answer else "")
+            for question, turn in failed_turns
+        ) or "Нет"
+        
+        sections = [
+            (self.llm, ['grade', 'hiring_recommendation', 'confidence_score', 'confirmed_skills'], 400,
+             """Вынесите вердикт по кандидату. Верните JSON-объект:
+{
+  "grade": "Junior|Middle|Senior",
+  "hiring_recommendation": "Hire|No Hire|Strong Hire",
+  "confidence_score": 0-100,
+  "confirmed_skills": ["навык1", "навык2", ...]
+}"""),
+            (self.cheap_llm, ['soft_skills'], 300,
+             """Оцените коммуникативные навыки кандидата. Верните JSON-объект:
+{
+  "soft_skills": {
+    "clarity": "оценка 1-10 + комментарий",
+    "honesty": "комментарий о честности",
+    "engagement": "комментарий о вовлеченности"
+  }
+}"""),
+            (self.cheap_llm, ['roadmap'], 600,
+             f"""Составьте план развития (8-12 конкретных пунктов) с приоритетом на пробелы:
+{failed_summary}
+
+Верните JSON-объект: {{"roadmap": ["тема для изучения 1", "тема 2", ...]}}""")
+        ]
+        if failed_turns:
+            sections.append(
+                (self.cheap_llm, ['knowledge_gaps'], 800,
+                 f"""Ниже ответы, где кандидат ошибся или ответил частично:
+{failed_summary}
+
+Для каждого сформулируйте тему, краткий ответ кандидата и правильный ответ. Верните JSON-объект:
+{{"knowledge_gaps": [{{"topic": "тема", "user_answer": "что ответил кандидат", "correct_answer": "правильный ответ"}}]}}""")
+            )
         
-        return feedback
+        feedback_data: Dict[str, Any] = {'knowledge_gaps': self._gaps_from_turns(failed_turns)}
+        full_schema = FinalFeedback.model_json_schema()
+        
+        with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+            futures = {
+                executor.submit(self._generate_section, llm, fields, prompt, max_tokens,
+                                system_prompt, full_schema): fields
+                for llm, fields, max_tokens, prompt in sections
+            }
+            # Callbacks run on the calling thread as sections finish
+            for future in as_completed(futures):
+                for field, value in future.result().items():
+                    feedback_data[field] = value
+                    if on_field:
+                        on_field(field, value)
+        
+        defaults = self._fallback_parse("")
+        for field in self.REQUIRED_FIELDS:
+            if field not in feedback_data:
+                feedback_data[field] = defaults[field]
+        
+        return self._build_feedback(feedback_data)
+    
+    def generate_incremental_feedback(self, state: dict, summary: dict, summary_text: str,
+                                      on_field: Optional[Callable[[str, Any], None]] = None) -> FinalFeedback:
+        """Synthesise the final report from material aggregated during the interview.
+        
+        Confirmed skills and knowledge gaps are already known and reported
+        immediately; one main-model call produces the verdict, soft skills
+        and roadmap from the compact summary.
+        
+        Args:
+            state: Interview state
+            summary: ReportBuilder.get_summary() result
+            summary_text: Summary formatted for the prompt
+            on_field: Called with (field, value) as each field becomes available
+            
+        Returns:
+            FinalFeedback object
+        """
+        feedback_data: Dict[str, Any] = {
+            'confirmed_skills': summary['confirmed_skills'],
+            'knowledge_gaps': summary['knowledge_gaps']
+        }
+        if on_field:
+            for field, value in feedback_data.items():
+                on_field(field, value)
+        
+        system_prompt = get_feedback_section_prompt(state, summary_text)
+        candidates = ', '.join(summary['roadmap_candidates']) or 'Нет'
+        prompt = f"""Вынесите вердикт по кандидату на основе сводки интервью и составьте план развития
+(8-12 конкретных пунктов, начиная с тем: {candidates}). Верните JSON-объект:
+{{
+  "grade": "Junior|Middle|Senior",
+  "hiring_recommendation": "Hire|No Hire|Strong Hire",
+  "confidence_score": 0-100,
+  "soft_skills": {{
+    "clarity": "оценка 1-10 + комментарий",
+    "honesty": "комментарий о честности",
+    "engagement": "комментарий о вовлеченности"
+  }},
+  "roadmap": ["тема для изучения 1", "тема 2", ...]
+}}"""
+        
+        fields = ['grade', 'hiring_recommendation', 'confidence_score', 'soft_skills', 'roadmap']
+        verdict = self._generate_section(self.llm, fields, prompt, 700, system_prompt,
+                                         FinalFeedback.model_json_schema())
+        for field, value in verdict.items():
+            feedback_data[field] = value
+            if on_field:
+                on_field(field, value)
+        
+        if 'roadmap' not in feedback_data and summary['roadmap_candidates']:
+            feedback_data['roadmap'] = [f"Изучить: {topic}" for topic in summary['roadmap_candidates']]
+        
+        defaults = self._fallback_parse("")
+        for field in self.REQUIRED_FIELDS:
+            if field not in feedback_data:
+                feedback_data[field] = defaults[field]
+        
+        return self._build_feedback(feedback_data)
+    
+    def _generate_section(self, llm: LLMProvider, fields: List[str], prompt: str,
+                          max_tokens: int, system_prompt: str, full_schema: dict) -> dict:
+        """Generate one report section as JSON.
+        
+        Args:
+            llm: Provider for this section
+            fields: FinalFeedback fields produced by the section
+            prompt: Section prompt
+            max_tokens: Output token limit
+            system_prompt: Shared section system prompt
+            full_schema: FinalFeedback JSON schema
+            
+        Returns:
+            Section fields, or an empty dict if the call failed
+        """
+        schema = {
+            'type': 'object',
+            'properties': {field: full_schema['properties'][field] for field in fields},
+            'required': fields
+        }
+        if '$defs' in full_schema:
+            schema['$defs'] = full_schema['$defs']
+        
+        try:
+            data = llm.generate_json(
+                prompt=prompt,
+                schema=schema,
+                system_prompt=system_prompt,
+                temperature=0.5,
+                max_tokens=max_tokens
+            )
+        except ValueError:
+            return {}
+        
+        return {field: data[field] for field in fields if field in data}
+    
+    def _get_failed_turns(self, state: dict) -> List[Tuple[str, Turn]]:
+        """Select turns the Evaluator marked incorrect or partial.
+        
+        A turn stores the candidate's answer together with the follow-up
+        question, so the answered question is the previous turn's message.
+        
+        Args:
+            state: Interview state
+            
+        Returns:
+            List of (answered question, turn) pairs
+        """
+        failed = []
+        previous_question = ""
+        for turn in state.get('turns', []):
+            if turn.evaluator_result is not None:
+                is_failed = turn.evaluator_result.correctness in ('incorrect', 'partial')
+            else:
+                # Logs written before structured evaluation only carry the score
+                is_failed = bool(turn.performance_metrics) and \
+                    turn.performance_metrics.get('score', 1.0) < settings.PERFORMANCE_THRESHOLD_HIGH
+            if is_failed:
+                failed.append((previous_question, turn))
+            previous_question = turn.agent_visible_message
+        return failed
+    
+    def _gaps_from_turns(self, failed_turns: List[Tuple[str, Turn]]) -> List[dict]:
+        """Build knowledge gaps directly from failed turns without the LLM.
+        
+        Used when the gaps section call fails or returns nothing.
+        
+        Args:
+            failed_turns: (answered question, turn) pairs marked incorrect or partial
+            
+        Returns:
+            List of knowledge gap dictionaries
+        """
+        return [
+            {
+                'topic': question[:80],
+                'user_answer': turn.user_message,
+                'correct_answer': turn.evaluator_result.correct_answer
+            }
+            for question, turn in failed_turns
+            if turn.evaluator_result and turn.evaluator_result.correct_answer
+        ]
+    
+    def _request_missing_fields(self, missing: List[str], known: dict,
+                                system_prompt: str) -> dict:
+        """Ask the LLM once for report fields missing from the streamed response.
+        
+        Args:
+            missing: Names of missing fields
+            known: Fields already recovered
+            system_prompt: Feedback system prompt
+            
+        Returns:
+            Recovered fields (may be incomplete)
+        """
+        full_schema = FinalFeedback.model_json_schema()
+        schema = {
+            'type': 'object',
+            'properties': {field: full_schema['properties'][field] for field in missing},
+            'required': missing
+        }
+        if '$defs' in full_schema:
+            schema['$defs'] = full_schema['$defs']
+        
+        prompt = f"""Отчет по интервью получен не полностью.
+
+УЖЕ ИЗВЕСТНО:
+{json.dumps(known, ensure_ascii=False)}
+
+Верните JSON-объект ТОЛЬКО с недостающими полями: {', '.join(missing)}"""
+        
+        try:
+            data = self.llm.generate_json(
+                prompt=prompt,
+                schema=schema,
+                system_prompt=system_prompt,
+                temperature=0.5,
+                max_tokens=1000
+            )
+        except ValueError:
+            return {}
+        
+        return {field: data[field] for field in missing if field in data}
+    
+    def _build_feedback(self, feedback_data: dict) -> FinalFeedback:
+        """Create FinalFeedback from parsed data, dropping malformed entries.
+        
+        Args:
+            feedback_data: Parsed report fields
+            
+        Returns:
+            FinalFeedback object
+        """
+        try:
+            confidence = float(str(feedback_data.get('confidence_score', 50)).rstrip('%'))
+        except ValueError:
+            confidence = 50.0
+        
+        knowledge_gaps = []
+        raw_gaps = feedback_data.get('knowledge_gaps')
+        for gap in raw_gaps if isinstance(raw_gaps, list) else []:
+            if not isinstance(gap, dict):
+                continue
+            try:
+                knowledge_gaps.append(KnowledgeGap(**gap))
+            except ValueError:
+                continue
+        
+        confirmed_skills = feedback_data.get('confirmed_skills')
+        soft_skills = feedback_data.get('soft_skills')
+        roadmap = feedback_data.get('roadmap')
+        
+        return FinalFeedback(
+            grade=str(feedback_data.get('grade') or 'Junior'),
+            hiring_recommendation=str(feedback_data.get('hiring_recommendation') or 'No Hire'),
+            confidence_score=confidence,
+            confirmed_skills=[str(s) for s in confirmed_skills] if isinstance(confirmed_skills, list) else [],
+            knowledge_gaps=knowledge_gaps,
+            soft_skills={str(k): str(v) for k, v in soft_skills.items()} if isinstance(soft_skills, dict) else {},
+            roadmap=[str(item) for item in roadmap] if isinstance(roadmap, list) else []
+        )
     
     def _build_interview_history(self, state: dict) -> str:
         """Build a formatted summary of the interview.
@@ -81,35 +415,18 @@ class FeedbackGeneratorAgent:
             history_parts.append(f"Вопрос: {turn.agent_visible_message}")
             history_parts.append(f"Ответ: {turn.user_message}")
             
-            if turn.internal_thoughts:
+            evaluation = turn.evaluator_result
+            if evaluation is not None:
+                history_parts.append(
+                    f"Оценка: {evaluation.correctness}, балл {evaluation.score:.2f}. {evaluation.comment}"
+                )
+                if evaluation.correctness != 'correct' and evaluation.correct_answer:
+                    history_parts.append(f"Правильный ответ: {evaluation.correct_answer}")
+            elif turn.internal_thoughts:
                 history_parts.append(f"Оценка: {turn.internal_thoughts}")
         
         return "\n".join(history_parts)
     
-    def _parse_feedback_json(self, response: str) -> dict:
-        """Parse JSON feedback from LLM response.
-        
-        Args:
-            response: LLM response text
-            
-        Returns:
-            Parsed feedback dictionary
-        """
-        # Try to extract JSON from response
-        try:
-            # Look for JSON block
-            start = response.find('{')
-            end = response.rfind('}') + 1
-            
-            if start != -1 and end > start:
-                json_str = response[start:end]
-                return json.loads(json_str)
-        except json.JSONDecodeError:
-            pass
-        
-        # Fallback: create basic feedback from text analysis
-        return self._fallback_parse(response)
-    
     def _fallback_parse(self, response: str) -> dict:
         """Fallback parser if JSON parsing fails.
         
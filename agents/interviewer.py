@@ -1,12 +1,33 @@
+from typing import Callable, Optional
 from models.llm_factory import LLMProvider, LLMFactory
-from core.prompts import get_interviewer_prompt
+from models.scheduler import Priority, scheduled
+from models.schemas import BankQuestion
+from core.prompts import get_interviewer_prompt, QUESTION_REPHRASE_PROMPT
+from core.steps import LLMCall, Steps, run_steps
+from core.topics import get_position_family, match_topic
+from storage.question_bank import QuestionBank
 
 
 class InterviewerAgent:
-    def __init__(self, llm_provider: LLMProvider = None):
-        self.llm = llm_provider or LLMFactory.create_provider()
+    # The candidate waits for every message this agent writes
+    PRIORITY = Priority.INTERACTIVE
     
-    def generate_response(self, state: dict) -> str:
+    def __init__(self, llm_provider: LLMProvider = None, question_bank: QuestionBank = None,
+                 rephrase_llm_provider: LLMProvider = None, cheap_llm_provider: LLMProvider = None):
+        hints = {'agent': 'interviewer'}
+        self.llm = scheduled(llm_provider or LLMFactory.create_provider(), self.PRIORITY, hints=hints)
+        self.question_bank = question_bank
+        self.rephrase_llm = scheduled(rephrase_llm_provider, self.PRIORITY,
+                                      hints={**hints, 'call': 'rephrase'}) if rephrase_llm_provider else None
+        # Used instead of the main model in SLO degrade mode
+        self.cheap_llm = scheduled(cheap_llm_provider, self.PRIORITY, hints=hints) if cheap_llm_provider else None
+    
+    def generate_response(self, state: dict, on_token: Optional[Callable[[str], None]] = None,
+                          use_cheap: bool = False) -> str:
+        return run_steps(self.response_steps(state, use_cheap), on_token)
+    
+    def response_steps(self, state: dict, use_cheap: bool = False) -> Steps[str]:
+        """Steps of generate_response(); the reply streams to the driver's on_token."""
         system_prompt = get_interviewer_prompt(state)
         context = self._build_context(state)
         
@@ -21,12 +42,23 @@ class InterviewerAgent:
 
 ПИШИТЕ КОРОТКО: 2-4 предложения. ТОЛЬКО русский. БЕЗ форматирования."""
         
-        response = self.llm.generate(
-            prompt=prompt,
-            system_prompt=system_prompt,
-            temperature=0.7,
-            max_tokens=500
-        )
+        llm = self.cheap_llm if use_cheap and self.cheap_llm is not None else self.llm
+        return (yield from self._complete(prompt, system_prompt, 500, llm))
+    
+    def _complete(self, prompt: str, system_prompt: str, max_tokens: int, llm: LLMProvider = None) -> Steps[str]:
+        """Generate an interviewer message, streamed if the driver has a token callback.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: Interviewer system prompt
+            max_tokens: Output token limit
+            llm: Provider to use (the main model if None)
+            
+        Returns:
+            Full message text
+        """
+        response = yield LLMCall(llm or self.llm, 'stream', prompt=prompt, system_prompt=system_prompt,
+                                 temperature=0.7, max_tokens=max_tokens)
         return response.strip()
     
     def _build_context(self, state: dict, window: int = 3) -> str:
@@ -42,7 +74,11 @@ class InterviewerAgent:
         
         return "\n".join(context_parts)
     
-    def generate_greeting(self, state: dict) -> str:
+    def generate_greeting(self, state: dict, on_token: Optional[Callable[[str], None]] = None) -> str:
+        return run_steps(self.greeting_steps(state), on_token)
+    
+    def greeting_steps(self, state: dict) -> Steps[str]:
+        """Steps of generate_greeting(); the greeting streams to the driver's on_token."""
         profile = state.get('candidate_profile')
         name = profile.name if profile else 'кандидат'
         position = profile.position if profile else 'разработчик'
@@ -59,10 +95,87 @@ class InterviewerAgent:
 
 ПИШИТЕ КОРОТКО: максимум 3-4 предложения. ТОЛЬКО русский язык. БЕЗ форматирования."""
         
-        response = self.llm.generate(
-            prompt=prompt,
-            system_prompt=system_prompt,
-            temperature=0.7,
-            max_tokens=1000
+        return (yield from self._complete(prompt, system_prompt, 1000, self.llm.hinted(call='greeting')))
+    
+    def select_bank_question(self, state: dict, topic_hint: str = None) -> Optional[BankQuestion]:
+        """Pick a bank question when the Observer's strategy maps cleanly onto the bank.
+        
+        Free generation is needed when the candidate asked a counter-question,
+        went off-topic or made a false claim, or when the next topic does not
+        map onto exactly one bank topic with an unused question.
+        
+        Args:
+            state: Current interview state
+            topic_hint: Free-text topic to map (defaults to the Observer's next_topic)
+            
+        Returns:
+            BankQuestion or None to fall back to free generation
+        """
+        if self.question_bank is None:
+            return None
+        
+        observer_result = state.get('observer_result')
+        if topic_hint is None:
+            if observer_result is None:
+                return None
+            if observer_result.off_topic or observer_result.hallucination:
+                return None
+            if '?' in state.get('user_message', ''):
+                return None
+            topic_hint = observer_result.next_topic
+        
+        profile = state.get('candidate_profile')
+        family = get_position_family(profile.position if profile else '')
+        topic = match_topic(topic_hint, self.question_bank.get_topics(family))
+        if topic is None:
+            return None
+        
+        return self.question_bank.get_question(
+            family, topic, state.get('current_difficulty', 3),
+            exclude_ids=state.get('asked_bank_questions', [])
         )
-        return response.strip()
+    
+    def present_bank_question(self, question: BankQuestion, state: dict) -> str:
+        """Turn a bank question into the next interviewer message.
+        
+        Args:
+            question: Selected bank question
+            state: Current interview state
+            
+        Returns:
+            Question text, rephrased on the cheap model if configured
+        """
+        return run_steps(self.bank_question_steps(question, state))
+    
+    def bank_question_steps(self, question: BankQuestion, state: dict) -> Steps[str]:
+        """Steps of present_bank_question()."""
+        if self.rephrase_llm is None:
+            return question.question
+        
+        response = yield LLMCall(
+            self.rephrase_llm,
+            'generate',
+            prompt=QUESTION_REPHRASE_PROMPT.format(
+                user_message=state.get('user_message', ''),
+                question=question.question
+            ),
+            temperature=0.5,
+            max_tokens=200
+        )
+        return response.strip() or question.question
+    
+    def greeting_from_bank(self, question: BankQuestion, state: dict) -> str:
+        """Build a template greeting around an opening bank question.
+        
+        Args:
+            question: Opening bank question
+            state: Current interview state
+            
+        Returns:
+            Greeting message
+        """
+        profile = state.get('candidate_profile')
+        name = profile.name if profile else 'кандидат'
+        position = profile.position if profile else 'разработчик'
+        return (f"Здравствуйте, {name}! Это техническое собеседование на позицию {position}: "
+                f"я задам несколько теоретических вопросов. Начнем. {question.question}")
@@ -1,15 +1,108 @@
+from typing import Optional
 from models.llm_factory import LLMProvider, LLMFactory
+from models.scheduler import Priority, scheduled
+from models.schemas import ObserverResult
 from core.prompts import get_observer_prompt
+from core.steps import LLMCall, Steps, run_steps
 from config import settings
 
 
 class ObserverAgent:
+    RESULT_SCHEMA = ObserverResult.model_json_schema()
+    PRIORITY = Priority.STANDARD
+    
     def __init__(self, llm_provider: LLMProvider = None):
-        self.llm = llm_provider or LLMFactory.create_cheap_provider()
+        self.llm = scheduled(llm_provider or LLMFactory.create_cheap_provider(), self.PRIORITY,
+                             hints={'agent': 'observer'})
     
     def analyze_response(self, state: dict) -> dict:
+        return run_steps(self.analyze_steps(state))
+    
+    def analyze_steps(self, state: dict) -> Steps[dict]:
+        """Steps of analyze_response()."""
         system_prompt = get_observer_prompt(state)
         
+        result = None
+        if settings.STRUCTURED_OUTPUT:
+            result = yield from self._analyze_structured(system_prompt)
+        if result is None:
+            result = yield from self._analyze_text(system_prompt, state)
+        else:
+            history_change = self._history_difficulty_change(state)
+            if history_change is not None:
+                result.difficulty_change = history_change
+        
+        return {
+            'analysis': result.analysis,
+            'difficulty_change': result.difficulty_change,
+            'strategy_decision': result.strategy_decision,
+            'result': result
+        }
+    
+    def carry_over(self, state: dict, analysis: str = None) -> dict:
+        """Skip the LLM analysis and keep the previous strategy.
+        
+        Used in SLO degrade mode and on turns the adaptive policy finds
+        stable. Difficulty still follows the score history rule; the topic
+        and strategy stay those of the last analysis.
+        
+        Args:
+            state: Current interview state
+            analysis: Note logged instead of the analysis
+            
+        Returns:
+            Dict in the same format as analyze_response
+        """
+        previous = state.get('observer_result')
+        result = ObserverResult(
+            analysis=analysis or "Анализ пропущен (режим деградации): стратегия предыдущего хода",
+            difficulty_change=self._history_difficulty_change(state) or 0,
+            strategy_decision=state.get('strategy_decision', ''),
+            next_topic=previous.next_topic if previous else ''
+        )
+        return {
+            'analysis': result.analysis,
+            'difficulty_change': result.difficulty_change,
+            'strategy_decision': result.strategy_decision,
+            'result': result
+        }
+    
+    def _analyze_structured(self, system_prompt: str) -> Steps[Optional[ObserverResult]]:
+        """Request the analysis as a schema-validated JSON object.
+        
+        Args:
+            system_prompt: Observer system prompt
+            
+        Returns:
+            ObserverResult or None if the provider returned invalid JSON
+        """
+        prompt = """Проанализируйте последний ответ кандидата и дайте рекомендации.
+
+Верните JSON-объект:
+{
+  "analysis": "краткий анализ: качество ответа, уверенность, пробелы",
+  "difficulty_change": -1 | 0 | 1,
+  "strategy_decision": "ОДНА конкретная рекомендация для следующего вопроса",
+  "next_topic": "тема следующего вопроса",
+  "off_topic": true | false,
+  "hallucination": true | false
+}"""
+        
+        try:
+            data = yield LLMCall(
+                self.llm,
+                'generate_json',
+                prompt=prompt,
+                schema=self.RESULT_SCHEMA,
+                system_prompt=system_prompt,
+                temperature=0.5,
+                max_tokens=400
+            )
+            return ObserverResult.model_validate(data)
+        except ValueError:
+            return None
+    
+    def _analyze_text(self, system_prompt: str, state: dict) -> Steps[ObserverResult]:
         prompt = """Проанализируйте последний ответ кандидата и дайте рекомендации:
 
 1. Оценка качества ответа (краткая)
@@ -20,25 +113,30 @@ class ObserverAgent:
 
 Дайте конкретную ОДНУ рекомендацию для следующего вопроса."""
         
-        analysis = self.llm.generate(
+        analysis = yield LLMCall(
+            self.llm,
+            'generate',
             prompt=prompt,
             system_prompt=system_prompt,
             temperature=0.5,
             max_tokens=400
         )
         
-        # Parse difficulty adjustment
-        difficulty_change = self._determine_difficulty_change(analysis, state)
-        
-        return {
-            'analysis': analysis.strip(),
-            'difficulty_change': difficulty_change,
-            'strategy_decision': self._extract_strategy(analysis)
-        }
+        return ObserverResult(
+            analysis=analysis.strip(),
+            difficulty_change=self._determine_difficulty_change(analysis, state),
+            strategy_decision=self._extract_strategy(analysis)
+        )
     
-    def _determine_difficulty_change(self, analysis: str, state: dict) -> int:
-        analysis_lower = analysis.lower()
+    def _history_difficulty_change(self, state: dict) -> Optional[int]:
+        """Numeric difficulty rule over the last two scores.
         
+        Args:
+            state: Current interview state
+            
+        Returns:
+            +1/-1 when the recent average crosses a threshold, otherwise None
+        """
         perf_history = state.get('performance_history', [])
         if len(perf_history) >= 2:
             recent_avg = sum(perf_history[-2:]) / 2
@@ -46,6 +144,14 @@ class ObserverAgent:
                 return 1
             elif recent_avg < settings.PERFORMANCE_THRESHOLD_LOW:
                 return -1
+        return None
+    
+    def _determine_difficulty_change(self, analysis: str, state: dict) -> int:
+        analysis_lower = analysis.lower()
+        
+        history_change = self._history_difficulty_change(state)
+        if history_change is not None:
+            return history_change
         if any(word in analysis_lower for word in ['усложнить', 'слишком просто', 'отлично', 'легко справляется']):
             return 1
         elif any(word in analysis_lower for word in ['упростить', 'сложно', 'не знает', 'пробелы', 'слабо']):
@@ -0,0 +1,129 @@
+"""Replay simulator: sequential early stop vs full-length interviews.
+
+Replays every interview log through StoppingRule at each confidence
+level, as the workflow would have run it with EARLY_STOP_ENABLED, and
+reports how many turns and LLM calls stopping early would have saved
+and how often the band settled on agrees with the full-length verdict
+(the final report's hiring_recommendation, or the band with the largest
+posterior mass after all turns when the log has no report).
+
+LLM calls per turn are read from the log: one for the Interviewer, one
+for the Evaluator unless the score was reused, one for the Observer
+unless its analysis was skipped; redirect turns cost none, and turns of
+logs without structured results count as three. Sessions in archives
+under the logs directory (python main.py --migrate-logs) are replayed too.
+
+Usage:
+    python -m benchmarks.early_stop [--logs DIR] [--confidence 0.8 0.9 0.95]
+"""
+
+import argparse
+import statistics
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+from core.stopping import BANDS, StoppingRule, is_scored, replay_turns
+from core.topics import get_position_topics
+from models.schemas import InterviewLog, Turn
+from utils.logger import InterviewLogger
+
+
+def turn_llm_calls(turn: Turn) -> int:
+    """LLM calls the workflow made for a logged turn."""
+    if not is_scored(turn):
+        return 0
+    if turn.observer_result is None:
+        return 3
+    calls = 1
+    if turn.evaluator_result is not None and turn.evaluator_result.reused_from is None:
+        calls += 1
+    if not turn.observer_result.analysis.startswith('Анализ пропущен'):
+        calls += 1
+    return calls
+
+
+def full_verdict(log: InterviewLog, rule: StoppingRule) -> str:
+    """Hiring band of the full-length interview."""
+    if log.final_feedback is not None:
+        recommendation = log.final_feedback.hiring_recommendation.strip().lower()
+        for band in BANDS:
+            if band.lower() == recommendation:
+                return band
+    probabilities = rule.band_probabilities()
+    return max(probabilities, key=probabilities.get)
+
+
+def simulate(log: InterviewLog, confidence: float) -> Optional[dict]:
+    """Replay one interview at one confidence level.
+    
+    Args:
+        log: Interview log
+        confidence: Posterior mass needed to stop
+    
+    Returns:
+        Dict with full and early turns and calls, the stop band and the
+        full verdict; None if the log has no scored turns
+    """
+    topics = get_position_topics(log.candidate_profile.position if log.candidate_profile else '')
+    rule = StoppingRule(confidence=confidence)
+    stopped_at, band = None, None
+    for turn, decision in replay_turns(rule, log.turns, topics):
+        if decision is not None and stopped_at is None:
+            stopped_at, band = turn.turn_id, decision[0]
+    if rule.turns == 0:
+        return None
+    
+    calls = [turn_llm_calls(turn) for turn in log.turns]
+    early = [i for i, turn in enumerate(log.turns) if stopped_at is None or turn.turn_id <= stopped_at]
+    verdict = full_verdict(log, rule)
+    return {
+        'turns': len(log.turns),
+        'early_turns': len(early),
+        'calls': sum(calls),
+        'early_calls': sum(calls[i] for i in early),
+        'band': band or verdict,
+        'verdict': verdict,
+        'stopped': stopped_at is not None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--logs', default=str(settings.LOGS_DIR), help='Directory with interview logs')
+    parser.add_argument('--confidence', type=float, nargs='+', default=[0.8, 0.9, 0.95])
+    args = parser.parse_args()
+    
+    logs: List[InterviewLog] = []
+    for key, open_log in InterviewLogger.iter_sessions(args.logs):
+        try:
+            logs.append(open_log())
+        except (ValueError, OSError) as e:
+            print(f"Пропущен {key}: {e}")
+    if not logs:
+        parser.error(f'no interview logs in {args.logs}')
+    
+    print(f"Logs: {len(logs)} from {args.logs}; min turns {settings.EARLY_STOP_MIN_TURNS}, "
+          f"min topics {settings.EARLY_STOP_MIN_TOPICS}, band edges {settings.EARLY_STOP_BAND_EDGES}")
+    print(f"{'confidence':<12}{'stopped':>9}{'turns full':>12}{'turns early':>13}"
+          f"{'calls saved':>13}{'agreement':>11}")
+    
+    for confidence in args.confidence:
+        results = [result for result in (simulate(log, confidence) for log in logs) if result is not None]
+        if not results:
+            continue
+        calls = sum(result['calls'] for result in results)
+        saved = calls - sum(result['early_calls'] for result in results)
+        stopped = sum(result['stopped'] for result in results)
+        agreement = sum(result['band'] == result['verdict'] for result in results) / len(results)
+        print(f"{confidence:<12.2f}{f'{stopped}/{len(results)}':>9}"
+              f"{statistics.mean(result['turns'] for result in results):>12.1f}"
+              f"{statistics.mean(result['early_turns'] for result in results):>13.1f}"
+              f"{f'{saved} ({saved / calls:.0%})' if calls else '0':>13}{agreement:>11.0%}")
+
+
+if __name__ == '__main__':
+    main()
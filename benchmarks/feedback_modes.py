@@ -0,0 +1,169 @@
+"""Wall-clock benchmark: single-call vs sectioned final report generation.
+
+By default providers are simulated: every call sleeps for a fixed network
+latency plus the tokens of the text it returns divided by the model's
+decode speed, which is what dominates report generation. Simulated sleeps
+are scaled down by --time-scale and reported back in simulated seconds;
+they show the shape of the gain, not a measurement.
+
+For real numbers, call the configured providers (--live), optionally
+recording every call with its latency to a cassette, and replay the
+cassette offline later (see benchmarks/provider_shootout.py).
+
+Usage:
+    python -m benchmarks.feedback_modes [--log PATH] [--runs N]
+    python -m benchmarks.feedback_modes --live [--cassette FILE --record]
+    python -m benchmarks.feedback_modes --cassette FILE [--time-scale S]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents import FeedbackGeneratorAgent
+from config import settings
+from benchmarks.provider_shootout import Cassette, CassetteProvider
+from models.llm_factory import LLMFactory, LLMProvider, ReasoningOptions
+from utils.logger import InterviewLogger
+
+
+SAMPLE_REPORT = {
+    'grade': 'Junior',
+    'hiring_recommendation': 'No Hire',
+    'confidence_score': 70,
+    'confirmed_skills': ['api', 'http'],
+    'knowledge_gaps': [
+        {'topic': 'HTTP-методы', 'user_answer': 'API это интерфейс', 'correct_answer': 'GET читает, POST создает'}
+    ],
+    'soft_skills': {'clarity': '6/10', 'honesty': 'Честен', 'engagement': 'Средняя'},
+    'roadmap': ['HTTP', 'REST', 'SQL', 'Индексы', 'Транзакции', 'Docker', 'Тестирование', 'Git']
+}
+
+
+class SimulatedProvider(LLMProvider):
+    """Provider that sleeps like a real model and returns a canned report."""
+    
+    def __init__(self, latency: float, tokens_per_second: float, time_scale: float = 1.0):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.time_scale = time_scale
+    
+    def _sleep(self, text: str):
+        # Decode time follows what the call returns, not its max_tokens budget
+        output_tokens = len(text) / 4
+        time.sleep((self.latency + output_tokens / self.tokens_per_second) * self.time_scale)
+    
+    def generate(self, prompt: str, system_prompt: Optional[str] = None,
+                 temperature: float = 0.7, max_tokens: int = 1000,
+                 reasoning: Optional[ReasoningOptions] = None) -> str:
+        text = json.dumps(SAMPLE_REPORT, ensure_ascii=False)
+        self._sleep(text)
+        return text
+    
+    def generate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                      temperature: float = 0.3, max_tokens: int = 500,
+                      reasoning: Optional[ReasoningOptions] = None) -> dict:
+        data = {field: SAMPLE_REPORT[field] for field in schema.get('properties', {})
+                if field in SAMPLE_REPORT}
+        self._sleep(json.dumps(data, ensure_ascii=False))
+        return data
+
+
+def load_state(log_path: str) -> dict:
+    """Rebuild the parts of the interview state the report needs from a log.
+    
+    Args:
+        log_path: Path to an interview JSON log
+    
+    Returns:
+        Interview state dictionary
+    """
+    log = InterviewLogger.load_log(log_path)
+    performance_history = [
+        turn.performance_metrics.get('score', 0.0) if turn.performance_metrics else 0.0
+        for turn in log.turns
+    ]
+    return {
+        'candidate_profile': log.candidate_profile,
+        'turns': log.turns,
+        'performance_history': performance_history,
+        'topics_covered': set(log.candidate_profile.topics_covered) if log.candidate_profile else set()
+    }
+
+
+def run(agent: FeedbackGeneratorAgent, state: dict, mode: str, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        if mode == 'sectioned':
+            agent.generate_sectioned_feedback(state)
+        else:
+            agent.generate_feedback(state)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    default_log = next(iter(sorted(settings.LOGS_DIR.glob('*.json'))), None)
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--log', default=str(default_log) if default_log else None,
+                        help='Interview log to build the report from')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--live', action='store_true', help='Use the configured providers')
+    parser.add_argument('--cassette', help='Replay recorded calls (or record them with --live --record)')
+    parser.add_argument('--record', action='store_true', help='Record the live calls to --cassette')
+    parser.add_argument('--time-scale', type=float, default=0.05,
+                        help='Simulated or replayed sleep multiplier (ignored with --live)')
+    args = parser.parse_args()
+    
+    if not args.log:
+        parser.error('no interview log found, pass --log')
+    if args.record and not (args.live and args.cassette):
+        parser.error('--record needs --live and --cassette')
+    
+    state = load_state(args.log)
+    
+    if args.cassette:
+        try:
+            cassette = Cassette(args.cassette, record=args.record)
+        except FileNotFoundError as e:
+            parser.error(str(e))
+        scale = 1.0 if args.live else args.time_scale
+        agent = FeedbackGeneratorAgent(
+            llm_provider=CassetteProvider(LLMFactory.create_provider(), cassette, scale),
+            cheap_llm_provider=CassetteProvider(LLMFactory.create_cheap_provider(), cassette, scale)
+        )
+    elif args.live:
+        agent = FeedbackGeneratorAgent()
+        scale = 1.0
+    else:
+        scale = args.time_scale
+        agent = FeedbackGeneratorAgent(
+            llm_provider=SimulatedProvider(latency=0.8, tokens_per_second=40, time_scale=scale),
+            cheap_llm_provider=SimulatedProvider(latency=0.4, tokens_per_second=120, time_scale=scale)
+        )
+    
+    source = 'live providers' if args.live else 'recorded calls' if args.cassette else 'simulated providers'
+    if args.record:
+        source += ', recording'
+    print(f"Log: {args.log} ({len(state['turns'])} turns), runs: {args.runs}, {source}")
+    print(f"{'mode':<12}{'mean, s':>10}{'min, s':>10}{'max, s':>10}")
+    
+    results = {}
+    for mode in ('single', 'sectioned'):
+        timings = [t / scale for t in run(agent, state, mode, args.runs)]
+        results[mode] = statistics.mean(timings)
+        print(f"{mode:<12}{results[mode]:>10.2f}{min(timings):>10.2f}{max(timings):>10.2f}")
+    
+    print(f"\nSpeedup: {results['single'] / results['sectioned']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
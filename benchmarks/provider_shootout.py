@@ -0,0 +1,640 @@
+"""Provider shoot-out: latency, tokens, cost and verdict agreement across backends.
+
+Replays recorded interview transcripts through each agent role and sends
+the same calls to every candidate provider/model at once:
+
+    evaluator    every scored answer, with the state the Evaluator saw live
+    observer     every scored answer, with the score history before it
+    interviewer  the next question after every scored answer
+    feedback     the final report of every session
+
+For each role and candidate it reports p50/p95 call latency, tokens,
+estimated cost (MODEL_PRICES, USD per 1000 input/output tokens) and how
+often the candidate agrees with the first candidate (the baseline) and
+with the transcript: evaluator scores within LARGE_DRIFT of each other,
+the same Observer difficulty change, the same final grade and hiring
+recommendation. The Interviewer's questions are free text and are only
+timed.
+
+Calls go to the configured providers by default. Offline:
+
+    --cassette FILE --record   record every response (with its latency and usage)
+    --cassette FILE            replay them, sleeping the recorded latency
+    --mock-server              serve candidates from a local OpenAI-compatible server
+                               (openrouter/openai candidates only)
+
+Mock and replayed latencies are scaled by --time-scale and reported back
+in real seconds.
+
+Usage:
+    python -m benchmarks.provider_shootout --candidates openrouter:MODEL openai:MODEL \\
+        [--logs DIR] [--sessions N] [--roles evaluator observer ...] [--concurrency N]
+        [--cassette FILE [--record]] [--mock-server] [--time-scale S] [--output FILE]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents import EvaluatorAgent, FeedbackGeneratorAgent, InterviewerAgent, ObserverAgent
+from config import settings
+from core.regrade import LARGE_DRIFT, LocalEvaluatorProvider, answer_states
+from models.llm_factory import LLMFactory, LLMProvider, ReasoningOptions
+from models.scheduler import lane_key, scheduled
+from models.schemas import InterviewLog
+from models.usage import usage_meter
+from storage.question_bank import QuestionBank
+from utils.logger import InterviewLogger
+from utils.validators import RobustnessValidator
+
+
+ROLES = ('evaluator', 'observer', 'interviewer', 'feedback')
+
+
+class Cassette:
+    """Recorded provider responses, one JSON line per call.
+    
+    A call is keyed by the provider class and model, the method and every
+    argument that shapes the response, so the same transcript replays
+    the same entries.
+    """
+    
+    def __init__(self, path: str, record: bool = False):
+        self.path = Path(path)
+        self.record = record
+        self.entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Line torn by an interrupted recording
+                        continue
+                    self.entries[entry['key']] = entry
+        elif not record:
+            raise FileNotFoundError(f"Cassette not found: {path}")
+    
+    @staticmethod
+    def key(provider: LLMProvider, method: str, **call: Any) -> str:
+        reasoning = call.get('reasoning')
+        call['reasoning'] = asdict(reasoning) if reasoning else None
+        payload = json.dumps([list(lane_key(provider)), method, call], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> dict:
+        entry = self.entries.get(key)
+        if entry is None:
+            raise ValueError(f"No cassette entry for call {key[:12]}")
+        return entry
+    
+    def add(self, key: str, model: str, response: Any, latency: float, usage: Dict[str, int]):
+        entry = {'key': key, 'model': model, 'response': response, 'latency': round(latency, 4),
+                 'usage': {field: usage[field] for field in ('prompt_tokens', 'completion_tokens',
+                                                             'reasoning_tokens')}}
+        with self._lock:
+            self.entries[key] = entry
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+class CassetteProvider(LLMProvider):
+    """Records the responses of a provider to a cassette, or replays them.
+    
+    Replay sleeps the recorded latency times time_scale and reports the
+    recorded usage, so timings and token counts match the recorded run.
+    Recorded latencies are divided by time_scale, which is how much
+    faster than real time the recorded provider runs (a mock server).
+    """
+    
+    def __init__(self, provider: LLMProvider, cassette: Cassette, time_scale: float = 1.0):
+        self.provider = provider
+        self.cassette = cassette
+        self.time_scale = time_scale
+        self.model = provider.model
+        self.lane_key = lane_key(provider)
+    
+    def _call(self, method: str, call: Dict[str, Any]) -> Any:
+        key = Cassette.key(self.provider, method, **call)
+        if not self.cassette.record:
+            entry = self.cassette.get(key)
+            time.sleep(entry['latency'] * self.time_scale)
+            usage_meter.record(entry['model'], **entry['usage'])
+            return entry['response']
+        
+        start = time.perf_counter()
+        with usage_meter.capture() as usage:
+            response = getattr(self.provider, method)(**call)
+        self.cassette.add(key, self.model, response, (time.perf_counter() - start) / self.time_scale, usage)
+        return response
+    
+    def generate(self, prompt: str, system_prompt: Optional[str] = None,
+                 temperature: float = 0.7, max_tokens: int = 1000,
+                 reasoning: Optional[ReasoningOptions] = None) -> str:
+        return self._call('generate', dict(prompt=prompt, system_prompt=system_prompt, temperature=temperature,
+                                           max_tokens=max_tokens, reasoning=reasoning))
+    
+    def generate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                      temperature: float = 0.3, max_tokens: int = 500,
+                      reasoning: Optional[ReasoningOptions] = None) -> dict:
+        return self._call('generate_json', dict(prompt=prompt, schema=schema, system_prompt=system_prompt,
+                                                temperature=temperature, max_tokens=max_tokens,
+                                                reasoning=reasoning))
+    
+    def stream(self, prompt: str, system_prompt: Optional[str] = None,
+               temperature: float = 0.7, max_tokens: int = 1000,
+               reasoning: Optional[ReasoningOptions] = None) -> Iterator[str]:
+        # Streams are recorded whole: the report times complete calls
+        call = dict(prompt=prompt, system_prompt=system_prompt, temperature=temperature,
+                    max_tokens=max_tokens, reasoning=reasoning)
+        if not self.cassette.record:
+            yield self._call('stream', call)
+            return
+        key = Cassette.key(self.provider, 'stream', **call)
+        chunks = []
+        start = time.perf_counter()
+        with usage_meter.capture() as usage:
+            for chunk in self.provider.stream(**call):
+                chunks.append(chunk)
+                yield chunk
+        self.cassette.add(key, self.model, ''.join(chunks), (time.perf_counter() - start) / self.time_scale, usage)
+
+
+class ProbeProvider(LLMProvider):
+    """Times every successful call of one (candidate, role) and counts its tokens.
+    
+    Sits under the agent's scheduled view, so scheduler queueing is not
+    part of the measured latency; calls count against the concurrency
+    limit of the wrapped model.
+    """
+    
+    def __init__(self, provider: LLMProvider):
+        self.provider = provider
+        self.model = provider.model
+        self.lane_key = lane_key(provider)
+        self.latencies: List[float] = []
+        self.tokens = dict.fromkeys(usage_meter.FIELDS, 0)
+        self._lock = threading.Lock()
+    
+    def _add(self, latency: float, usage: Dict[str, int]):
+        with self._lock:
+            self.latencies.append(latency)
+            for field, value in usage.items():
+                self.tokens[field] += value
+    
+    def generate(self, prompt: str, system_prompt: Optional[str] = None,
+                 temperature: float = 0.7, max_tokens: int = 1000,
+                 reasoning: Optional[ReasoningOptions] = None) -> str:
+        start = time.perf_counter()
+        with usage_meter.capture() as usage:
+            response = self.provider.generate(prompt, system_prompt, temperature, max_tokens, reasoning)
+        self._add(time.perf_counter() - start, usage)
+        return response
+    
+    def generate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                      temperature: float = 0.3, max_tokens: int = 500,
+                      reasoning: Optional[ReasoningOptions] = None) -> dict:
+        start = time.perf_counter()
+        with usage_meter.capture() as usage:
+            response = self.provider.generate_json(prompt, schema, system_prompt, temperature, max_tokens,
+                                                   reasoning)
+        self._add(time.perf_counter() - start, usage)
+        return response
+    
+    def stream(self, prompt: str, system_prompt: Optional[str] = None,
+               temperature: float = 0.7, max_tokens: int = 1000,
+               reasoning: Optional[ReasoningOptions] = None) -> Iterator[str]:
+        start = time.perf_counter()
+        with usage_meter.capture() as usage:
+            yield from self.provider.stream(prompt, system_prompt, temperature, max_tokens, reasoning)
+        self._add(time.perf_counter() - start, usage)
+
+
+class MockModelHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible /chat/completions answering like a model would.
+    
+    Each model name gets a stable latency, decode speed and score bias
+    derived from its hash. Evaluator prompts are graded by the offline
+    heuristic (LocalEvaluatorProvider) plus the model's bias and
+    per-answer noise; Observer and report prompts get valid JSON whose
+    verdict follows the scores in the prompt; anything else gets a
+    question. Sleeps are scaled by the server's time_scale.
+    """
+    
+    grader = LocalEvaluatorProvider()
+    HISTORY = re.compile(r'История производительности: \[([^\]]*)\]')
+    AVERAGE = re.compile(r'Средняя оценка: ([\d.]+)')
+    
+    def log_message(self, format: str, *args: Any):
+        pass
+    
+    @staticmethod
+    def profile(model: str) -> Tuple[float, float, float]:
+        """(latency in seconds, output tokens per second, score bias) of a mock model."""
+        h = zlib.crc32(model.encode('utf-8'))
+        return 0.2 + (h % 80) / 100, 30.0 + (h >> 8) % 120, ((h >> 16) % 21 - 10) / 100
+    
+    def _noise(self, model: str, text: str) -> float:
+        return (zlib.crc32(f"{model}\n{text}".encode('utf-8')) % 21 - 10) / 100
+    
+    def _evaluation(self, model: str, system_prompt: str, json_mode: bool) -> str:
+        _, _, bias = self.profile(model)
+        result = self.grader.generate_json('', {}, system_prompt=system_prompt)
+        result['score'] = round(min(1.0, max(0.0, result['score'] + bias + self._noise(model, system_prompt))), 2)
+        if json_mode:
+            return json.dumps(result, ensure_ascii=False)
+        return f"{result['correctness']} | Балл: {result['score']:.2f} | {result['comment']}"
+    
+    def _verdict_score(self, model: str, text: str, pattern: re.Pattern) -> float:
+        match = pattern.search(text)
+        scores = [float(value) for value in re.findall(r'[\d.]+', match.group(1))] if match else []
+        _, _, bias = self.profile(model)
+        return (statistics.fmean(scores) if scores else 0.5) + bias + self._noise(model, text)
+    
+    def _content(self, model: str, system_prompt: str, prompt: str, json_mode: bool) -> str:
+        if LocalEvaluatorProvider.PROMPT_FIELDS.search(system_prompt):
+            return self._evaluation(model, system_prompt, json_mode)
+        if '"hiring_recommendation"' in prompt:
+            score = self._verdict_score(model, system_prompt, self.AVERAGE)
+            band = 0 if score < settings.PERFORMANCE_THRESHOLD_LOW else \
+                2 if score > settings.PERFORMANCE_THRESHOLD_HIGH else 1
+            return json.dumps({
+                'grade': ('Junior', 'Middle', 'Senior')[band],
+                'hiring_recommendation': ('No Hire', 'Hire', 'Strong Hire')[band],
+                'confidence_score': 70,
+                'reasoning': f"Средняя оценка {score:.2f}",
+                'confirmed_skills': [],
+                'knowledge_gaps': [],
+                'soft_skills': {'clarity': '6/10', 'honesty': 'Честен', 'engagement': 'Средняя'},
+                'roadmap': ['Повторить основы']
+            }, ensure_ascii=False)
+        if '"difficulty_change"' in prompt or 'изменить сложность' in prompt:
+            score = self._verdict_score(model, system_prompt, self.HISTORY)
+            change = 1 if score > settings.PERFORMANCE_THRESHOLD_HIGH else \
+                -1 if score < settings.PERFORMANCE_THRESHOLD_LOW else 0
+            analysis = {'analysis': f"Средний балл {score:.2f}", 'difficulty_change': change,
+                        'strategy_decision': 'Следующий вопрос: уточнить детали', 'next_topic': '',
+                        'off_topic': False, 'hallucination': False}
+            return json.dumps(analysis, ensure_ascii=False) if json_mode else analysis['strategy_decision']
+        return "Хорошо. Расскажите подробнее, как бы вы применили это на практике?"
+    
+    def _send_json(self, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        model = request.get('model', '')
+        messages = request.get('messages', [])
+        system_prompt = next((m['content'] for m in messages if m['role'] == 'system'), '')
+        prompt = next((m['content'] for m in messages if m['role'] == 'user'), '')
+        json_mode = (request.get('response_format') or {}).get('type') == 'json_object'
+        content = self._content(model, system_prompt, prompt, json_mode)
+        
+        latency, tokens_per_second, _ = self.profile(model)
+        usage = {'prompt_tokens': (len(system_prompt) + len(prompt)) // 4, 'completion_tokens': len(content) // 4}
+        time_scale = self.server.time_scale
+        time.sleep(latency * time_scale)
+        decode = usage['completion_tokens'] / tokens_per_second * time_scale
+        
+        if not request.get('stream'):
+            time.sleep(decode)
+            self._send_json({'model': model, 'usage': usage,
+                             'choices': [{'message': {'role': 'assistant', 'content': content}}]})
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        pieces = [content[i:i + 40] for i in range(0, len(content), 40)]
+        for piece in pieces:
+            time.sleep(decode / len(pieces))
+            chunk = {'choices': [{'delta': {'content': piece}}]}
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+        self.wfile.write(f"data: {json.dumps({'choices': [], 'usage': usage})}\n\ndata: [DONE]\n\n".encode('utf-8'))
+        self.wfile.flush()
+
+
+def start_mock_server(time_scale: float) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve MockModelHandler on a free local port in a daemon thread.
+    
+    Returns:
+        (server, base URL ending in /v1)
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockModelHandler)
+    server.daemon_threads = True
+    server.time_scale = time_scale
+    threading.Thread(target=server.serve_forever, daemon=True, name='mock-llm').start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in [0, 1]), None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def load_logs(logs_dir: str, limit: int) -> List[Tuple[str, InterviewLog]]:
+    """The first `limit` sessions under a directory: JSON logs, then archived sessions not also logged."""
+    logs = []
+    for key, open_log in InterviewLogger.iter_sessions(logs_dir):
+        if len(logs) >= limit:
+            break
+        try:
+            logs.append((key, open_log()))
+        except (ValueError, OSError) as e:
+            print(f"Пропущен {key}: {e}")
+    return logs
+
+
+def iter_calls(logs: List[Tuple[str, InterviewLog]], roles: List[str],
+               question_bank: Optional[QuestionBank]) -> Iterator[Tuple[str, str, str, dict, Any]]:
+    """The calls to send to every candidate, rebuilt from the transcripts.
+    
+    Yields:
+        (role, call key, session, call arguments, logged verdict or None)
+    """
+    for session, log in logs:
+        profile = log.candidate_profile
+        history: List[float] = []
+        previous_observer = None
+        positions = {id(turn): index for index, turn in enumerate(log.turns)}
+        for turn, previous, score, state in answer_states(profile, log.turns, question_bank):
+            index = positions[id(turn)]
+            key = f"{session}#{turn.turn_id}"
+            question = previous.agent_visible_message if previous else ''
+            if 'evaluator' in roles and not RobustnessValidator.should_skip_evaluation(turn.user_message):
+                logged = (score, turn.evaluator_result.correctness if turn.evaluator_result else '')
+                yield 'evaluator', key, session, {'state': state, 'question': question}, logged
+            observer_state = {
+                **state,
+                'turns': log.turns[:index],
+                'performance_history': list(history),
+                'observer_result': previous_observer,
+                'strategy_decision': previous_observer.strategy_decision if previous_observer else ''
+            }
+            if 'observer' in roles:
+                logged = turn.observer_result.difficulty_change if turn.observer_result else None
+                yield 'observer', key, session, {'state': observer_state}, logged
+            history.append(score)
+            previous_observer = turn.observer_result or previous_observer
+            if 'interviewer' in roles:
+                yield 'interviewer', key, session, {'state': {
+                    **observer_state,
+                    'turns': log.turns[:index + 1],
+                    'performance_history': list(history),
+                    'strategy_decision': turn.observer_result.strategy_decision if turn.observer_result else ''
+                }}, None
+        if 'feedback' in roles and log.turns:
+            state = {
+                'candidate_profile': profile,
+                'turns': log.turns,
+                'performance_history': history,
+                'topics_covered': set(profile.topics_covered) if profile else set()
+            }
+            feedback = log.final_feedback
+            yield 'feedback', session, session, {'state': state}, \
+                (feedback.grade, feedback.hiring_recommendation) if feedback else None
+
+
+def make_call(role: str, probe: ProbeProvider, session: str, args: dict) -> Any:
+    """Run one role call on a candidate, as the agent would live.
+    
+    Returns:
+        The role's verdict: (score, correctness), difficulty change,
+        question text or (grade, hiring recommendation)
+    """
+    if role == 'evaluator':
+        agent = EvaluatorAgent(llm_provider=probe)
+        agent.llm = scheduled(agent.llm, session=session)
+        result = agent.evaluate_response(args['state'], args['question'])['result']
+        return result.score, result.correctness
+    if role == 'observer':
+        agent = ObserverAgent(llm_provider=probe)
+        agent.llm = scheduled(agent.llm, session=session)
+        return agent.analyze_response(args['state'])['difficulty_change']
+    if role == 'interviewer':
+        agent = InterviewerAgent(llm_provider=probe)
+        agent.llm = scheduled(agent.llm, session=session)
+        return agent.generate_response(args['state'])
+    agent = FeedbackGeneratorAgent(llm_provider=probe, cheap_llm_provider=probe)
+    agent.llm = scheduled(agent.llm, session=session)
+    feedback = agent.generate_feedback(args['state'])
+    return feedback.grade, feedback.hiring_recommendation
+
+
+def agrees(role: str, verdict: Any, other: Any) -> Optional[bool]:
+    """Whether two verdicts of a role agree; None when there is nothing to compare."""
+    if verdict is None or other is None or role == 'interviewer':
+        return None
+    if role == 'evaluator':
+        return abs(verdict[0] - other[0]) < LARGE_DRIFT
+    return verdict == other
+
+
+def share(values: List[Optional[bool]]) -> Optional[float]:
+    compared = [value for value in values if value is not None]
+    return round(sum(compared) / len(compared), 3) if compared else None
+
+
+def build_report(candidates: List[str], probes: Dict[Tuple[str, str], ProbeProvider],
+                 verdicts: Dict[str, Dict[str, Dict[str, Any]]], logged: Dict[str, Dict[str, Any]],
+                 errors: Dict[Tuple[str, str], int], scale: float) -> Dict[str, Dict[str, dict]]:
+    """Per role and candidate: calls, latency, tokens, cost and agreement.
+    
+    Returns:
+        {role: {candidate: stats}}
+    """
+    baseline = candidates[0]
+    report: Dict[str, Dict[str, dict]] = {}
+    for role, calls in verdicts.items():
+        for candidate in candidates:
+            probe = probes[(candidate, role)]
+            latencies = [latency / scale for latency in probe.latencies]
+            tokens = probe.tokens
+            prices = settings.MODEL_PRICES.get(probe.model)
+            cost = (prices[0] * tokens['prompt_tokens'] + prices[1] * tokens['completion_tokens']) / 1000 \
+                if prices else None
+            results = [(key, by_candidate[candidate]) for key, by_candidate in calls.items()
+                       if candidate in by_candidate]
+            stats = {
+                'model': probe.model,
+                'answers': len(results),
+                'errors': errors.get((candidate, role), 0),
+                'calls': len(latencies),
+                'p50': round(percentile(latencies, 0.5), 3) if latencies else None,
+                'p95': round(percentile(latencies, 0.95), 3) if latencies else None,
+                'prompt_tokens': tokens['prompt_tokens'],
+                'completion_tokens': tokens['completion_tokens'],
+                'reasoning_tokens': tokens['reasoning_tokens'],
+                'cost': round(cost, 4) if cost is not None else None,
+                'agreement_baseline': share([agrees(role, verdict, calls[key].get(baseline))
+                                             for key, verdict in results]),
+                'agreement_logged': share([agrees(role, verdict, logged[role].get(key)) for key, verdict in results])
+            }
+            if role == 'evaluator':
+                deltas = [abs(verdict[0] - calls[key][baseline][0]) for key, verdict in results
+                          if baseline in calls[key]]
+                stats['mean_abs_delta_baseline'] = round(statistics.fmean(deltas), 3) if deltas else None
+                stats['correctness_agreement_baseline'] = share([
+                    verdict[1] == calls[key][baseline][1] for key, verdict in results if baseline in calls[key]
+                ])
+            report.setdefault(role, {})[candidate] = stats
+    return report
+
+
+def print_report(report: Dict[str, Dict[str, dict]], baseline: str):
+    def cell(value: Any, fmt: str) -> str:
+        return '-' if value is None else format(value, fmt)
+    
+    print(f"\nBaseline: {baseline}; agreement: evaluator |Δscore| < {LARGE_DRIFT}, observer difficulty "
+          f"change, feedback grade + recommendation")
+    print(f"{'role':<12}{'candidate':<36}{'calls':>6}{'err':>5}{'p50, s':>8}{'p95, s':>8}"
+          f"{'tok in':>9}{'tok out':>9}{'cost, $':>9}{'vs base':>9}{'vs log':>8}")
+    for role, candidates in report.items():
+        for candidate, stats in candidates.items():
+            print(f"{role:<12}{candidate[:35]:<36}{stats['calls']:>6}{stats['errors']:>5}"
+                  f"{cell(stats['p50'], '.2f'):>8}{cell(stats['p95'], '.2f'):>8}"
+                  f"{stats['prompt_tokens']:>9}{stats['completion_tokens']:>9}{cell(stats['cost'], '.4f'):>9}"
+                  f"{cell(stats['agreement_baseline'], '.0%'):>9}{cell(stats['agreement_logged'], '.0%'):>8}")
+
+
+def parse_candidate(spec: str) -> LLMProvider:
+    """Provider for "provider[:model]" (the provider's main model if omitted)."""
+    provider_type, _, model = spec.partition(':')
+    return LLMFactory.create_provider(provider_type, model=model or None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--candidates', nargs='+',
+                        help='Providers as provider:model; the first is the baseline '
+                             '(default: the configured main and cheap model)')
+    parser.add_argument('--logs', default=str(settings.LOGS_DIR), help='Directory with interview logs')
+    parser.add_argument('--sessions', type=int, default=20, help='Sessions to replay')
+    parser.add_argument('--roles', nargs='+', choices=ROLES, default=list(ROLES))
+    parser.add_argument('--concurrency', type=int, default=8, help='Calls in flight at once')
+    parser.add_argument('--cassette', help='Cassette file to replay (or to write with --record)')
+    parser.add_argument('--record', action='store_true', help='Record the responses to --cassette')
+    parser.add_argument('--mock-server', action='store_true', help='Serve candidates from a local mock server')
+    parser.add_argument('--time-scale', type=float, default=0.05,
+                        help='Mock/replay sleep multiplier (ignored for live calls)')
+    parser.add_argument('--output', help='Write the full report as JSON')
+    args = parser.parse_args()
+    
+    if args.record and not args.cassette:
+        parser.error('--record needs --cassette')
+    replay = bool(args.cassette) and not args.record
+    if args.mock_server and replay:
+        parser.error('--mock-server replays nothing; drop it or pass --record')
+    
+    specs = args.candidates or list(dict.fromkeys([
+        f"{settings.LLM_PROVIDER}:{LLMFactory.create_provider().model}",
+        f"{settings.LLM_PROVIDER}:{LLMFactory.create_cheap_provider().model}"
+    ]))
+    
+    scale = args.time_scale if args.mock_server or replay else 1.0
+    if args.mock_server:
+        if any(spec.partition(':')[0] not in ('openrouter', 'openai') for spec in specs):
+            parser.error('--mock-server serves openrouter and openai candidates only')
+        _, base_url = start_mock_server(args.time_scale)
+        settings.OPENROUTER_API_URL = f"{base_url}/chat/completions"
+        os.environ['OPENAI_BASE_URL'] = base_url
+        os.environ.setdefault('OPENAI_API_KEY', 'mock')
+    
+    providers = {spec: parse_candidate(spec) for spec in specs}
+    if args.cassette:
+        try:
+            cassette = Cassette(args.cassette, record=args.record)
+        except FileNotFoundError as e:
+            parser.error(str(e))
+        providers = {spec: CassetteProvider(provider, cassette, scale) for spec, provider in providers.items()}
+    probes = {(spec, role): ProbeProvider(provider) for spec, provider in providers.items() for role in args.roles}
+    
+    logs = load_logs(args.logs, args.sessions)
+    if not logs:
+        parser.error(f'no interview logs in {args.logs}')
+    mode = 'mock server' if args.mock_server else 'replay' if replay else 'live'
+    if args.record:
+        mode += ', recording'
+    print(f"Sessions: {len(logs)} from {args.logs}; candidates: {', '.join(specs)}; {mode}")
+    
+    question_bank = QuestionBank.open_existing(settings.QUESTION_BANK_PATH)
+    verdicts: Dict[str, Dict[str, Dict[str, Any]]] = {role: {} for role in args.roles}
+    logged: Dict[str, Dict[str, Any]] = {role: {} for role in args.roles}
+    errors: Dict[Tuple[str, str], int] = {}
+    # First error message per (candidate, role), so a run that only failed says why
+    first_errors: Dict[Tuple[str, str], str] = {}
+    
+    def run_call(role: str, key: str, spec: str, session: str, call: dict) -> Tuple[str, str, str, Any]:
+        try:
+            return role, key, spec, make_call(role, probes[(spec, role)], session, call)
+        except Exception as e:
+            return role, key, spec, e
+    
+    def collect(future: Future):
+        role, key, spec, verdict = future.result()
+        if isinstance(verdict, Exception):
+            errors[(spec, role)] = errors.get((spec, role), 0) + 1
+            first_errors.setdefault((spec, role), f"{type(verdict).__name__}: {verdict}")
+        else:
+            verdicts[role].setdefault(key, {})[spec] = verdict
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency), thread_name_prefix='shootout') as executor:
+        pending = set()
+        for role, key, session, call, logged_verdict in iter_calls(logs, args.roles, question_bank):
+            logged[role][key] = logged_verdict
+            # The same call goes to every candidate at once
+            for spec in specs:
+                if len(pending) >= args.concurrency * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future)
+                pending.add(executor.submit(run_call, role, key, spec, session, call))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future)
+    elapsed = (time.perf_counter() - start) / scale
+    
+    report = build_report(specs, probes, verdicts, logged, errors, scale)
+    print_report(report, specs[0])
+    if first_errors:
+        print("\nОшибки (первая для кандидата и роли):")
+        for (spec, role), message in sorted(first_errors.items()):
+            print(f"  {spec} {role} ({errors[(spec, role)]}): {message}")
+    print(f"\nWall time: {elapsed:.1f} s")
+    if args.output:
+        failures = {f"{spec} {role}": {'count': errors[(spec, role)], 'first': message}
+                    for (spec, role), message in sorted(first_errors.items())}
+        Path(args.output).write_text(json.dumps({'candidates': specs, 'mode': mode, 'roles': report,
+                                                 'errors': failures}, ensure_ascii=False, indent=2),
+                                     encoding='utf-8')
+        print(f"Полный отчет: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""Memory benchmark: bytes per session for pydantic vs compact interview state.
+
+Builds many synthetic sessions in each representation and measures the
+heap they hold with tracemalloc:
+
+  pydantic  dict state, CandidateProfile, list of pydantic Turns, list scores
+  compact   SessionState, CompactProfile, in-memory TurnStore of CompactTurns
+  spill     compact, with turns beyond TURN_STORE_HOT_TURNS spilled to disk
+
+Every session gets its own copies of the same message texts, so the
+numbers include the text a real session holds.
+
+Usage:
+    python -m benchmarks.session_memory [--sessions N] [--turns 20 200]
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+from memory import TurnStore
+from models.compact import CompactProfile, CompactTurn, SessionState
+from models.schemas import CandidateProfile, EvaluatorResult, ObserverResult, Turn
+
+
+TOPICS = ['databases', 'sql', 'api design', 'testing', 'concurrency', 'architecture']
+
+
+def _fresh(text: str) -> str:
+    # A new string object, like one parsed from an LLM response
+    return (text + '.')[:-1]
+
+
+def make_turn(turn_id: int) -> Turn:
+    topic = TOPICS[turn_id % len(TOPICS)]
+    score = (turn_id % 10) / 10
+    return Turn(
+        turn_id=turn_id,
+        agent_visible_message=f"Вопрос {turn_id}: расскажите, как вы применяли {topic} в последнем проекте?",
+        user_message=f"Ответ {turn_id}: использовал {topic} для сервиса заказов, настраивал и тестировал.",
+        internal_thoughts=f"[Observer]: ответ {turn_id} частичный | [Evaluator]: partial | Score: {score:.2f}",
+        performance_metrics={'score': score},
+        observer_result=ObserverResult(
+            analysis=f"Кандидат {turn_id} знает основы, но без деталей",
+            difficulty_change=0,
+            strategy_decision=f"Уточнить детали по теме {topic}",
+            next_topic=_fresh(topic)
+        ),
+        evaluator_result=EvaluatorResult(
+            correctness=_fresh('partial'),
+            score=score,
+            comment=f"Ответ {turn_id} неполный",
+            correct_answer=f"Эталон {turn_id}: {topic} описывается так"
+        )
+    )
+
+
+def _base_state(turn_count: int) -> dict:
+    return {
+        'current_turn_id': turn_count,
+        'user_message': '',
+        'agent_message': '',
+        'internal_thoughts': '',
+        'current_difficulty': 3,
+        'performance_history': [(i % 10) / 10 for i in range(turn_count)],
+        'cumulative_score': 0.45,
+        'topics_covered': {_fresh(topic) for topic in TOPICS},
+        'topics_to_cover': [_fresh(topic) for topic in TOPICS],
+        'should_continue': True,
+        'interview_complete': False,
+        'off_topic_count': 0,
+        'observer_analysis': '',
+        'evaluator_feedback': '',
+        'strategy_decision': '',
+        'observer_result': None,
+        'reference_answer': '',
+        'asked_bank_questions': []
+    }
+
+
+def build_pydantic(turn_count: int):
+    state = _base_state(turn_count)
+    state['candidate_profile'] = CandidateProfile(
+        name='Кандидат', position=_fresh('Backend Developer'), grade=_fresh('Junior'),
+        experience='3 года Python и PostgreSQL'
+    )
+    state['turns'] = [make_turn(i + 1) for i in range(turn_count)]
+    return state
+
+
+def _build_compact(turn_count: int, hot_size) -> SessionState:
+    store = TurnStore(hot_size=hot_size)
+    for i in range(turn_count):
+        store.append(CompactTurn.from_model(make_turn(i + 1)))
+    state = _base_state(turn_count)
+    state['candidate_profile'] = CompactProfile('Кандидат', _fresh('Backend Developer'), _fresh('Junior'),
+                                                '3 года Python и PostgreSQL')
+    state['turns'] = store
+    state['topics_covered'] = {sys.intern(topic) for topic in state['topics_covered']}
+    state['topics_to_cover'] = [sys.intern(topic) for topic in state['topics_to_cover']]
+    return SessionState(**state)
+
+
+def build_compact(turn_count: int):
+    return _build_compact(turn_count, None)
+
+
+def build_spill(turn_count: int):
+    return _build_compact(turn_count, settings.TURN_STORE_HOT_TURNS or None)
+
+
+def bytes_per_session(build: Callable, turn_count: int, sessions: int) -> float:
+    """Heap held by `sessions` live sessions, divided by their number.
+    
+    Args:
+        build: Builds one session
+        turn_count: Turns per session
+        sessions: Number of sessions kept alive at once
+    
+    Returns:
+        Average bytes per session
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    held = [build(turn_count) for _ in range(sessions)]
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    
+    total = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    for state in held:
+        if isinstance(state['turns'], TurnStore):
+            state['turns'].close()
+    return total / sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=50, help='Sessions held at once')
+    parser.add_argument('--turns', type=int, nargs='+', default=[20, 200])
+    args = parser.parse_args()
+    
+    builders = {'pydantic': build_pydantic, 'compact': build_compact, 'spill': build_spill}
+    print(f"Sessions: {args.sessions}, hot turns for spill: {settings.TURN_STORE_HOT_TURNS}")
+    print(f"{'turns':<8}" + ''.join(f"{name + ', KB':>16}" for name in builders) + f"{'saved':>10}")
+    
+    for turn_count in args.turns:
+        results = {name: bytes_per_session(build, turn_count, args.sessions)
+                   for name, build in builders.items()}
+        saved = 1 - results['compact'] / results['pydantic']
+        print(f"{turn_count:<8}" + ''.join(f"{results[name] / 1024:>16.1f}" for name in builders)
+              + f"{saved:>10.0%}")
+
+
+if __name__ == '__main__':
+    main()
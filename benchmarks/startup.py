@@ -0,0 +1,111 @@
+"""Startup benchmark based on `python -X importtime`.
+
+Runs each entry point in a fresh interpreter several times and reports
+the median wall time, the total import time of application and
+third-party modules, and the slowest imports (cumulative):
+
+  help      python main.py --help
+  workflow  import core.workflow and construct an InterviewWorkflow
+  server    import server
+
+No provider is called; SDK clients are created on the first request.
+
+Usage:
+    python -m benchmarks.startup [--runs N] [--top N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+ROOT = Path(__file__).parent.parent
+
+WORKFLOW_SNIPPET = (
+    "import os, tempfile\n"
+    "from core.workflow import InterviewWorkflow\n"
+    "InterviewWorkflow(log_filepath=os.path.join(tempfile.mkdtemp(), 'log.json'), verbose=False).close()\n"
+)
+
+ENTRY_POINTS = {
+    'help': ['main.py', '--help'],
+    'workflow': ['-c', WORKFLOW_SNIPPET],
+    'server': ['-c', 'import server']
+}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Parse `-X importtime` output.
+    
+    Args:
+        stderr: Interpreter stderr
+    
+    Returns:
+        (module, self us, cumulative us) for every imported module
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure(args: List[str], runs: int) -> Dict:
+    """Run one entry point `runs` times.
+    
+    Args:
+        args: Interpreter arguments
+        runs: Number of fresh interpreters
+    
+    Returns:
+        Median wall time, median import time and the imports of the last run
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    walls, import_totals, rows = [], [], []
+    with tempfile.TemporaryDirectory() as cwd_logs:
+        env['TURN_STORE_SPILL_DIR'] = cwd_logs
+        for _ in range(runs):
+            started = time.perf_counter()
+            result = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=ROOT, env=env,
+                                    capture_output=True, text=True)
+            walls.append(time.perf_counter() - started)
+            if result.returncode != 0:
+                raise RuntimeError(f"{' '.join(args)} failed:\n{result.stderr[-2000:]}")
+            rows = parse_importtime(result.stderr)
+            import_totals.append(sum(self_us for _, self_us, _ in rows))
+    return {'wall': statistics.median(walls), 'imports': statistics.median(import_totals) / 1e6,
+            'rows': rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per entry point')
+    parser.add_argument('--top', type=int, default=8, help='Slowest top-level imports to list')
+    args = parser.parse_args()
+    
+    results = {name: measure(entry, args.runs) for name, entry in ENTRY_POINTS.items()}
+    
+    print(f"Runs: {args.runs}, Python {sys.version.split()[0]}")
+    print(f"{'entry':<12}{'wall, s':>10}{'imports, s':>12}{'modules':>10}")
+    for name, result in results.items():
+        print(f"{name:<12}{result['wall']:>10.3f}{result['imports']:>12.3f}{len(result['rows']):>10}")
+    
+    for name, result in results.items():
+        # Top-level packages only: their cumulative time includes their submodules
+        top = sorted(((module, cumulative) for module, _, cumulative in result['rows'] if '.' not in module),
+                     key=lambda row: -row[1])[:args.top]
+        print(f"\n{name}: slowest imports (cumulative)")
+        for module, cumulative in top:
+            print(f"  {module:<32}{cumulative / 1000:>9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -21,11 +21,138 @@ class Settings:
     OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
     OPENROUTER_MODEL = os.getenv("OPENROUTER_MODEL", "openai/gpt-oss-120b:free")
     OPENROUTER_CHEAP_MODEL = os.getenv("OPENROUTER_CHEAP_MODEL", "openai/gpt-oss-120b:free")
+    # Any OpenAI-compatible chat completions endpoint (a local mock server in benchmarks)
+    OPENROUTER_API_URL = os.getenv("OPENROUTER_API_URL", "https://openrouter.ai/api/v1/chat/completions")
     
     MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY", "")
     MISTRAL_MODEL = os.getenv("MISTRAL_MODEL", "mistral-small-latest")
     MISTRAL_CHEAP_MODEL = os.getenv("MISTRAL_CHEAP_MODEL", "mistral-small-latest")
     
+    # Final report: "single" (one large call), "sectioned" (parallel smaller calls)
+    # or "incremental" (verdict only, from material aggregated during the interview)
+    FEEDBACK_MODE = os.getenv("FEEDBACK_MODE", "single")
+    
+    # Interviewer: "generate" (always LLM) or "hybrid" (question bank first, LLM fallback)
+    INTERVIEWER_MODE = os.getenv("INTERVIEWER_MODE", "generate")
+    QUESTION_BANK_PATH = os.getenv("QUESTION_BANK_PATH", str(BASE_DIR / "data" / "question_bank.db"))
+    QUESTION_BANK_REPHRASE = os.getenv("QUESTION_BANK_REPHRASE", "false").lower() == "true"
+    
+    # Analytics index over logs/ (python main.py --stats)
+    LOG_INDEX_PATH = os.getenv("LOG_INDEX_PATH", str(BASE_DIR / "data" / "log_index.db"))
+    
+    # Compressed log archives written by python main.py --migrate-logs: "zlib" (with a preset
+    # dictionary built from the archive's first sessions) or "lzma" (no preset dictionary)
+    ARCHIVE_DIR = Path(os.getenv("ARCHIVE_DIR", str(LOGS_DIR / "archive")))
+    ARCHIVE_CODEC = os.getenv("ARCHIVE_CODEC", "zlib")
+    
+    # Reference answers reused across candidates for near-identical questions
+    REFERENCE_CACHE_ENABLED = os.getenv("REFERENCE_CACHE_ENABLED", "true").lower() == "true"
+    REFERENCE_CACHE_PATH = os.getenv("REFERENCE_CACHE_PATH", str(BASE_DIR / "data" / "reference_answers.db"))
+    REFERENCE_CACHE_MAX_DISTANCE = int(os.getenv("REFERENCE_CACHE_MAX_DISTANCE", "6"))
+    ANSWER_REUSE_ENABLED = os.getenv("ANSWER_REUSE_ENABLED", "false").lower() == "true"
+    ANSWER_REUSE_PATH = os.getenv("ANSWER_REUSE_PATH", str(BASE_DIR / "data" / "answer_index.db"))
+    ANSWER_REUSE_THRESHOLD = float(os.getenv("ANSWER_REUSE_THRESHOLD", "0.75"))
+    ANSWER_REUSE_VERIFY_RATE = float(os.getenv("ANSWER_REUSE_VERIFY_RATE", "0.0"))
+    
+    # Next-question branches prepared on the cheap model while the candidate types
+    SPECULATIVE_QUESTIONS = os.getenv("SPECULATIVE_QUESTIONS", "false").lower() == "true"
+    SPECULATIVE_BRANCHES = [int(b) for b in os.getenv("SPECULATIVE_BRANCHES", "1,-1").split(",") if b.strip()]
+    SPECULATIVE_WAIT = float(os.getenv("SPECULATIVE_WAIT", "2.0"))
+    
+    # Observer LLM analysis only on turns where it can change the plan (score swing, off-topic
+    # or evasive answer, topic asked OBSERVER_TOPIC_TURNS times, at least every OBSERVER_MAX_SKIP
+    # turns); other turns keep the last strategy and the numeric difficulty rule
+    OBSERVER_ADAPTIVE = os.getenv("OBSERVER_ADAPTIVE", "true").lower() == "true"
+    OBSERVER_MAX_SKIP = int(os.getenv("OBSERVER_MAX_SKIP", "4"))
+    OBSERVER_SCORE_SWING = float(os.getenv("OBSERVER_SCORE_SWING", "0.3"))
+    OBSERVER_TOPIC_TURNS = int(os.getenv("OBSERVER_TOPIC_TURNS", "3"))
+    
+    # Sequential early stop: end the interview once the posterior puts EARLY_STOP_CONFIDENCE of its
+    # mass in one hiring band (ability edges No Hire | Hire | Strong Hire)
+    EARLY_STOP_ENABLED = os.getenv("EARLY_STOP_ENABLED", "false").lower() == "true"
+    EARLY_STOP_CONFIDENCE = float(os.getenv("EARLY_STOP_CONFIDENCE", "0.9"))
+    EARLY_STOP_MIN_TURNS = int(os.getenv("EARLY_STOP_MIN_TURNS", "4"))
+    EARLY_STOP_MIN_TOPICS = int(os.getenv("EARLY_STOP_MIN_TOPICS", "2"))
+    EARLY_STOP_BAND_EDGES = tuple(float(edge) for edge in os.getenv("EARLY_STOP_BAND_EDGES", "0.4,0.75").split(","))
+    
+    # Turn latency SLO: past SLO_TARGET_P95 seconds (p95 over SLO_WINDOW turns) the workflow degrades
+    # step by step (heuristic Evaluator, no Observer, cheap Interviewer) and recovers below
+    # SLO_TARGET_P95 * SLO_RECOVER_RATIO
+    SLO_ENABLED = os.getenv("SLO_ENABLED", "false").lower() == "true"
+    SLO_TARGET_P95 = float(os.getenv("SLO_TARGET_P95", "8.0"))
+    SLO_WINDOW = int(os.getenv("SLO_WINDOW", "10"))
+    SLO_MIN_TURNS = int(os.getenv("SLO_MIN_TURNS", "3"))
+    SLO_RECOVER_RATIO = float(os.getenv("SLO_RECOVER_RATIO", "0.6"))
+    
+    # Per-call model router over the main and cheap model (see models/router.py);
+    # prices are USD per 1000 tokens, the cost cap is per session (0 = none)
+    ROUTER_ENABLED = os.getenv("ROUTER_ENABLED", "false").lower() == "true"
+    ROUTER_MAIN_PRICE = float(os.getenv("ROUTER_MAIN_PRICE", "0.01"))
+    ROUTER_CHEAP_PRICE = float(os.getenv("ROUTER_CHEAP_PRICE", "0.001"))
+    ROUTER_SESSION_COST_CAP = float(os.getenv("ROUTER_SESSION_COST_CAP", "0"))
+    ROUTER_HARD_DIFFICULTY = int(os.getenv("ROUTER_HARD_DIFFICULTY", "4"))
+    ROUTER_LATENCY_RATIO = float(os.getenv("ROUTER_LATENCY_RATIO", "3.0"))
+    ROUTER_MAX_ERROR_RATE = float(os.getenv("ROUTER_MAX_ERROR_RATE", "0.5"))
+    ROUTER_LARGE_PROMPT_TOKENS = int(os.getenv("ROUTER_LARGE_PROMPT_TOKENS", "6000"))
+    ROUTER_EWMA_ALPHA = float(os.getenv("ROUTER_EWMA_ALPHA", "0.3"))
+    ROUTER_PROBE_EVERY = int(os.getenv("ROUTER_PROBE_EVERY", "10"))
+    
+    # Per-model prices for cost estimates, as "model=input/output,model=input/output"
+    # in USD per 1000 tokens (benchmarks/provider_shootout.py)
+    MODEL_PRICES = {
+        model.strip(): tuple(float(price) for price in prices.split("/"))
+        for model, _, prices in (item.rpartition("=") for item in os.getenv("MODEL_PRICES", "").split(","))
+        if model.strip()
+    }
+    
+    # Hidden reasoning per agent for reasoning models, as "agent=value,agent=value":
+    # effort (low/medium/high) and/or a reasoning token budget; agents not listed use
+    # the model default. By default only the background agents reason less; the
+    # interviewer's questions are what the candidate sees. REASONING_EXCLUDE drops the
+    # reasoning text from responses
+    REASONING_EFFORT = {
+        agent.strip(): effort.strip()
+        for agent, _, effort in (item.rpartition("=") for item in os.getenv(
+            "REASONING_EFFORT", "observer=low,evaluator=low,speculation=low").split(","))
+        if agent.strip()
+    }
+    REASONING_MAX_TOKENS = {
+        agent.strip(): int(budget)
+        for agent, _, budget in (item.rpartition("=") for item in os.getenv("REASONING_MAX_TOKENS", "").split(","))
+        if agent.strip()
+    }
+    REASONING_EXCLUDE = os.getenv("REASONING_EXCLUDE", "false").lower() == "true"
+    
+    # Central LLM scheduler: concurrent calls per (provider, model), 0 = unlimited (set it to
+    # the provider's quota); per-model overrides as "model=N,model=N"; slots of a limited
+    # lane kept free for INTERACTIVE calls
+    SCHEDULER_MAX_CONCURRENCY = int(os.getenv("SCHEDULER_MAX_CONCURRENCY", "0"))
+    SCHEDULER_MODEL_LIMITS = {
+        model.strip(): int(limit)
+        for model, _, limit in (item.rpartition("=") for item in os.getenv("SCHEDULER_MODEL_LIMITS", "").split(","))
+        if model.strip()
+    }
+    SCHEDULER_INTERACTIVE_RESERVE = int(os.getenv("SCHEDULER_INTERACTIVE_RESERVE", "1"))
+    
+    # Append-only snapshot of the workflow state next to each log (InterviewWorkflow.resume)
+    CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true"
+    
+    # Turns kept in memory per session; older turns spill to a temp file (0 = keep all)
+    TURN_STORE_HOT_TURNS = int(os.getenv("TURN_STORE_HOT_TURNS", "20"))
+    TURN_STORE_SPILL_DIR = os.getenv("TURN_STORE_SPILL_DIR") or None
+    
+    # Multi-session server (python main.py --serve)
+    SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+    SERVER_PORT = int(os.getenv("SERVER_PORT", "8080"))
+    SERVER_SESSION_TTL = float(os.getenv("SERVER_SESSION_TTL", "1800"))
+    # Blocking session work running at once: setup, final reports, closing (turns run on the event loop)
+    SERVER_MAX_WORKERS = int(os.getenv("SERVER_MAX_WORKERS", "256"))
+    
+    EVALUATOR_MAX_TOKENS = int(os.getenv("EVALUATOR_MAX_TOKENS", "500"))
+    EVALUATOR_MAX_TOKENS_WITH_REFERENCE = int(os.getenv("EVALUATOR_MAX_TOKENS_WITH_REFERENCE", "250"))
+    
+    STRUCTURED_OUTPUT = os.getenv("STRUCTURED_OUTPUT", "true").lower() == "true"
+    
     LOG_INTERNAL_THOUGHTS = os.getenv("LOG_INTERNAL_THOUGHTS", "true").lower() == "true"
     MAX_INTERVIEW_TURNS = int(os.getenv("MAX_INTERVIEW_TURNS", "20"))
     DIFFICULTY_MIN = int(os.getenv("DIFFICULTY_MIN", "1"))
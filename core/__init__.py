@@ -2,12 +2,18 @@ from .prompts import (
     INTERVIEWER_SYSTEM_PROMPT,
     OBSERVER_SYSTEM_PROMPT,
     EVALUATOR_SYSTEM_PROMPT,
-    FEEDBACK_GENERATOR_SYSTEM_PROMPT
+    FEEDBACK_GENERATOR_SYSTEM_PROMPT,
+    FEEDBACK_SECTION_SYSTEM_PROMPT,
+    QUESTION_BANK_PROMPT,
+    QUESTION_REPHRASE_PROMPT
 )
 
 __all__ = [
     'INTERVIEWER_SYSTEM_PROMPT',
     'OBSERVER_SYSTEM_PROMPT',
     'EVALUATOR_SYSTEM_PROMPT',
-    'FEEDBACK_GENERATOR_SYSTEM_PROMPT'
+    'FEEDBACK_GENERATOR_SYSTEM_PROMPT',
+    'FEEDBACK_SECTION_SYSTEM_PROMPT',
+    'QUESTION_BANK_PROMPT',
+    'QUESTION_REPHRASE_PROMPT'
 ]
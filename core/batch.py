@@ -0,0 +1,199 @@
+"""Concurrent batch interviews over a JSONL file of scripted candidates."""
+
+import csv
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Tuple
+from core.workflow import InterviewWorkflow
+from models.llm_factory import LLMProvider, LLMFactory
+
+
+SUMMARY_FIELDS = [
+    'candidate_id', 'name', 'position', 'grade', 'status', 'turns', 'average_score',
+    'final_grade', 'hiring_recommendation', 'confidence_score', 'duration_s', 'log_path', 'error'
+]
+
+
+class BatchRunner:
+    """Runs scripted interviews concurrently on a bounded thread pool.
+    
+    Each input line is a JSON object with the candidate profile (name,
+    position, grade, experience), a list of scripted responses and an
+    optional unique id; a repeated id is reported as an error. Every
+    interview writes its own log; a summary row is appended to
+    summary.csv as soon as the interview finishes, so a restarted batch
+    skips candidates that already completed.
+    """
+    
+    def __init__(self, output_dir: str, concurrency: int = 4,
+                 llm_provider: LLMProvider = None, cheap_llm_provider: LLMProvider = None):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.summary_path = self.output_dir / 'summary.csv'
+        self.concurrency = max(1, concurrency)
+        # Provider clients are shared by all concurrent interviews
+        self.llm, self.cheap_llm = LLMFactory.create_pair(llm_provider, cheap_llm_provider)
+    
+    def _completed_ids(self) -> Set[str]:
+        if not self.summary_path.exists():
+            return set()
+        with open(self.summary_path, 'r', encoding='utf-8', newline='') as f:
+            return {row['candidate_id'] for row in csv.DictReader(f) if row.get('status') == 'ok'}
+    
+    def _read_candidates(self, input_path: str) -> Iterator[Tuple[str, Optional[dict], str]]:
+        """Stream candidate records without loading the whole file.
+        
+        Yields:
+            (candidate id, record or None if the line is invalid, parse error)
+        """
+        with open(input_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError("JSON object expected")
+                except ValueError as e:
+                    yield str(line_number), None, f"line {line_number}: {e}"
+                    continue
+                yield str(record.get('id') or line_number), record, ''
+    
+    def run_candidate(self, candidate_id: str, record: dict) -> dict:
+        """Run one scripted interview to completion.
+        
+        Args:
+            candidate_id: Stable candidate id used for resume
+            record: Candidate record
+        
+        Returns:
+            Summary row
+        """
+        started = time.monotonic()
+        name = str(record.get('name') or 'Кандидат')
+        safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '_', '-')).replace(' ', '_')
+        safe_id = self._safe_id(candidate_id)
+        log_path = self.output_dir / f"interview_{safe_id}_{safe_name}.json"
+        
+        workflow = InterviewWorkflow(log_filepath=str(log_path), llm_provider=self.llm,
+                                     cheap_llm_provider=self.cheap_llm, verbose=False)
+        try:
+            workflow.initialize_interview(
+                name,
+                str(record.get('position') or 'Developer'),
+                str(record.get('grade') or 'Junior'),
+                str(record.get('experience') or 'Начинающий разработчик')
+            )
+            workflow.start_interview()
+            for response in record.get('responses', []):
+                if workflow.is_complete():
+                    break
+                workflow.process_turn(str(response))
+            workflow.generate_final_feedback()
+            
+            # Read the log before close() discards the turns spilled to disk
+            feedback = workflow.logger.get_log().final_feedback
+            history = workflow.state.get('performance_history', [])
+            return {
+                'candidate_id': candidate_id,
+                'name': name,
+                'position': workflow.state['candidate_profile'].position,
+                'grade': workflow.state['candidate_profile'].grade,
+                'status': 'ok',
+                'turns': len(workflow.state.get('turns', [])),
+                'average_score': round(sum(history) / len(history), 3) if history else '',
+                'final_grade': feedback.grade if feedback else '',
+                'hiring_recommendation': feedback.hiring_recommendation if feedback else '',
+                'confidence_score': feedback.confidence_score if feedback else '',
+                'duration_s': round(time.monotonic() - started, 2),
+                'log_path': str(log_path),
+                'error': ''
+            }
+        finally:
+            workflow.close()
+    
+    @staticmethod
+    def _safe_id(candidate_id: str) -> str:
+        # Part of the log file name
+        return "".join(c for c in candidate_id if c.isalnum() or c in ('_', '-'))
+    
+    def _safe_run(self, candidate_id: str, record: dict) -> dict:
+        started = time.monotonic()
+        try:
+            return self.run_candidate(candidate_id, record)
+        except Exception as e:
+            return self._error_row(candidate_id, record, f"{type(e).__name__}: {e}",
+                                   round(time.monotonic() - started, 2))
+    
+    @staticmethod
+    def _error_row(candidate_id: str, record: Optional[dict], error: str, duration: float = 0.0) -> dict:
+        record = record or {}
+        row = {field: '' for field in SUMMARY_FIELDS}
+        row.update({
+            'candidate_id': candidate_id,
+            'name': record.get('name', ''),
+            'position': record.get('position', ''),
+            'grade': record.get('grade', ''),
+            'status': 'error',
+            'duration_s': duration,
+            'error': error
+        })
+        return row
+    
+    def run(self, input_path: str) -> Dict[str, int]:
+        """Run every pending candidate of a JSONL file.
+        
+        Args:
+            input_path: Path to the candidates file
+        
+        Returns:
+            Counts of completed, failed and skipped candidates
+        """
+        completed = self._completed_ids()
+        counts = {'ok': 0, 'error': 0, 'skipped': 0}
+        write_header = not self.summary_path.exists()
+        
+        with open(self.summary_path, 'a', encoding='utf-8', newline='') as summary_file, \
+                ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='batch') as executor:
+            writer = csv.DictWriter(summary_file, fieldnames=SUMMARY_FIELDS)
+            if write_header:
+                writer.writeheader()
+            
+            def record_row(row: dict):
+                writer.writerow(row)
+                summary_file.flush()
+                counts[row['status']] += 1
+                print(f"[{row['status']}] {row['candidate_id']} {row['name']} "
+                      f"{row['final_grade'] or row['error']}")
+            
+            pending: Set[Future] = set()
+            # Two records with one id would share a log and checkpoint; only the first runs
+            seen: Set[str] = set()
+            for candidate_id, record, error in self._read_candidates(input_path):
+                safe_id = self._safe_id(candidate_id)
+                if record is not None and safe_id in seen:
+                    record_row(self._error_row(candidate_id, record, f"duplicate id: {candidate_id}"))
+                    continue
+                seen.add(safe_id)
+                if candidate_id in completed:
+                    counts['skipped'] += 1
+                    continue
+                if record is None:
+                    record_row(self._error_row(candidate_id, None, error))
+                    continue
+                
+                # Bounded look-ahead: never hold more than two waves of candidates in memory
+                if len(pending) >= self.concurrency * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record_row(future.result())
+                pending.add(executor.submit(self._safe_run, candidate_id, record))
+            
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record_row(future.result())
+        
+        return counts
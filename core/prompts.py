@@ -84,8 +84,7 @@ OBSERVER_SYSTEM_PROMPT = """Вы наблюдатель и стратег инт
 - Если OFF-TOPIC - верните к техническим вопросам
 
 ФОРМАТ ОТВЕТА:
-Предоставьте краткий анализ и конкретную рекомендацию для интервьюера.
-Используйте формат: [Observer]: <ваш анализ>
+Предоставьте краткий анализ и конкретную рекомендацию для интервьюера в формате, указанном в запросе.
 
 ВАЖНО: ПИШИТЕ ТОЛЬКО НА РУССКОМ ЯЗЫКЕ!"""
 
@@ -107,7 +106,7 @@ EVALUATOR_SYSTEM_PROMPT = """Вы технический эксперт, кот
 
 ОТВЕТ КАНДИДАТА:
 {user_message}
-
+{reference_block}
 ВАЖНО: 
 - ЕСЛИ вопрос касается опыта работы, биографии или рассказа о себе - НЕ оценивайте это как правильно/неправильно. Опыт не может быть "неправильным".
 - ОЦЕНИВАЙТЕ только технические знания: алгоритмы, концепции, API, синтаксис, архитектурные решения.
@@ -124,12 +123,19 @@ EVALUATOR_SYSTEM_PROMPT = """Вы технический эксперт, кот
 ДЛЯ ВОПРОСОВ ОБ ОПЫТЕ: Просто подтвердите ответ как принятый, не ищите ошибки.
 
 ФОРМАТ ОТВЕТА:
-[Evaluator]: <оценка корректности> | Балл: <0.0-1.0> | <краткий комментарий>
+Оценка корректности, балл 0.0-1.0 и краткий комментарий в формате, указанном в запросе.
 
 Если ответ содержит ошибки, укажите правильный ответ.
 
 ВАЖНО: ПИШИТЕ ТОЛЬКО НА РУССКОМ ЯЗЫКЕ!"""
 
+EVALUATOR_REFERENCE_BLOCK = """
+ЭТАЛОННЫЙ ОТВЕТ (уже проверен):
+{reference_answer}
+
+Сравните ответ кандидата с эталоном. НЕ формулируйте правильный ответ заново - только оцените.
+"""
+
 FEEDBACK_GENERATOR_SYSTEM_PROMPT = """Вы эксперт по оценке кандидатов, который составляет финальный отчет после интервью.
 
 ВАША РОЛЬ:
@@ -181,6 +187,67 @@ FEEDBACK_GENERATOR_SYSTEM_PROMPT = """Вы эксперт по оценке ка
 ВАЖНО: ПИШИТЕ ВЕСЬ ОТЧЕТ ТОЛЬКО НА РУССКОМ ЯЗЫКЕ!"""
 
 
+FEEDBACK_SECTION_SYSTEM_PROMPT = """Вы эксперт по оценке кандидатов. Вы составляете ОДИН раздел финального отчета после интервью.
+
+КОНТЕКСТ КАНДИДАТА:
+Имя: {name}
+Позиция: {position}
+Заявленный грейд: {claimed_grade}
+Опыт: {experience}
+
+ИНФОРМАЦИЯ ОБ ИНТЕРВЬЮ:
+Всего вопросов: {total_turns}
+Темы покрытые: {topics_covered}
+Средняя оценка: {average_score}
+
+ИСТОРИЯ ИНТЕРВЬЮ:
+{interview_history}
+
+Будьте объективны и конструктивны.
+
+ВАЖНО: ПИШИТЕ ТОЛЬКО НА РУССКОМ ЯЗЫКЕ!"""
+
+
+QUESTION_BANK_PROMPT = """Составьте технические вопросы для собеседования (количество: {count}).
+
+Направление: {position_family}
+Тема: {topic}
+Сложность: {difficulty}/5 (1 - базовые определения, 5 - глубокие вопросы уровня Senior)
+
+Требования:
+- Один теоретический вопрос на 1-2 предложения, без форматирования
+- Вопросы не должны повторять друг друга
+- К каждому вопросу дайте краткий эталонный ответ (2-4 предложения)
+
+Верните JSON-объект:
+{{"questions": [{{"question": "текст вопроса", "reference_answer": "эталонный ответ"}}]}}
+
+ВАЖНО: ПИШИТЕ ТОЛЬКО НА РУССКОМ ЯЗЫКЕ!"""
+
+QUESTION_REPHRASE_PROMPT = """Перефразируйте вопрос из банка так, чтобы он естественно продолжал диалог.
+
+ПОСЛЕДНИЙ ОТВЕТ КАНДИДАТА:
+{user_message}
+
+ВОПРОС:
+{question}
+
+Можно начать с короткой реакции на ответ (до одного предложения). Суть вопроса не меняйте.
+ПИШИТЕ КОРОТКО: 1-3 предложения. ТОЛЬКО русский. БЕЗ форматирования."""
+
+
+SPECULATIVE_QUESTION_PROMPT = """Кандидат сейчас отвечает на вопрос:
+{question}
+
+Рекомендация наблюдателя: {strategy}
+
+Подготовьте СЛЕДУЮЩИЙ вопрос заранее, исходя из того, что {branch}.
+Сложность следующего вопроса: {difficulty}/5.
+
+Задайте только ОДИН вопрос, без приветствия и без оценки ответа.
+ПИШИТЕ КОРОТКО: 1-2 предложения. ТОЛЬКО русский. БЕЗ форматирования."""
+
+
 def get_interviewer_prompt(state: dict) -> str:
     """Generate interviewer prompt with current context."""
     profile = state.get('candidate_profile')
@@ -205,15 +272,19 @@ def get_observer_prompt(state: dict) -> str:
         experience=profile.experience if profile else '',
         topics_covered=', '.join(state.get('topics_covered', set())) or 'Нет',
         difficulty=state.get('current_difficulty', 3),
-        performance_history=state.get('performance_history', []),
+        performance_history=list(state.get('performance_history', [])),
         user_message=state.get('user_message', '')
     )
 
 
-def get_evaluator_prompt(state: dict, interviewer_question: str) -> str:
-    """Generate evaluator prompt with current context."""
+def get_evaluator_prompt(state: dict, interviewer_question: str, reference_answer: str = '') -> str:
+    """Generate evaluator prompt with current context and an optional reference answer."""
     profile = state.get('candidate_profile')
+    reference_block = ''
+    if reference_answer:
+        reference_block = EVALUATOR_REFERENCE_BLOCK.format(reference_answer=reference_answer)
     return EVALUATOR_SYSTEM_PROMPT.format(
+        reference_block=reference_block,
         position=profile.position if profile else '',
         grade=profile.grade if profile else '',
         current_topic=list(state.get('topics_covered', set()))[-1] if state.get('topics_covered') else 'Общие',
@@ -235,3 +306,18 @@ def get_feedback_prompt(state: dict, interview_history: str) -> str:
         average_score=sum(state.get('performance_history', [0])) / max(len(state.get('performance_history', [1])), 1),
         interview_history=interview_history
     )
+
+
+def get_feedback_section_prompt(state: dict, interview_history: str) -> str:
+    """Generate the shared system prompt for one section of the final report."""
+    profile = state.get('candidate_profile')
+    return FEEDBACK_SECTION_SYSTEM_PROMPT.format(
+        name=profile.name if profile else '',
+        position=profile.position if profile else '',
+        claimed_grade=profile.grade if profile else '',
+        experience=profile.experience if profile else '',
+        total_turns=len(state.get('turns', [])),
+        topics_covered=', '.join(state.get('topics_covered', set())) or 'Нет',
+        average_score=sum(state.get('performance_history', [0])) / max(len(state.get('performance_history', [1])), 1),
+        interview_history=interview_history
+    )
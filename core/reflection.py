@@ -0,0 +1,148 @@
+"""Adaptive Observer frequency: the LLM analysis runs only when it can change the plan."""
+
+from collections import Counter
+from typing import Optional
+from core.topics import match_topic
+from utils.validators import RobustnessValidator
+from config import settings
+
+
+# Why the Observer was called on a turn
+FIRST = 'first'
+OFF_TOPIC = 'off_topic'
+EVASION = 'evasion'
+SCORE_SWING = 'score_swing'
+TOPIC_DONE = 'topic_done'
+PERIODIC = 'periodic'
+
+REASON_NAMES = {
+    FIRST: "первый ответ",
+    OFF_TOPIC: "уход от темы",
+    EVASION: "уклонение от ответа",
+    SCORE_SWING: "резкое изменение оценки",
+    TOPIC_DONE: "тема исчерпана",
+    PERIODIC: "плановая проверка"
+}
+
+
+class ReflectionPolicy:
+    """Decides on which turns the Observer's LLM analysis is worth a call.
+    
+    While scores stay in the same band (below PERFORMANCE_THRESHOLD_LOW,
+    between the thresholds, above PERFORMANCE_THRESHOLD_HIGH) and move by
+    less than the swing, the Observer can only recommend carrying on, so
+    the workflow keeps the last strategy and applies the numeric
+    difficulty rule itself. The Observer is called on the first answer,
+    on an off-topic or evasive answer, on a score swing, when the current
+    topic has been asked for topic_turns turns, and at least every
+    max_skip turns.
+    """
+    
+    def __init__(self, max_skip: int = None, score_swing: float = None, topic_turns: int = None):
+        """Initialize the policy.
+        
+        Args:
+            max_skip: The Observer runs at least once in this many turns
+            score_swing: Score change from the previous answer that triggers a call
+            topic_turns: Turns on one topic before the Observer reviews it
+        """
+        self.max_skip = max_skip if max_skip is not None else settings.OBSERVER_MAX_SKIP
+        self.score_swing = score_swing if score_swing is not None else settings.OBSERVER_SCORE_SWING
+        self.topic_turns = topic_turns if topic_turns is not None else settings.OBSERVER_TOPIC_TURNS
+        self._since_call = 0
+        self._topic = None
+        self._topic_turns = 0
+        self.reasons: Counter = Counter()
+        self.stats = {'turns': 0, 'calls': 0, 'skipped': 0}
+    
+    @staticmethod
+    def _band(score: float) -> int:
+        if score < settings.PERFORMANCE_THRESHOLD_LOW:
+            return -1
+        if score > settings.PERFORMANCE_THRESHOLD_HIGH:
+            return 1
+        return 0
+    
+    def decide(self, state: dict, user_message: str, score: float) -> Optional[str]:
+        """Check whether the Observer should analyze this turn.
+        
+        Args:
+            state: Interview state before the score is added to performance_history
+            user_message: Candidate's answer
+            score: Evaluator score of the answer
+        
+        Returns:
+            Reason to call the Observer, or None to keep the last strategy
+        """
+        if state.get('observer_result') is None:
+            return FIRST
+        if RobustnessValidator.is_off_topic(user_message):
+            return OFF_TOPIC
+        if RobustnessValidator.detect_evasion(user_message) or RobustnessValidator.should_skip_evaluation(user_message):
+            return EVASION
+        
+        history = state.get('performance_history', [])
+        if history:
+            previous = history[-1]
+            if abs(score - previous) >= self.score_swing or self._band(score) != self._band(previous):
+                return SCORE_SWING
+        
+        if self.topic_turns and self._topic_turns >= self.topic_turns:
+            return TOPIC_DONE
+        if self._since_call + 1 >= self.max_skip:
+            return PERIODIC
+        return None
+    
+    def record(self, reason: Optional[str], next_topic: str, topics: list):
+        """Account for the turn once the Observer was called or skipped.
+        
+        Args:
+            reason: Value returned by decide() for this turn
+            next_topic: Topic the (possibly carried over) strategy points at
+            topics: Interview topics used to normalize next_topic
+        """
+        self.stats['turns'] += 1
+        topic = match_topic(next_topic, topics) or next_topic.strip().lower()
+        if reason is None:
+            self.stats['skipped'] += 1
+            self._since_call += 1
+        else:
+            self.stats['calls'] += 1
+            self.reasons[reason] += 1
+            self._since_call = 0
+            # A reviewed topic gets another topic_turns turns even if the Observer keeps it
+            if topic != self._topic or reason == TOPIC_DONE:
+                self._topic = topic
+                self._topic_turns = 0
+        self._topic_turns += 1
+    
+    def to_dict(self) -> dict:
+        """Serialise the counters for a checkpoint.
+        
+        Returns:
+            JSON-compatible dictionary
+        """
+        return {'since_call': self._since_call, 'topic': self._topic, 'topic_turns': self._topic_turns,
+                'reasons': dict(self.reasons), 'stats': dict(self.stats)}
+    
+    def load_dict(self, data: dict):
+        """Restore the counters from a checkpoint.
+        
+        Args:
+            data: Result of to_dict()
+        """
+        self._since_call = data.get('since_call', 0)
+        self._topic = data.get('topic')
+        self._topic_turns = data.get('topic_turns', 0)
+        self.reasons = Counter(data.get('reasons', {}))
+        self.stats.update(data.get('stats', {}))
+    
+    def get_stats(self) -> dict:
+        """Observer calls made and saved.
+        
+        Returns:
+            Dict with turns, calls, skipped, saved_ratio and calls per reason
+        """
+        turns = self.stats['turns']
+        return {**self.stats, 'saved_ratio': round(self.stats['skipped'] / turns, 3) if turns else 0.0,
+                'reasons': dict(self.reasons)}
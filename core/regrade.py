@@ -0,0 +1,344 @@
+"""Offline re-grading of logged answers with the current Evaluator prompt and model."""
+
+import csv
+import json
+import re
+import statistics
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from agents.evaluator import EvaluatorAgent
+from core.stopping import scored_turns
+from core.topics import get_position_topics
+from models.llm_factory import LLMFactory, LLMProvider, ReasoningOptions
+from models.scheduler import Priority, lane_key, scheduled
+from models.schemas import CandidateProfile, Turn
+from storage.question_bank import QuestionBank
+from utils.logger import InterviewLogger
+from utils.validators import RobustnessValidator
+from config import settings
+
+
+SCORE_FIELDS = [
+    'session', 'turn_id', 'position', 'topic', 'difficulty', 'model', 'status',
+    'old_score', 'new_score', 'old_correctness', 'new_correctness', 'error'
+]
+
+# "[Interviewer]: Вопрос из банка #12 (...)" on the turn that asked a bank question
+BANK_NOTE = re.compile(r'Вопрос из банка #(\d+)')
+
+# Score change reported as a large drift
+LARGE_DRIFT = 0.25
+
+
+def _band(score: float) -> int:
+    if score < settings.PERFORMANCE_THRESHOLD_LOW:
+        return -1
+    if score > settings.PERFORMANCE_THRESHOLD_HIGH:
+        return 1
+    return 0
+
+
+def _group_drift(pairs: List[Tuple[float, float]]) -> dict:
+    old = statistics.fmean(o for o, _ in pairs)
+    new = statistics.fmean(n for _, n in pairs)
+    return {'answers': len(pairs), 'mean_old': round(old, 3), 'mean_new': round(new, 3),
+            'mean_delta': round(new - old, 3)}
+
+
+def score_drift(rows: Iterable[dict]) -> dict:
+    """Compare re-graded scores with the logged ones.
+    
+    Args:
+        rows: scores.csv rows; for an answer graded more than once the last 'ok' row counts
+    
+    Returns:
+        Dict with answers, mean old/new score and delta, mean absolute delta,
+        share of large changes (>= LARGE_DRIFT), correctness agreement,
+        answers and sessions whose score band (below / between / above the
+        performance thresholds) changed, and drift by topic, position and
+        difficulty sorted by the size of the shift
+    """
+    latest: Dict[Tuple[str, str], dict] = {}
+    for row in rows:
+        if row.get('status') == 'ok':
+            latest[(row['session'], row['turn_id'])] = row
+    if not latest:
+        return {'answers': 0}
+    
+    pairs, groups = [], {'topic': {}, 'position': {}, 'difficulty': {}}
+    sessions: Dict[str, List[Tuple[float, float]]] = {}
+    agree = compared = band_changes = 0
+    for (session, _), row in latest.items():
+        pair = (float(row['old_score']), float(row['new_score']))
+        pairs.append(pair)
+        sessions.setdefault(session, []).append(pair)
+        for field, group in groups.items():
+            group.setdefault(row[field], []).append(pair)
+        if row['old_correctness']:
+            compared += 1
+            agree += row['old_correctness'] == row['new_correctness']
+        band_changes += _band(pair[0]) != _band(pair[1])
+    
+    deltas = [new - old for old, new in pairs]
+    session_means = [_group_drift(session_pairs) for session_pairs in sessions.values()]
+    report = {
+        **_group_drift(pairs),
+        'mean_abs_delta': round(statistics.fmean(abs(delta) for delta in deltas), 3),
+        'large_share': round(sum(abs(delta) >= LARGE_DRIFT for delta in deltas) / len(deltas), 3),
+        'correctness_agreement': round(agree / compared, 3) if compared else None,
+        'band_changes': band_changes,
+        'sessions': len(sessions),
+        'sessions_band_changed': sum(_band(s['mean_old']) != _band(s['mean_new']) for s in session_means)
+    }
+    for field, group in groups.items():
+        drift = {key: _group_drift(group_pairs) for key, group_pairs in group.items()}
+        report[f'by_{field}'] = dict(sorted(drift.items(), key=lambda item: -abs(item[1]['mean_delta'])))
+    return report
+
+
+def reference_answer(question_bank: Optional[QuestionBank], previous: Optional[Turn]) -> str:
+    """Bank reference answer of the question a turn asked, if it came from the bank.
+    
+    Args:
+        question_bank: Bank to look the question up in (None: no reference)
+        previous: Turn whose message asked the question
+    
+    Returns:
+        Reference answer, or '' for generated questions
+    """
+    if previous is None or question_bank is None:
+        return ''
+    match = BANK_NOTE.search(previous.internal_thoughts)
+    if match is None:
+        return ''
+    question = question_bank.get_question_by_id(int(match.group(1)))
+    return question.reference_answer if question else ''
+
+
+def answer_states(profile: Optional[CandidateProfile], turns: Iterable[Turn],
+                  question_bank: QuestionBank = None) -> Iterator[Tuple[Turn, Optional[Turn], float, dict]]:
+    """Rebuild the state the Evaluator saw live for every scored answer of a session.
+    
+    The state holds the candidate profile, the answer, the question's
+    difficulty and topic (see scored_turns()) and, for bank questions,
+    the bank's reference answer.
+    
+    Args:
+        profile: Candidate profile from the log header
+        turns: Turns in order; read one at a time, so archived turns can stream
+        question_bank: Bank for reference answers
+    
+    Yields:
+        (turn, turn before it that asked the question or None, logged score, state)
+    """
+    position = profile.position if profile else ''
+    
+    # scored_turns() pulls one turn at a time, so when it yields a turn
+    # window[0] holds the turn before it, which asked the question
+    window: List[Optional[Turn]] = [None, None]
+    
+    def tracked(turns: Iterable[Turn]) -> Iterator[Turn]:
+        for turn in turns:
+            window[0], window[1] = window[1], turn
+            yield turn
+    
+    for turn, score, difficulty, topic in scored_turns(tracked(turns), get_position_topics(position)):
+        previous = window[0]
+        yield turn, previous, score, {
+            'candidate_profile': profile,
+            'user_message': turn.user_message,
+            'current_difficulty': difficulty,
+            'topics_covered': {topic},
+            'reference_answer': reference_answer(question_bank, previous)
+        }
+
+
+class LocalEvaluatorProvider(LLMProvider):
+    """Offline stand-in for the Evaluator's model.
+    
+    Reads the question, the answer and the reference answer back out of
+    the Evaluator prompt and grades them like SLO degrade mode does
+    (EvaluatorAgent.evaluate_heuristic), after an optional simulated
+    latency, so the whole re-grade path (scheduler, structured output,
+    checkpoint, drift report) runs without network access.
+    """
+    
+    PROMPT_FIELDS = re.compile(
+        r'ВОПРОС ИНТЕРВЬЮЕРА:\n(.*?)\n\nОТВЕТ КАНДИДАТА:\n(.*?)\n\n'
+        r'(?:ЭТАЛОННЫЙ ОТВЕТ \(уже проверен\):\n(.*?)\n\nСравните|ВАЖНО:)',
+        re.DOTALL
+    )
+    
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.model = 'local-heuristic'
+        self.grader = EvaluatorAgent(llm_provider=self)
+    
+    def _grade(self, system_prompt: Optional[str]):
+        if self.latency:
+            time.sleep(self.latency)
+        match = self.PROMPT_FIELDS.search(system_prompt or '')
+        if match is None:
+            raise ValueError("Not an Evaluator prompt")
+        question, answer, reference = match.groups()
+        state = {'user_message': answer, 'reference_answer': reference or ''}
+        return self.grader.evaluate_heuristic(state, question)['result']
+    
+    def generate(self, prompt: str, system_prompt: Optional[str] = None,
+                 temperature: float = 0.7, max_tokens: int = 1000,
+                 reasoning: Optional[ReasoningOptions] = None) -> str:
+        result = self._grade(system_prompt)
+        text = f"{result.correctness} | Балл: {result.score:.2f} | {result.comment}"
+        if result.correct_answer:
+            text += f"\nПравильный ответ: {result.correct_answer}"
+        return text
+    
+    def generate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                      temperature: float = 0.3, max_tokens: int = 500,
+                      reasoning: Optional[ReasoningOptions] = None) -> dict:
+        return self._grade(system_prompt).model_dump(include={'correctness', 'score', 'comment', 'correct_answer'})
+
+
+class RegradeRunner:
+    """Re-scores logged answers with the current Evaluator, concurrently and resumably.
+    
+    Each scored answer is graded again from the state the Evaluator saw
+    live, rebuilt from the log: the question (the previous turn's message),
+    the answer, the candidate profile, the question's topic and difficulty
+    (see scored_turns()) and, for bank questions, the bank's reference
+    answer. Answers the workflow never sent to the Evaluator (too short or
+    evasive) are skipped. Calls go through the LLM scheduler at background
+    priority, tagged with their session, so its per-model concurrency
+    limits apply. Each result is appended to scores.csv next to the logged
+    score as soon as it arrives, so a restarted run skips answers that
+    were already graded.
+    """
+    
+    def __init__(self, output_dir: str, concurrency: int = 8, llm_provider: LLMProvider = None,
+                 question_bank: QuestionBank = None):
+        """Initialize the runner.
+        
+        Args:
+            output_dir: Directory for scores.csv and drift.json
+            concurrency: Answers graded at once
+            llm_provider: Evaluator model (default: the cheap model the workflow grades with)
+            question_bank: Bank for reference answers (default: the configured bank, if built)
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.scores_path = self.output_dir / 'scores.csv'
+        self.drift_path = self.output_dir / 'drift.json'
+        self.concurrency = max(1, concurrency)
+        self.llm = llm_provider or LLMFactory.create_pair()[1]
+        self.model = lane_key(getattr(self.llm, 'provider', self.llm))[1]
+        self.question_bank = question_bank if question_bank is not None else \
+            QuestionBank.open_existing(settings.QUESTION_BANK_PATH)
+    
+    def _read_scores(self) -> List[dict]:
+        if not self.scores_path.exists():
+            return []
+        with open(self.scores_path, 'r', encoding='utf-8', newline='') as f:
+            # A row torn by a crash has missing fields
+            return [row for row in csv.DictReader(f) if row.get('error') is not None]
+    
+    def _jobs(self, logs_dir: str, completed: Set[Tuple[str, str]],
+              counts: Dict[str, int]) -> Iterator[Tuple[EvaluatorAgent, dict, str, dict]]:
+        """Stream the answers to grade.
+        
+        Yields:
+            (evaluator view of the session, rebuilt state, question, row with the logged result)
+        """
+        for session, open_session in InterviewLogger.iter_sessions(logs_dir, stream=True):
+            try:
+                log, turns = open_session()
+            except (ValueError, OSError):
+                counts['invalid'] += 1
+                continue
+            profile = log.candidate_profile
+            position = profile.position if profile else ''
+            evaluator = EvaluatorAgent(llm_provider=self.llm)
+            evaluator.llm = scheduled(evaluator.llm, Priority.BACKGROUND, session=session)
+            try:
+                for turn, previous, score, state in answer_states(profile, turns, self.question_bank):
+                    if (session, str(turn.turn_id)) in completed:
+                        counts['resumed'] += 1
+                        continue
+                    if RobustnessValidator.should_skip_evaluation(turn.user_message):
+                        counts['skipped'] += 1
+                        continue
+                    row = {field: '' for field in SCORE_FIELDS}
+                    row.update({
+                        'session': session,
+                        'turn_id': turn.turn_id,
+                        'position': position,
+                        'topic': next(iter(state['topics_covered'])),
+                        'difficulty': state['current_difficulty'],
+                        'model': self.model,
+                        'old_score': score,
+                        'old_correctness': turn.evaluator_result.correctness if turn.evaluator_result else ''
+                    })
+                    yield evaluator, state, previous.agent_visible_message if previous else '', row
+            except ValueError:
+                # Corrupt archive frame: the answers read before it are kept
+                counts['invalid'] += 1
+    
+    @staticmethod
+    def _grade(evaluator: EvaluatorAgent, state: dict, question: str, row: dict) -> dict:
+        try:
+            result = evaluator.evaluate_response(state, question)['result']
+            row.update(status='ok', new_score=result.score, new_correctness=result.correctness)
+        except Exception as e:
+            row.update(status='error', error=f"{type(e).__name__}: {e}")
+        return row
+    
+    def run(self, logs_dir: str, on_progress: Callable[[Dict[str, int]], None] = None) -> Dict[str, int]:
+        """Grade every pending answer under a directory and write the drift report.
+        
+        Args:
+            logs_dir: Directory with JSON logs and archives
+            on_progress: Called with the counts after every 100 graded answers
+        
+        Returns:
+            Counts of graded ('ok'), failed ('error'), 'skipped' (not sent to the
+            Evaluator live), 'resumed' (graded by an earlier run) answers and
+            'invalid' logs
+        """
+        completed = {(row['session'], row['turn_id']) for row in self._read_scores() if row['status'] == 'ok'}
+        counts = dict.fromkeys(('ok', 'error', 'skipped', 'resumed', 'invalid'), 0)
+        write_header = not self.scores_path.exists()
+        
+        with open(self.scores_path, 'a', encoding='utf-8', newline='') as scores_file, \
+                ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='regrade') as executor:
+            writer = csv.DictWriter(scores_file, fieldnames=SCORE_FIELDS)
+            if write_header:
+                writer.writeheader()
+            
+            def record_row(row: dict):
+                writer.writerow(row)
+                scores_file.flush()
+                counts[row['status']] += 1
+                if on_progress and (counts['ok'] + counts['error']) % 100 == 0:
+                    on_progress(counts)
+            
+            pending: Set[Future] = set()
+            for job in self._jobs(logs_dir, completed, counts):
+                # Bounded look-ahead: never hold more than two waves of answers in memory
+                if len(pending) >= self.concurrency * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record_row(future.result())
+                pending.add(executor.submit(self._grade, *job))
+            
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record_row(future.result())
+        
+        self.drift_path.write_text(json.dumps(self.drift(), ensure_ascii=False, indent=2), encoding='utf-8')
+        return counts
+    
+    def drift(self) -> dict:
+        """Drift report over every answer graded so far (see score_drift())."""
+        return score_drift(self._read_scores())
@@ -0,0 +1,117 @@
+"""Turn latency SLO: degrades the agent chain while providers are slow."""
+
+from collections import deque
+from typing import Deque, List
+from config import settings
+
+
+# Each level keeps the savings of the levels below it
+NORMAL = 0
+HEURISTIC_EVALUATOR = 1
+SKIP_OBSERVER = 2
+CHEAP_INTERVIEWER = 3
+
+LEVEL_NAMES = {
+    NORMAL: "полный режим",
+    HEURISTIC_EVALUATOR: "эвристическая оценка без LLM",
+    SKIP_OBSERVER: "Observer пропущен, стратегия предыдущего хода",
+    CHEAP_INTERVIEWER: "вопрос задает дешевая модель"
+}
+
+
+class SLOController:
+    """Tracks rolling p95 turn latency and picks a degrade level.
+    
+    When p95 over the recent turns exceeds the target, the next turns
+    run one level lower in cost: heuristic Evaluator, then also no
+    Observer, then also the Interviewer on the cheap model. When p95
+    falls below target * recover_ratio, one level is given back. The gap
+    between the two thresholds is the hysteresis; the latency window is
+    cleared on every change so each level is judged on its own turns.
+    """
+    
+    def __init__(self, target_p95: float = None, window: int = None, min_turns: int = None,
+                 recover_ratio: float = None):
+        """Initialize the controller.
+        
+        Args:
+            target_p95: Turn latency target in seconds
+            window: Number of recent turns the p95 is taken over
+            min_turns: Turns observed at a level before it can change again
+            recover_ratio: p95 must fall below target * recover_ratio to recover
+        """
+        self.target_p95 = target_p95 if target_p95 is not None else settings.SLO_TARGET_P95
+        self.min_turns = min_turns if min_turns is not None else settings.SLO_MIN_TURNS
+        self.recover_ratio = recover_ratio if recover_ratio is not None else settings.SLO_RECOVER_RATIO
+        self.level = NORMAL
+        self._latencies: Deque[float] = deque(maxlen=window or settings.SLO_WINDOW)
+        self.transitions: List[dict] = []
+        self.stats = {'turns': 0, 'degraded_turns': 0, 'breaches': 0}
+    
+    def p95(self) -> float:
+        """p95 of the turn latencies in the window (0.0 if empty)."""
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    
+    def record(self, latency: float, turn_id: int = None) -> int:
+        """Record the latency of a finished turn and update the level.
+        
+        Args:
+            latency: Turn wall time in seconds
+            turn_id: Turn the latency belongs to (kept in the transition history)
+        
+        Returns:
+            Degrade level for the next turn
+        """
+        self.stats['turns'] += 1
+        if self.level > NORMAL:
+            self.stats['degraded_turns'] += 1
+        self._latencies.append(latency)
+        if len(self._latencies) < self.min_turns:
+            return self.level
+        
+        p95 = self.p95()
+        if p95 > self.target_p95:
+            self.stats['breaches'] += 1
+            if self.level < CHEAP_INTERVIEWER:
+                self._change(self.level + 1, p95, turn_id)
+        elif p95 < self.target_p95 * self.recover_ratio and self.level > NORMAL:
+            self._change(self.level - 1, p95, turn_id)
+        return self.level
+    
+    def _change(self, level: int, p95: float, turn_id: int):
+        self.transitions.append({'turn_id': turn_id, 'from': self.level, 'to': level, 'p95': round(p95, 3)})
+        self.level = level
+        self._latencies.clear()
+    
+    def to_dict(self) -> dict:
+        """Serialise the level and latency window for a checkpoint.
+        
+        Returns:
+            JSON-compatible dictionary
+        """
+        return {'level': self.level, 'latencies': list(self._latencies),
+                'transitions': list(self.transitions), 'stats': dict(self.stats)}
+    
+    def load_dict(self, data: dict):
+        """Restore the level and latency window from a checkpoint.
+        
+        Args:
+            data: Result of to_dict()
+        """
+        self.level = data.get('level', NORMAL)
+        self._latencies.clear()
+        self._latencies.extend(data.get('latencies', []))
+        self.transitions = list(data.get('transitions', []))
+        self.stats.update(data.get('stats', {}))
+    
+    def get_stats(self) -> dict:
+        """Current level, p95 and degraded turn counts.
+        
+        Returns:
+            Dict with level, p95, turns, degraded_turns, breaches and transitions
+        """
+        return {**self.stats, 'level': self.level, 'p95': round(self.p95(), 3),
+                'transitions': list(self.transitions)}
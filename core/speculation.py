@@ -0,0 +1,185 @@
+"""Speculative next questions prepared while the candidate types an answer."""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Dict, Hashable, List, Optional, Tuple
+from models.llm_factory import LLMProvider
+from models.router import approx_tokens
+from models.scheduler import Priority, get_scheduler, scheduled
+from models.usage import usage_meter
+from core.prompts import SPECULATIVE_QUESTION_PROMPT, get_interviewer_prompt
+from core.steps import Steps, Wait, run_steps
+from config import settings
+
+
+# Branch per Observer difficulty_change: what the answer is assumed to be and
+# the short reaction that adapts the prepared question to the actual answer
+BRANCHES = {
+    1: ("кандидат ответил правильно и уверенно: углубитесь в тему", "Отлично."),
+    0: ("ответ частичный: задайте уточняющий вопрос того же уровня", "Хорошо."),
+    -1: ("кандидат ответил неверно или не знает: упростите и задайте более базовый вопрос",
+         "Понятно, давайте немного упростим.")
+}
+
+
+class QuestionSpeculator:
+    """Prepares follow-up questions on the cheap model during candidate think time.
+    
+    After each question, start() generates one candidate next question per
+    branch (deeper, same level, easier). When the answer arrives, take()
+    returns the branch that matches the Observer's difficulty_change;
+    every other prepared branch counts as wasted tokens. Tokens are those
+    the API reported for the branch's call, estimated only when the
+    provider reports none. Started from an event loop (the async workflow
+    path), branches run as tasks on that loop; otherwise on worker threads
+    created on first use.
+    """
+    
+    def __init__(self, llm_provider: LLMProvider, branches: List[int] = None, wait: float = None):
+        # Guesses must never delay a question someone is waiting for
+        self.llm = scheduled(llm_provider, Priority.BACKGROUND, hints={'agent': 'speculation'})
+        self.branches = [b for b in (branches or [1, -1]) if b in BRANCHES]
+        self.wait = wait if wait is not None else settings.SPECULATIVE_WAIT
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[int, Future] = {}
+        # Worker thread or task of each branch's call, to tell a running call from one queued for a slot
+        self._owners: Dict[int, Hashable] = {}
+        self._lock = threading.Lock()
+        self.stats = {'rounds': 0, 'hits': 0, 'misses': 0, 'spent_tokens': 0, 'wasted_tokens': 0}
+    
+    def start(self, state: dict):
+        """Start preparing branches for the question just asked.
+        
+        Args:
+            state: Interview state after the question was shown
+        """
+        self.discard()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None and self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.branches)),
+                                                thread_name_prefix='speculation')
+        # Prompts are built here: the workers never read the live state
+        system_prompt = get_interviewer_prompt(state)
+        difficulty = state.get('current_difficulty', 3)
+        for change in self.branches:
+            prompt = SPECULATIVE_QUESTION_PROMPT.format(
+                question=state.get('agent_message', ''),
+                strategy=state.get('strategy_decision', ''),
+                branch=BRANCHES[change][0],
+                difficulty=max(settings.DIFFICULTY_MIN, min(settings.DIFFICULTY_MAX, difficulty + change))
+            )
+            with self._lock:
+                self._owners.pop(change, None)
+            if loop is None:
+                self._pending[change] = self._executor.submit(self._generate, change, prompt, system_prompt)
+            else:
+                self._pending[change] = asyncio.run_coroutine_threadsafe(
+                    self._agenerate(change, prompt, system_prompt), loop)
+        with self._lock:
+            self.stats['rounds'] += 1
+    
+    def _generate(self, change: int, prompt: str, system_prompt: str) -> Tuple[Optional[str], int]:
+        with self._lock:
+            self._owners[change] = threading.get_ident()
+        with usage_meter.capture() as usage:
+            try:
+                text = self.llm.generate(prompt=prompt, system_prompt=system_prompt,
+                                         temperature=0.7, max_tokens=200).strip()
+            except Exception:
+                text = ''
+        return self._spent(prompt, system_prompt, text, usage)
+    
+    async def _agenerate(self, change: int, prompt: str, system_prompt: str) -> Tuple[Optional[str], int]:
+        with self._lock:
+            self._owners[change] = asyncio.current_task()
+        with usage_meter.capture() as usage:
+            try:
+                text = (await self.llm.agenerate(prompt=prompt, system_prompt=system_prompt,
+                                                 temperature=0.7, max_tokens=200)).strip()
+            except Exception:
+                text = ''
+        return self._spent(prompt, system_prompt, text, usage)
+    
+    def _spent(self, prompt: str, system_prompt: str, text: str, usage: Dict[str, int]) -> Tuple[Optional[str], int]:
+        if usage['calls']:
+            tokens = usage['prompt_tokens'] + usage['completion_tokens']
+        else:
+            tokens = approx_tokens(system_prompt + prompt + text)
+        with self._lock:
+            self.stats['spent_tokens'] += tokens
+        return text or None, tokens
+    
+    def _started(self, change: int) -> bool:
+        with self._lock:
+            owner = self._owners.get(change)
+        return owner is not None and not (self.llm.scheduler or get_scheduler()).is_queued(owner)
+    
+    def take(self, difficulty_change: Optional[int]) -> Optional[str]:
+        """Serve the prepared question for the Observer's decision.
+        
+        Args:
+            difficulty_change: Observer's difficulty_change for the answer, or None
+                when a prepared question cannot be used (e.g. a counter-question)
+        
+        Returns:
+            Adapted question, or None on a miss (no such branch, not started or not
+            ready in time, failed)
+        """
+        return run_steps(self.take_steps(difficulty_change))
+    
+    def take_steps(self, difficulty_change: Optional[int]) -> Steps[Optional[str]]:
+        """Steps of take(): waiting for the branch does not block an event loop."""
+        future = self._pending.pop(difficulty_change, None)
+        question = None
+        if future is not None:
+            # A branch still queued for a BACKGROUND slot is not waited for: that would hold
+            # the candidate's question behind background work
+            try:
+                question, _ = yield Wait(future, self.wait if self._started(difficulty_change) else 0)
+            except TimeoutError:
+                pass
+            if question is None:
+                future.add_done_callback(self._count_wasted)
+        
+        self.discard()
+        with self._lock:
+            self.stats['hits' if question else 'misses'] += 1
+        if question is None:
+            return None
+        return f"{BRANCHES[difficulty_change][1]} {question}"
+    
+    def discard(self):
+        """Drop prepared branches that will not be served."""
+        for future in self._pending.values():
+            future.add_done_callback(self._count_wasted)
+        self._pending = {}
+    
+    def _count_wasted(self, future: Future):
+        if future.cancelled():
+            return
+        _, tokens = future.result()
+        with self._lock:
+            self.stats['wasted_tokens'] += tokens
+    
+    def close(self):
+        for future in self._pending.values():
+            # Branches not yet running on a worker, and tasks on the event loop
+            future.cancel()
+        self.discard()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def get_stats(self) -> dict:
+        """Hit rate and token accounting.
+        
+        Returns:
+            Dict with rounds, hits, misses, hit_rate, spent_tokens and wasted_tokens
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        served = stats['hits'] + stats['misses']
+        return {**stats, 'hit_rate': round(stats['hits'] / served, 3) if served else 0.0}
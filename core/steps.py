@@ -0,0 +1,164 @@
+"""Agent and workflow logic written once as steps, run blocking or on an event loop."""
+
+import asyncio
+import inspect
+from concurrent.futures import Future, TimeoutError
+from contextlib import aclosing
+from typing import Any, Callable, Generator, Optional, TypeVar, Union
+from models.llm_factory import LLMProvider
+
+
+T = TypeVar('T')
+
+
+class LLMCall:
+    """A provider call; the driver sends its result back into the generator.
+    
+    method is 'generate', 'generate_json' or 'stream'. A 'stream' call is
+    text for the candidate: the driver streams it to its on_token callback
+    and sends back the full text, or generates it in one piece when there
+    is no callback. Provider errors are raised at the yield.
+    """
+    
+    __slots__ = ('llm', 'method', 'kwargs')
+    
+    def __init__(self, llm: LLMProvider, method: str, **kwargs: Any):
+        self.llm = llm
+        self.method = method
+        self.kwargs = kwargs
+
+
+class Emit:
+    """Ready text for the candidate, passed to the driver's on_token callback."""
+    
+    __slots__ = ('text',)
+    
+    def __init__(self, text: str):
+        self.text = text
+
+
+class Wait:
+    """Wait up to timeout seconds for a future; TimeoutError is raised at the yield."""
+    
+    __slots__ = ('future', 'timeout')
+    
+    def __init__(self, future: Future, timeout: float):
+        self.future = future
+        self.timeout = timeout
+
+
+class Offload:
+    """Blocking file work (logs, checkpoints); kept off the event loop by the async driver."""
+    
+    __slots__ = ('func', 'args')
+    
+    def __init__(self, func: Callable, *args: Any):
+        self.func = func
+        self.args = args
+
+
+Step = Union[LLMCall, Emit, Wait, Offload]
+Steps = Generator[Step, Any, T]
+
+
+def run_steps(steps: Steps[T], on_token: Optional[Callable[[str], None]] = None) -> T:
+    """Run steps on the calling thread with the blocking provider methods.
+    
+    Args:
+        steps: Step generator
+        on_token: Called with each chunk of text for the candidate
+    
+    Returns:
+        Value the generator returns
+    """
+    result, error = None, None
+    while True:
+        try:
+            step = steps.throw(error) if error is not None else steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+        result, error = None, None
+        try:
+            result = _run_step(step, on_token)
+        except Exception as e:
+            error = e
+
+
+async def arun_steps(steps: Steps[T], on_token: Optional[Callable[[str], Any]] = None) -> T:
+    """Run steps on the event loop with the providers' async methods.
+    
+    Args:
+        steps: Step generator
+        on_token: Function or coroutine function called with each chunk of text for the candidate
+    
+    Returns:
+        Value the generator returns
+    """
+    result, error = None, None
+    while True:
+        try:
+            step = steps.throw(error) if error is not None else steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+        result, error = None, None
+        try:
+            result = await _arun_step(step, on_token)
+        except Exception as e:
+            error = e
+
+
+def _run_step(step: Step, on_token: Optional[Callable[[str], None]]) -> Any:
+    if isinstance(step, Emit):
+        if on_token is not None:
+            on_token(step.text)
+        return None
+    if isinstance(step, Wait):
+        return step.future.result(timeout=step.timeout)
+    if isinstance(step, Offload):
+        return step.func(*step.args)
+    
+    if step.method != 'stream':
+        return getattr(step.llm, step.method)(**step.kwargs)
+    if on_token is None:
+        return step.llm.generate(**step.kwargs)
+    chunks = []
+    for chunk in step.llm.stream(**step.kwargs):
+        chunks.append(chunk)
+        on_token(chunk)
+    return ''.join(chunks)
+
+
+async def _arun_step(step: Step, on_token: Optional[Callable[[str], Any]]) -> Any:
+    if isinstance(step, Emit):
+        await _emit(on_token, step.text)
+        return None
+    if isinstance(step, Wait):
+        if step.timeout <= 0 or step.future.done():
+            return step.future.result(timeout=0)
+        try:
+            # Shielded: giving up on the result must not cancel the work behind it
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(step.future)), step.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError() from None
+    if isinstance(step, Offload):
+        return await asyncio.to_thread(step.func, *step.args)
+    
+    if step.method != 'stream':
+        return await getattr(step.llm, 'a' + step.method)(**step.kwargs)
+    if on_token is None:
+        return await step.llm.agenerate(**step.kwargs)
+    chunks = []
+    # Closed in this task even if on_token raises, so the provider slot is released here
+    async with aclosing(step.llm.astream(**step.kwargs)) as stream:
+        async for chunk in stream:
+            chunks.append(chunk)
+            await _emit(on_token, chunk)
+    return ''.join(chunks)
+
+
+async def _emit(on_token: Optional[Callable[[str], Any]], text: str):
+    if on_token is None:
+        return
+    result = on_token(text)
+    if inspect.isawaitable(result):
+        await result
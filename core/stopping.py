@@ -0,0 +1,176 @@
+"""Sequential early stop: ends the interview once the hiring band is settled."""
+
+import math
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from core.topics import match_topic
+from config import settings
+
+
+BANDS = ('No Hire', 'Hire', 'Strong Hire')
+
+
+def _beta_cf(a: float, b: float, x: float) -> float:
+    # Continued fraction of the incomplete beta function (modified Lentz)
+    tiny = 1e-30
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 201):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-12:
+            break
+    return h
+
+
+def beta_cdf(x: float, a: float, b: float) -> float:
+    """P(theta <= x) for theta ~ Beta(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    log_front = (math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                 + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(log_front) * _beta_cf(a, b, x) / a
+    return 1.0 - math.exp(log_front) * _beta_cf(b, a, 1.0 - x) / b
+
+
+def answer_topic(question: str, next_topic: str, topics: List[str]) -> str:
+    """Topic of the answered question: the Observer's pick, else the question text."""
+    return match_topic(next_topic or '', topics) or match_topic(question, topics) or 'общие'
+
+
+class StoppingRule:
+    """Bayesian confidence on the hiring band over the evaluator scores.
+    
+    The candidate's ability is the probability theta of answering a
+    question correctly, with a Beta(1, 1) prior. Each score s adds
+    s * w_success to alpha and (1 - s) * w_failure to beta, where a
+    question of difficulty d weighs d / 3 for a success and
+    (DIFFICULTY_MAX + 1 - d) / 3 for a failure: a good answer to a hard
+    question and a bad answer to an easy one say more. The bands split
+    theta at band_edges into No Hire, Hire and Strong Hire. Once the
+    posterior puts at least `confidence` of its mass in one band, after
+    min_turns answers on min_topics topics, the band is settled.
+    """
+    
+    def __init__(self, confidence: float = None, min_turns: int = None, min_topics: int = None,
+                 band_edges: Tuple[float, float] = None):
+        """Initialize the rule.
+        
+        Args:
+            confidence: Posterior mass in one band needed to stop
+            min_turns: Evaluated answers required before stopping
+            min_topics: Distinct topics required before stopping
+            band_edges: Ability thresholds between No Hire / Hire / Strong Hire
+        """
+        self.confidence = confidence if confidence is not None else settings.EARLY_STOP_CONFIDENCE
+        self.min_turns = min_turns if min_turns is not None else settings.EARLY_STOP_MIN_TURNS
+        self.min_topics = min_topics if min_topics is not None else settings.EARLY_STOP_MIN_TOPICS
+        self.band_edges = band_edges or settings.EARLY_STOP_BAND_EDGES
+        self.alpha = 1.0
+        self.beta = 1.0
+        self.turns = 0
+        self.topic_scores: Dict[str, List[float]] = {}
+    
+    def update(self, score: float, difficulty: int, topic: str):
+        """Add one evaluated answer.
+        
+        Args:
+            score: Evaluator score in [0, 1]
+            difficulty: Difficulty the question was asked at
+            topic: Topic of the question
+        """
+        score = min(1.0, max(0.0, score))
+        self.alpha += score * difficulty / 3
+        self.beta += (1.0 - score) * (settings.DIFFICULTY_MAX + 1 - difficulty) / 3
+        self.turns += 1
+        self.topic_scores.setdefault(topic, []).append(score)
+    
+    def band_probabilities(self) -> Dict[str, float]:
+        """Posterior mass of each hiring band."""
+        low, high = self.band_edges
+        below_low = beta_cdf(low, self.alpha, self.beta)
+        below_high = beta_cdf(high, self.alpha, self.beta)
+        return {BANDS[0]: below_low, BANDS[1]: below_high - below_low, BANDS[2]: 1.0 - below_high}
+    
+    def decision(self) -> Optional[Tuple[str, float]]:
+        """The settled band and its posterior mass, or None while it is open."""
+        if self.turns < self.min_turns or len(self.topic_scores) < self.min_topics:
+            return None
+        band, probability = max(self.band_probabilities().items(), key=lambda item: item[1])
+        return (band, probability) if probability >= self.confidence else None
+    
+    def get_stats(self) -> dict:
+        """Posterior state for logs and reports.
+        
+        Returns:
+            Dict with turns, topics, posterior mean and band probabilities
+        """
+        return {'turns': self.turns, 'topics': len(self.topic_scores),
+                'mean': round(self.alpha / (self.alpha + self.beta), 3),
+                'bands': {band: round(p, 3) for band, p in self.band_probabilities().items()}}
+
+
+def is_scored(turn: Any) -> bool:
+    """Whether a logged turn carries an evaluated answer.
+    
+    Redirect turns (repeated off-topic answers) are saved without Observer
+    and Evaluator results; so are all turns of logs written before the
+    structured results were logged, which are told apart by their note.
+    """
+    if turn.observer_result is not None:
+        return True
+    return bool(turn.performance_metrics) and not turn.internal_thoughts.endswith('Redirecting.')
+
+
+def scored_turns(turns: Iterable[Any], topics: List[str],
+                 start_difficulty: int = 3) -> Iterator[Tuple[Any, float, int, str]]:
+    """Walk logged turns as the workflow saw them live.
+    
+    Difficulty is rebuilt from the Observer's difficulty_change (it stays
+    at start_difficulty for logs without Observer results); redirect
+    turns carry no score and are skipped.
+    
+    Args:
+        turns: Turns in order (Turn or CompactTurn)
+        topics: Interview topics used to name each question's topic
+        start_difficulty: Difficulty of the first question
+    
+    Yields:
+        (turn, score, difficulty the question was asked at, question topic) for every scored turn
+    """
+    difficulty, question, next_topic = start_difficulty, '', ''
+    for turn in turns:
+        if is_scored(turn):
+            score = (turn.performance_metrics or {}).get('score', 0.0)
+            yield turn, score, difficulty, answer_topic(question, next_topic, topics)
+            if turn.observer_result is not None:
+                difficulty = max(settings.DIFFICULTY_MIN,
+                                 min(settings.DIFFICULTY_MAX, difficulty + turn.observer_result.difficulty_change))
+                next_topic = turn.observer_result.next_topic
+        question = turn.agent_visible_message
+
+
+def replay_turns(rule: StoppingRule, turns: Iterable[Any], topics: List[str],
+                 start_difficulty: int = 3) -> Iterator[Tuple[Any, Optional[Tuple[str, float]]]]:
+    """Feed logged turns to a rule as the workflow did live (see scored_turns()).
+    
+    Args:
+        rule: Rule to update
+        turns: Turns in order (Turn or CompactTurn)
+        topics: Interview topics used to name each question's topic
+        start_difficulty: Difficulty of the first question
+    
+    Yields:
+        (turn, decision after that answer) for every scored turn
+    """
+    for turn, score, difficulty, topic in scored_turns(turns, topics, start_difficulty):
+        rule.update(score, difficulty, topic)
+        yield turn, rule.decision()
@@ -0,0 +1,90 @@
+"""Interview topics by position family."""
+
+from typing import List, Optional
+
+
+COMMON_TOPICS = [
+    'programming basics',
+    'data structures',
+    'algorithms',
+    'oop',
+    'testing',
+    'debugging'
+]
+
+FAMILY_TOPICS = {
+    'backend': ['databases', 'api design', 'architecture'],
+    'frontend': ['html/css', 'javascript', 'frameworks'],
+    'fullstack': ['databases', 'api design', 'frontend frameworks'],
+    'general': []
+}
+
+# Keywords (incl. Russian stems) that map free-text Observer topics onto bank topics
+TOPIC_ALIASES = {
+    'programming basics': ['основ', 'синтаксис', 'типы данных', 'переменн'],
+    'data structures': ['структур данных', 'структуры данных', 'массив', 'словар', 'хеш', 'список', 'стек', 'очеред'],
+    'algorithms': ['алгоритм', 'сложность', 'сортировк', 'поиск', 'big o'],
+    'oop': ['ооп', 'наследован', 'инкапсуляц', 'полиморфизм', 'класс'],
+    'testing': ['тест', 'unit', 'mock'],
+    'debugging': ['отладк', 'debug', 'логирован'],
+    'databases': ['баз данных', 'база данных', 'sql', 'индекс', 'транзакц', 'database'],
+    'api design': ['api', 'rest', 'http', 'эндпоинт', 'graphql'],
+    'architecture': ['архитектур', 'микросервис', 'монолит', 'паттерн'],
+    'html/css': ['html', 'css', 'верстк', 'flexbox', 'grid'],
+    'javascript': ['javascript', 'замыкан', 'промис', 'event loop'],
+    'frameworks': ['react', 'vue', 'angular', 'фреймворк'],
+    'frontend frameworks': ['react', 'vue', 'angular', 'фреймворк']
+}
+
+
+def get_position_family(position: str) -> str:
+    """Map a free-text position onto a position family.
+    
+    Args:
+        position: Position name
+    
+    Returns:
+        'backend', 'frontend', 'fullstack' or 'general'
+    """
+    position_lower = position.lower()
+    
+    if 'backend' in position_lower or 'server' in position_lower:
+        return 'backend'
+    elif 'frontend' in position_lower:
+        return 'frontend'
+    elif 'fullstack' in position_lower or 'full stack' in position_lower:
+        return 'fullstack'
+    return 'general'
+
+
+def get_position_topics(position: str) -> List[str]:
+    """Get topics to cover for a position.
+    
+    Args:
+        position: Position name
+    
+    Returns:
+        List of topics
+    """
+    return COMMON_TOPICS + FAMILY_TOPICS[get_position_family(position)]
+
+
+def match_topic(text: str, topics: List[str]) -> Optional[str]:
+    """Map free text onto exactly one of the given topics.
+    
+    Args:
+        text: Free-text topic, e.g. the Observer's next_topic
+        topics: Candidate topic names
+    
+    Returns:
+        The matching topic, or None if none or several match
+    """
+    text_lower = text.lower()
+    if not text_lower.strip():
+        return None
+    
+    matches = [
+        topic for topic in topics
+        if topic in text_lower or any(alias in text_lower for alias in TOPIC_ALIASES.get(topic, []))
+    ]
+    return matches[0] if len(matches) == 1 else None
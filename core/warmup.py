@@ -0,0 +1,98 @@
+"""Prepares an interactive interview while the candidate profile is typed."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Tuple
+
+
+DEFAULT_EXPERIENCE = "Начинающий разработчик"
+
+
+class WarmupPipeline:
+    """Overlaps startup work with the profile prompts in main.py.
+    
+    start() imports the workflow and warms up both providers (SDK import,
+    client, connection) in the background. profile_known() builds the
+    workflow and speculatively generates the greeting as soon as name,
+    position and grade are entered, assuming the default experience.
+    finish() reconciles with the real experience text: the greeting is
+    reused unless the experience names a technology the position does
+    not, since that may change the first question; otherwise it is
+    regenerated as before.
+    """
+    
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='warmup')
+        self._providers: Optional[Future] = None
+        self._prepared: Optional[Future] = None
+        self._profile: Optional[Tuple[str, str, str]] = None
+        self.greeting_reused: Optional[bool] = None
+    
+    def start(self):
+        self._providers = self._executor.submit(self._warm_up_providers)
+    
+    @staticmethod
+    def _warm_up_providers():
+        # Pydantic, the agents and the SDKs load here while the user types
+        import core.workflow
+        from models.llm_factory import LLMFactory
+        
+        llm, cheap_llm = LLMFactory.create_pair()
+        llm.warm_up()
+        cheap_llm.warm_up()
+        return llm, cheap_llm
+    
+    def profile_known(self, name: str, position: str, grade: str, log_filepath: str):
+        """Build the workflow and start the speculative greeting.
+        
+        Args:
+            name: Candidate name
+            position: Position applying for
+            grade: Grade level
+            log_filepath: Path to save the interview log
+        """
+        if self._providers is None:
+            self.start()
+        self._profile = (name, position, grade)
+        self._prepared = self._executor.submit(self._prepare, log_filepath)
+    
+    def _prepare(self, log_filepath: str):
+        from core.workflow import InterviewWorkflow
+        
+        llm, cheap_llm = self._providers.result()
+        workflow = InterviewWorkflow(log_filepath=log_filepath, llm_provider=llm, cheap_llm_provider=cheap_llm)
+        try:
+            greeting = workflow.speculate_greeting(*self._profile, DEFAULT_EXPERIENCE)
+        except Exception:
+            # A failed guess only costs the time saved; start_interview() generates it again
+            greeting = None
+        return workflow, greeting
+    
+    def _greeting_still_valid(self, position: str, experience: str) -> bool:
+        if experience == DEFAULT_EXPERIENCE:
+            return True
+        from memory import EntityTracker
+        
+        tracker = EntityTracker()
+        new_skills = set(tracker.extract_skills_from_text(experience)) - \
+            set(tracker.extract_skills_from_text(position))
+        return not new_skills
+    
+    def finish(self, experience: str):
+        """Initialize the prepared workflow with the final experience text.
+        
+        Args:
+            experience: Experience description
+        
+        Returns:
+            (initialized InterviewWorkflow, greeting to reuse or None to regenerate)
+        """
+        try:
+            workflow, greeting = self._prepared.result()
+        finally:
+            self._executor.shutdown(wait=False)
+        
+        name, position, grade = self._profile
+        workflow.initialize_interview(name, position, grade, experience)
+        
+        self.greeting_reused = bool(greeting) and self._greeting_still_valid(position, experience)
+        return workflow, greeting if self.greeting_reused else None
@@ -1,41 +1,130 @@
 """Main interview workflow using LangGraph."""
 
-from typing import Dict, Any
-from models.schemas import InterviewState, Turn, CandidateProfile
+import copy
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional
+from models.schemas import (InterviewState, Turn, CandidateProfile, ObserverResult, EvaluatorResult,
+                            BankQuestion, FinalFeedback)
+from models.compact import (CompactTurn, CompactProfile, CompactObserverResult, CompactEvaluatorResult,
+                            SessionState, intern_text)
+from models.llm_factory import LLMProvider, LLMFactory
+from models.router import RouterProvider
+from models.usage import usage_meter
+from models.scheduler import scheduled
 from agents import InterviewerAgent, ObserverAgent, EvaluatorAgent, FeedbackGeneratorAgent
-from memory import ConversationMemory, EntityTracker
+from memory import ConversationMemory, EntityTracker, ReportBuilder, TurnStore
 from utils.logger import InterviewLogger
+from utils.checkpoint import CheckpointFile
 from utils.validators import RobustnessValidator
+from storage.question_bank import QuestionBank
+from storage.reference_answers import ReferenceAnswerStore
+from storage.answer_index import AnswerIndex
+from core.topics import get_position_topics
+from core.speculation import QuestionSpeculator
+from core.reflection import ReflectionPolicy, REASON_NAMES
+from core.stopping import StoppingRule, answer_topic, replay_turns
+from core.slo import SLOController, LEVEL_NAMES, NORMAL, HEURISTIC_EVALUATOR, SKIP_OBSERVER, CHEAP_INTERVIEWER
+from core.steps import Emit, Offload, Steps, arun_steps, run_steps
 from config import settings
 
 
 class InterviewWorkflow:
-    """Orchestrates the multi-agent interview process."""
+    """Orchestrates the multi-agent interview process.
     
-    def __init__(self, log_filepath: str = "logs/interview_log.json"):
+    A turn is written once as steps (see core.steps): process_turn() runs
+    them on the calling thread, aprocess_turn() on an event loop with the
+    providers' async methods.
+    """
+    
+    def __init__(self, log_filepath: str = "logs/interview_log.json",
+                 llm_provider: LLMProvider = None, cheap_llm_provider: LLMProvider = None,
+                 verbose: bool = True, checkpoint_path: Optional[str] = None):
         """Initialize the interview workflow.
         
         Args:
             log_filepath: Path to save interview logs
+            llm_provider: Main model shared with other sessions (created if None)
+            cheap_llm_provider: Cheap model shared with other sessions (created if None)
+            verbose: Print the conversation and report to stdout
+            checkpoint_path: Snapshot file (defaults to next to the log if CHECKPOINT_ENABLED)
         """
+        self.verbose = verbose
+        
+        # One main and one cheap provider for all agents; their SDK clients are built on first call.
+        # Calls are tagged with the session so the scheduler can share the models fairly;
+        # each agent adds its own priority class.
+        self.session_id = Path(log_filepath).stem
+        llm_provider, cheap_llm_provider = LLMFactory.create_pair(llm_provider, cheap_llm_provider)
+        # Per-call model choice when the providers are router views (ROUTER_ENABLED)
+        self.router = llm_provider if isinstance(llm_provider, RouterProvider) else None
+        llm_provider = scheduled(llm_provider, session=self.session_id)
+        cheap_llm_provider = scheduled(cheap_llm_provider, session=self.session_id)
+        
         # Initialize agents
-        self.interviewer = InterviewerAgent()
-        self.observer = ObserverAgent()
-        self.evaluator = EvaluatorAgent()
-        self.feedback_generator = FeedbackGeneratorAgent()
+        question_bank = None
+        rephrase_llm = None
+        if settings.INTERVIEWER_MODE == 'hybrid':
+            question_bank = QuestionBank.open_existing(settings.QUESTION_BANK_PATH)
+            if question_bank is not None and settings.QUESTION_BANK_REPHRASE:
+                rephrase_llm = cheap_llm_provider
+        
+        self.interviewer = InterviewerAgent(llm_provider=llm_provider, question_bank=question_bank,
+                                            rephrase_llm_provider=rephrase_llm,
+                                            cheap_llm_provider=cheap_llm_provider)
+        self.observer = ObserverAgent(llm_provider=cheap_llm_provider)
+        
+        reference_store = None
+        if settings.REFERENCE_CACHE_ENABLED:
+            reference_store = ReferenceAnswerStore(settings.REFERENCE_CACHE_PATH,
+                                                   max_distance=settings.REFERENCE_CACHE_MAX_DISTANCE)
+        answer_index = None
+        if settings.ANSWER_REUSE_ENABLED:
+            answer_index = AnswerIndex(settings.ANSWER_REUSE_PATH,
+                                       threshold=settings.ANSWER_REUSE_THRESHOLD)
+        self.evaluator = EvaluatorAgent(llm_provider=cheap_llm_provider, reference_store=reference_store,
+                                        answer_index=answer_index)
+        self.feedback_generator = FeedbackGeneratorAgent(llm_provider=llm_provider,
+                                                         cheap_llm_provider=cheap_llm_provider)
+        
+        # Follow-up questions prepared on the cheap model while the candidate types
+        self.speculator = None
+        if settings.SPECULATIVE_QUESTIONS:
+            self.speculator = QuestionSpeculator(cheap_llm_provider, settings.SPECULATIVE_BRANCHES)
+        
+        # Observer LLM analysis only on turns where it can change the strategy
+        self.reflection = ReflectionPolicy() if settings.OBSERVER_ADAPTIVE else None
+        
+        # Interview ends early once the hiring band is statistically settled
+        self.stopping = StoppingRule() if settings.EARLY_STOP_ENABLED else None
+        
+        # Turn latency SLO: cheaper agent chain while providers are slow
+        self.slo = SLOController() if settings.SLO_ENABLED else None
         
         # Initialize memory
-        self.memory = ConversationMemory()
+        # One turn store read by the state, memory and logger; old turns spill to disk
+        self.turns = TurnStore(hot_size=settings.TURN_STORE_HOT_TURNS or None,
+                               spill_dir=settings.TURN_STORE_SPILL_DIR)
+        self.memory = ConversationMemory(turn_store=self.turns)
         self.entity_tracker = EntityTracker()
+        # Only the incremental report reads the summary built in the background
+        self.report_builder = ReportBuilder(self.entity_tracker) if settings.FEEDBACK_MODE == 'incremental' else None
         
         # Initialize logger
-        self.logger = InterviewLogger(log_filepath)
+        self.logger = InterviewLogger(log_filepath, turn_store=self.turns)
+        
+        # Crash-safe snapshot of the full workflow state
+        if checkpoint_path is None and settings.CHECKPOINT_ENABLED:
+            checkpoint_path = str(Path(log_filepath).with_suffix('.checkpoint.jsonl'))
+        self.checkpoint = CheckpointFile(checkpoint_path) if checkpoint_path else None
+        self._checkpointed: Dict[str, Any] = {}
         
         # Initialize validator
         self.validator = RobustnessValidator()
         
-        # State
-        self.state: Dict[str, Any] = {}
+        # State: slotted mapping over the InterviewState keys
+        self.state = SessionState()
     
     def initialize_interview(self, name: str, position: str, grade: str, experience: str):
         """Initialize a new interview session.
@@ -47,7 +136,7 @@ class InterviewWorkflow:
             experience: Experience description
         """
         # Create candidate profile
-        profile = CandidateProfile(
+        profile = CompactProfile(
             name=name,
             position=position,
             grade=grade,
@@ -60,53 +149,166 @@ class InterviewWorkflow:
             self.entity_tracker.claim_skill(skill)
         
         # Initialize state
-        self.state = {
-            'candidate_profile': profile,
-            'turns': [],
-            'current_turn_id': 0,
-            'user_message': '',
-            'agent_message': '',
-            'internal_thoughts': '',
-            'current_difficulty': 3,  # Start at medium
-            'performance_history': [],
-            'cumulative_score': 0.0,
-            'topics_covered': set(),
-            'topics_to_cover': self._get_initial_topics(position),
-            'should_continue': True,
-            'interview_complete': False,
-            'off_topic_count': 0,
-            'observer_analysis': '',
-            'evaluator_feedback': '',
-            'strategy_decision': 'Начните интервью с приветствия и первого вопроса'
-        }
+        self.state = self._initial_state(profile)
+        
+        # Initialize logger (pydantic models only at this boundary)
+        self.logger.initialize(name, profile.to_model())
+        
+        if self.checkpoint is not None:
+            self._checkpointed = {}
+            self.checkpoint.start({
+                'log_filepath': str(self.logger.filepath),
+                'participant_name': name,
+                'created_at': datetime.now().isoformat(timespec='seconds')
+            })
+        self._write_checkpoint()
+        
+        if self.verbose:
+            print(f"Интервью инициализировано для {name} на позицию {position} ({grade})")
+    
+    def _initial_state(self, profile: CompactProfile) -> SessionState:
+        """Build the state of an interview that has not started yet.
         
-        # Initialize logger
-        self.logger.initialize(name, profile)
+        Args:
+            profile: Candidate profile
+            
+        Returns:
+            Fresh interview state
+        """
+        return SessionState(
+            candidate_profile=profile,
+            turns=self.turns,
+            current_turn_id=0,
+            user_message='',
+            agent_message='',
+            internal_thoughts='',
+            current_difficulty=3,  # Start at medium
+            performance_history=[],
+            cumulative_score=0.0,
+            topics_covered=set(),
+            topics_to_cover=self._get_initial_topics(profile.position),
+            should_continue=True,
+            interview_complete=False,
+            off_topic_count=0,
+            observer_analysis='',
+            evaluator_feedback='',
+            strategy_decision='Начните интервью с приветствия и первого вопроса',
+            observer_result=None,
+            reference_answer='',
+            asked_bank_questions=[]
+        )
+    
+    def _select_opening(self, state: SessionState) -> Optional[BankQuestion]:
+        if not state['topics_to_cover']:
+            return None
+        return self.interviewer.select_bank_question(state, topic_hint=state['topics_to_cover'][0])
+    
+    def speculate_greeting(self, name: str, position: str, grade: str, experience: str) -> Optional[str]:
+        """Generate the LLM greeting before initialize_interview(), e.g. while the profile is typed.
+        
+        The state is not touched; pass the result to start_interview().
         
-        print(f"Интервью инициализировано для {name} на позицию {position} ({grade})")
+        Args:
+            name: Candidate name
+            position: Position applying for
+            grade: Grade level
+            experience: Experience text assumed for the greeting
+            
+        Returns:
+            Greeting, or None if the interview will open with a bank question instead
+        """
+        state = self._initial_state(CompactProfile(name, position, grade, experience))
+        if self._select_opening(state) is not None:
+            return None
+        return self.interviewer.generate_greeting(state)
     
-    def start_interview(self) -> str:
+    def start_interview(self, on_token: Optional[Callable[[str], None]] = None,
+                        greeting: Optional[str] = None) -> str:
         """Start the interview with a greeting.
         
+        Args:
+            on_token: Called with each chunk of the greeting as it is generated
+            greeting: Greeting prepared by speculate_greeting(), used instead of a new LLM call
+        
+        Returns:
+            Initial greeting message
+        """
+        return run_steps(self._start_steps(greeting), on_token)
+    
+    async def astart_interview(self, on_token: Optional[Callable[[str], Any]] = None,
+                               greeting: Optional[str] = None) -> str:
+        """Async start_interview() for an event loop.
+        
+        Args:
+            on_token: Function or coroutine function called with each chunk of the greeting
+            greeting: Greeting prepared by speculate_greeting()
+        
         Returns:
             Initial greeting message
         """
-        greeting = self.interviewer.generate_greeting(self.state)
+        return await arun_steps(self._start_steps(greeting), on_token)
+    
+    def _start_steps(self, greeting: Optional[str]) -> Steps[str]:
+        opening = self._select_opening(self.state)
+        
+        if opening is not None:
+            greeting = self.interviewer.greeting_from_bank(opening, self.state)
+            yield Emit(greeting)
+        elif greeting:
+            yield Emit(greeting)
+        else:
+            greeting = yield from self.interviewer.greeting_steps(self.state)
+        self._set_bank_question(opening)
         self.state['agent_message'] = greeting
         
-        print(f"\n[Интервьюер]: {greeting}\n")
+        yield Offload(self._write_checkpoint)
+        self._speculate()
+        
+        if self.verbose:
+            print(f"\n[Интервьюер]: {greeting}\n")
         
         return greeting
     
-    def process_turn(self, user_message: str) -> str:
+    def process_turn(self, user_message: str, on_token: Optional[Callable[[str], None]] = None) -> str:
         """Process a single conversation turn.
         
         Args:
             user_message: User's response
+            on_token: Called with each chunk of the interviewer's reply as it is generated
+            
+        Returns:
+            Agent's next question/response
+        """
+        return run_steps(self._turn_steps(user_message), on_token)
+    
+    async def aprocess_turn(self, user_message: str, on_token: Optional[Callable[[str], Any]] = None) -> str:
+        """Async process_turn() for an event loop.
+        
+        LLM calls use the providers' async methods and wait for scheduler
+        slots without blocking the loop; log and checkpoint writes run on
+        worker threads.
+        
+        Args:
+            user_message: User's response
+            on_token: Function or coroutine function called with each chunk of the reply
             
         Returns:
             Agent's next question/response
         """
+        return await arun_steps(self._turn_steps(user_message), on_token)
+    
+    def _turn_steps(self, user_message: str) -> Steps[str]:
+        if self.slo is None:
+            return (yield from self._process_turn(user_message, NORMAL))
+        
+        started = time.perf_counter()
+        response = yield from self._process_turn(user_message, self.slo.level)
+        self.slo.record(time.perf_counter() - started, self.state['current_turn_id'])
+        # The turn was checkpointed before its latency was known
+        yield Offload(self._write_checkpoint)
+        return response
+    
+    def _process_turn(self, user_message: str, degrade_level: int) -> Steps[str]:
         self.state['user_message'] = user_message
         self.state['current_turn_id'] += 1
         
@@ -121,28 +323,52 @@ class InterviewWorkflow:
             if self.state['off_topic_count'] >= 3:
                 response = self.validator.get_redirect_message()
                 internal_thoughts = "[Observer]: Candidate going off-topic repeatedly. Redirecting."
-                self._save_turn(response, internal_thoughts, 0.0)
+                yield Offload(self._save_turn, response, internal_thoughts, 0.0)
                 return response
         
-        # 2. Observer analyzes response (HIDDEN)
-        observer_result = self.observer.analyze_response(self.state)
-        self.state['observer_analysis'] = observer_result['analysis']
-        self.state['strategy_decision'] = observer_result['strategy_decision']
-        
         # Get the last question asked
         last_question = ""
         if self.state['turns']:
             last_question = self.state['turns'][-1].agent_visible_message
+        previous_observer = self.state['observer_result']
+        asked_topic = answer_topic(last_question, previous_observer.next_topic if previous_observer else '',
+                                   self.state['topics_to_cover'])
         
-        # 3. Evaluator checks facts (HIDDEN)
+        # 2. Evaluator checks facts (HIDDEN); does not depend on the Observer, so it runs first
         if not self.validator.should_skip_evaluation(user_message):
-            evaluator_result = self.evaluator.evaluate_response(self.state, last_question)
+            if degrade_level >= HEURISTIC_EVALUATOR:
+                evaluator_result = self.evaluator.evaluate_heuristic(self.state, last_question)
+            else:
+                evaluator_result = yield from self.evaluator.evaluate_steps(self.state, last_question)
             self.state['evaluator_feedback'] = evaluator_result['feedback']
             performance_score = evaluator_result['score']
         else:
-            evaluator_result = {'score': 0.3, 'feedback': 'Insufficient answer', 'correct_answer': ''}
+            evaluator_result = {
+                'score': 0.3,
+                'feedback': 'Insufficient answer',
+                'correct_answer': '',
+                'result': EvaluatorResult(correctness='incorrect', score=0.3, comment='Insufficient answer')
+            }
             performance_score = 0.3
         
+        # 3. Observer analyzes response (HIDDEN); under SLO pressure or while the strategy
+        # is stable the last strategy is kept
+        if degrade_level >= SKIP_OBSERVER:
+            observer_result = self.observer.carry_over(self.state)
+        elif self.reflection is not None:
+            reason = self.reflection.decide(self.state, user_message, performance_score)
+            if reason is None:
+                observer_result = self.observer.carry_over(
+                    self.state, analysis="Анализ пропущен: стратегия стабильна, сохранена стратегия предыдущего хода")
+            else:
+                observer_result = yield from self.observer.analyze_steps(self.state)
+            self.reflection.record(reason, observer_result['result'].next_topic, self.state['topics_to_cover'])
+        else:
+            observer_result = yield from self.observer.analyze_steps(self.state)
+        self.state['observer_analysis'] = observer_result['analysis']
+        self.state['strategy_decision'] = observer_result['strategy_decision']
+        self.state['observer_result'] = CompactObserverResult.from_model(observer_result['result'])
+        
         # Update performance history
         self.state['performance_history'].append(performance_score)
         self.state['cumulative_score'] = sum(self.state['performance_history']) / len(self.state['performance_history'])
@@ -150,6 +376,8 @@ class InterviewWorkflow:
         # 4. Adjust difficulty based on observer's recommendation
         difficulty_change = observer_result['difficulty_change']
         old_difficulty = self.state['current_difficulty']
+        if self.stopping is not None:
+            self.stopping.update(performance_score, old_difficulty, asked_topic)
         new_difficulty = max(settings.DIFFICULTY_MIN, 
                             min(settings.DIFFICULTY_MAX, 
                                 old_difficulty + difficulty_change))
@@ -161,7 +389,7 @@ class InterviewWorkflow:
         topics = self.entity_tracker.extract_topics_from_text(user_message + " " + last_question)
         for topic in topics:
             self.entity_tracker.add_topic(topic)
-            self.state['topics_covered'].add(topic)
+            self.state['topics_covered'].add(intern_text(topic))
         
         # --- END HIDDEN REFLECTION ---
         
@@ -172,20 +400,53 @@ class InterviewWorkflow:
             observer_result['strategy_decision'],
             performance_score
         )
-        
-        # 7. Check if interview should end
-        if self.observer.check_interview_completion(self.state):
+        if degrade_level > NORMAL:
+            internal_thoughts += f" | [SLO]: режим деградации {degrade_level} ({LEVEL_NAMES[degrade_level]})"
+        
+        # 7. Check if interview should end: turn and topic limits or a settled hiring band
+        settled = self.stopping.decision() if self.stopping is not None else None
+        if settled is not None:
+            internal_thoughts += f" | [Stop]: полоса найма {settled[0]} определена с вероятностью {settled[1]:.2f}"
+        if settled is not None or self.observer.check_interview_completion(self.state):
             self.state['should_continue'] = False
             self.state['interview_complete'] = True
             
+            if self.speculator is not None:
+                self.speculator.discard()
+            
             # Generate final response
             response = "Спасибо за ваши ответы! Это был последний вопрос. Сейчас я подготовлю для вас финальный фидбэк."
-            self._save_turn(response, internal_thoughts, performance_score)
+            yield Emit(response)
+            yield Offload(self._save_turn, response, internal_thoughts, performance_score,
+                          self.state['observer_result'], evaluator_result['result'], degrade_level)
             
             return response
         
-        # 8. Interviewer generates next question (USER-FACING)
-        response = self.interviewer.generate_response(self.state)
+        # 8. Interviewer asks the next question (USER-FACING): bank first in hybrid mode
+        bank_question = self.interviewer.select_bank_question(self.state)
+        speculative = None
+        if self.speculator is not None:
+            if bank_question is not None:
+                self.speculator.discard()
+            else:
+                # A prepared question ignores what was said: not for counter-questions or off-topic answers
+                result = self.state['observer_result']
+                usable = not is_question and not (result.off_topic or result.hallucination)
+                speculative = yield from self.speculator.take_steps(difficulty_change if usable else None)
+        
+        if bank_question is not None:
+            response = yield from self.interviewer.bank_question_steps(bank_question, self.state)
+            yield Emit(response)
+            internal_thoughts += (f" | [Interviewer]: Вопрос из банка #{bank_question.id} "
+                                  f"({bank_question.topic}, сложность {bank_question.difficulty})")
+        elif speculative is not None:
+            response = speculative
+            yield Emit(response)
+            internal_thoughts += f" | [Interviewer]: Заготовленный вопрос (ветка {difficulty_change:+d})"
+        else:
+            response = yield from self.interviewer.response_steps(self.state,
+                                                                  use_cheap=degrade_level >= CHEAP_INTERVIEWER)
+        self._set_bank_question(bank_question)
         
         # Check if response is empty
         if not response or not response.strip():
@@ -194,9 +455,12 @@ class InterviewWorkflow:
         self.state['agent_message'] = response
         
         # 9. Save turn to log
-        self._save_turn(response, internal_thoughts, performance_score)
+        yield Offload(self._save_turn, response, internal_thoughts, performance_score,
+                      self.state['observer_result'], evaluator_result['result'], degrade_level)
+        self._speculate()
         
-        print(f"\n[Интервьюер]: {response}\n")
+        if self.verbose:
+            print(f"\n[Интервьюер]: {response}\n")
         
         return response
     
@@ -206,63 +470,289 @@ class InterviewWorkflow:
         Returns:
             Feedback summary
         """
-        # Generate feedback
-        feedback = self.feedback_generator.generate_feedback(self.state)
+        if self.verbose:
+            print("\n" + "="*60)
+            print("ФИНАЛЬНЫЙ ОТЧЕТ")
+            print("="*60)
+        
+        # Print each section as soon as its field arrives from the stream
+        printed = set()
+        on_field = None
+        if self.verbose:
+            on_field = lambda field, value: self._print_feedback_field(field, value, printed)
+        if settings.FEEDBACK_MODE == 'incremental':
+            summary = self.report_builder.get_summary()
+            feedback = self.feedback_generator.generate_incremental_feedback(
+                self.state, summary, self.report_builder.format_summary(summary), on_field=on_field
+            )
+        elif settings.FEEDBACK_MODE == 'sectioned':
+            feedback = self.feedback_generator.generate_sectioned_feedback(self.state, on_field=on_field)
+        else:
+            feedback = self.feedback_generator.generate_feedback(self.state, on_field=on_field)
         
         # Save to logger
         self.logger.set_final_feedback(feedback)
-        
-        # Print summary
-        print("\n" + "="*60)
-        print("ФИНАЛЬНЫЙ ОТЧЕТ")
-        print("="*60)
-        print(f"\nВЕРДИКТ:")
-        print(f"  Грейд: {feedback.grade}")
-        print(f"  Рекомендация: {feedback.hiring_recommendation}")
-        print(f"  Уверенность: {feedback.confidence_score}%")
-        
-        print(f"\nПОДТВЕРЖДЕННЫЕ НАВЫКИ:")
-        for skill in feedback.confirmed_skills[:5]:
-            print(f"  + {skill}")
-        
-        print(f"\nПРОБЕЛЫ В ЗНАНИЯХ:")
-        for gap in feedback.knowledge_gaps[:3]:
-            print(f"  - {gap.topic}")
-            print(f"    Ваш ответ: {gap.user_answer[:60]}...")
-            print(f"    Правильно: {gap.correct_answer[:60]}...")
-        
-        print(f"\nROADMAP ДЛЯ РАЗВИТИЯ:")
-        for item in feedback.roadmap[:5]:
-            print(f"  > {item}")
-        
-        print("\n" + "="*60)
-        print(f"Полный отчет сохранен в: {self.logger.filepath}")
-        print("="*60 + "\n")
+        # The log now holds the whole interview; nothing is left to resume
+        if self.checkpoint is not None:
+            self.checkpoint.remove()
+        
+        if self.verbose:
+            # Sections recovered after the stream ended
+            feedback_data = feedback.model_dump()
+            for field in self.feedback_generator.REQUIRED_FIELDS:
+                self._print_feedback_field(field, feedback_data[field], printed)
+            
+            if self.speculator is not None:
+                stats = self.speculator.get_stats()
+                print(f"\nЗаготовленные вопросы: попаданий {stats['hits']} из {stats['hits'] + stats['misses']} "
+                      f"({stats['hit_rate']:.0%}), потрачено впустую ~{stats['wasted_tokens']} "
+                      f"из ~{stats['spent_tokens']} токенов")
+            
+            if self.reflection is not None:
+                stats = self.reflection.get_stats()
+                print(f"Observer: вызван на {stats['calls']} из {stats['turns']} ходов, сэкономлено вызовов "
+                      f"{stats['skipped']} ({stats['saved_ratio']:.0%})" + "".join(
+                          f"; {REASON_NAMES[reason]}: {count}" for reason, count in stats['reasons'].items()))
+            
+            if self.stopping is not None:
+                stats = self.stopping.get_stats()
+                print("Полосы найма по оценкам: " + ", ".join(
+                    f"{band} {probability:.0%}" for band, probability in stats['bands'].items()
+                ) + f" ({stats['turns']} ответов, тем: {stats['topics']})")
+            
+            if self.slo is not None:
+                stats = self.slo.get_stats()
+                print(f"SLO задержки хода: в режиме деградации {stats['degraded_turns']} из {stats['turns']} ходов, "
+                      f"переключений уровня {len(stats['transitions'])}, p95 {stats['p95']:.1f} с")
+            
+            if self.router is not None:
+                session = self.router.get_report(session=self.session_id)['session']
+                print("Маршрутизация моделей: " + ", ".join(
+                    f"{agent} → {model}: {count}"
+                    for agent, models in sorted(session['decisions'].items()) for model, count in models.items()
+                ) + f"; стоимость сессии ~${session['cost']:.4f}")
+            
+            usage = usage_meter.totals()
+            if usage['calls']:
+                print(f"Токены по данным API: вход {usage['prompt_tokens']}, выход {usage['completion_tokens']}, "
+                      f"из них скрытые рассуждения {usage['reasoning_tokens']} ({usage['calls']} вызовов)")
+            
+            print("\n" + "="*60)
+            print(f"Полный отчет сохранен в: {self.logger.filepath}")
+            print("="*60 + "\n")
         
         return self.feedback_generator.generate_quick_summary(self.state)
     
-    def _save_turn(self, agent_message: str, internal_thoughts: str, score: float):
+    def close(self):
+        """Release background workers and store connections held by this session."""
+        if self.report_builder is not None:
+            self.report_builder.close()
+        self.turns.close()
+        if self.speculator is not None:
+            self.speculator.close()
+        if self.router is not None:
+            self.router.forget(self.session_id)
+        for store in (self.interviewer.question_bank, self.evaluator.reference_store,
+                      self.evaluator.answer_index):
+            if store is not None:
+                store.close()
+    
+    def _print_feedback_field(self, field: str, value: Any, printed: set):
+        """Print one section of the final report, once.
+        
+        Args:
+            field: FinalFeedback field name
+            value: Field value (raw JSON value while streaming)
+            printed: Names of sections already printed
+        """
+        if field in printed:
+            return
+        printed.add(field)
+        
+        if field in ('grade', 'hiring_recommendation', 'confidence_score') and 'verdict' not in printed:
+            printed.add('verdict')
+            print(f"\nВЕРДИКТ:")
+        
+        items = value if isinstance(value, list) else []
+        
+        if field == 'grade':
+            print(f"  Грейд: {value}")
+        elif field == 'hiring_recommendation':
+            print(f"  Рекомендация: {value}")
+        elif field == 'confidence_score':
+            print(f"  Уверенность: {value}%")
+        elif field == 'confirmed_skills':
+            print(f"\nПОДТВЕРЖДЕННЫЕ НАВЫКИ:")
+            for skill in items[:5]:
+                print(f"  + {skill}")
+        elif field == 'knowledge_gaps':
+            print(f"\nПРОБЕЛЫ В ЗНАНИЯХ:")
+            for gap in items[:3]:
+                if not isinstance(gap, dict):
+                    continue
+                print(f"  - {gap.get('topic', '')}")
+                print(f"    Ваш ответ: {str(gap.get('user_answer', ''))[:60]}...")
+                print(f"    Правильно: {str(gap.get('correct_answer', ''))[:60]}...")
+        elif field == 'roadmap':
+            print(f"\nROADMAP ДЛЯ РАЗВИТИЯ:")
+            for item in items[:5]:
+                print(f"  > {item}")
+    
+    def _speculate(self):
+        """Prepare follow-up branches for the question just asked, if enabled."""
+        if self.speculator is not None and not self.is_complete():
+            self.speculator.start(self.state)
+    
+    def _set_bank_question(self, question: Optional[BankQuestion]):
+        """Remember the bank question just asked (None for a generated one).
+        
+        Args:
+            question: Bank question or None
+        """
+        self.state['reference_answer'] = question.reference_answer if question else ''
+        if question is not None:
+            self.state['asked_bank_questions'].append(question.id)
+    
+    def _save_turn(self, agent_message: str, internal_thoughts: str, score: float,
+                   observer_result: Optional[CompactObserverResult] = None,
+                   evaluator_result: Optional[EvaluatorResult] = None, degrade_level: int = NORMAL):
         """Save a turn to memory and log.
         
         Args:
             agent_message: Message shown to user
             internal_thoughts: Internal agent communications
             score: Performance score for this turn
+            observer_result: Structured Observer output, if the Observer ran
+            evaluator_result: Structured Evaluator output, if the Evaluator ran
+            degrade_level: SLO degrade level the turn ran at (logged in performance_metrics)
         """
-        turn = Turn(
+        turn = CompactTurn(
             turn_id=self.state['current_turn_id'],
             agent_visible_message=agent_message,
             user_message=self.state['user_message'],
             internal_thoughts=internal_thoughts,
-            performance_metrics={'score': score}
+            score=score,
+            observer_result=observer_result,
+            evaluator_result=CompactEvaluatorResult.from_model(evaluator_result) if evaluator_result else None,
+            degrade_level=degrade_level
         )
         
-        # Save to memory
-        self.memory.add_turn(turn)
-        self.state['turns'].append(turn)
+        # Aggregate report material in the background
+        if self.report_builder is not None:
+            answered_question = self.state['turns'][-1].agent_visible_message if self.state['turns'] else ''
+            self.report_builder.add_turn(turn, answered_question)
         
-        # Save to log file
+        # Save to the shared turn store and log file
         self.logger.add_turn(turn)
+        self._write_checkpoint(turn=turn)
+    
+    def _write_checkpoint(self, turn: Optional[CompactTurn] = None):
+        """Append the state keys changed since the previous record to the checkpoint.
+        
+        Args:
+            turn: Turn saved since the previous record, if any
+        """
+        if self.checkpoint is None:
+            return
+        
+        # Deep copy: lists such as performance_history are mutated in place
+        state = copy.deepcopy({key: value for key, value in self.state.items()
+                               if key not in ('turns', 'candidate_profile', 'observer_result')})
+        state['candidate_profile'] = self.state['candidate_profile'].to_model().model_dump(mode='json')
+        state['performance_history'] = list(self.state['performance_history'])
+        state['topics_covered'] = sorted(self.state['topics_covered'])
+        observer_result = self.state.get('observer_result')
+        state['observer_result'] = observer_result.to_model().model_dump(mode='json') if observer_result else None
+        state['entities'] = self.entity_tracker.to_dict()
+        if self.reflection is not None:
+            state['reflection'] = self.reflection.to_dict()
+        if self.slo is not None:
+            state['slo'] = self.slo.to_dict()
+        
+        record = {'state': {key: value for key, value in state.items()
+                            if key not in self._checkpointed or self._checkpointed[key] != value}}
+        self._checkpointed.update(record['state'])
+        if turn is not None:
+            record['turn'] = turn.to_model().model_dump(mode='json')
+        self.checkpoint.append(record)
+    
+    @classmethod
+    def resume(cls, checkpoint_path: str, llm_provider: LLMProvider = None,
+               cheap_llm_provider: LLMProvider = None, verbose: bool = True) -> 'InterviewWorkflow':
+        """Restore an interview from its checkpoint, e.g. in another worker process.
+        
+        Args:
+            checkpoint_path: Checkpoint written by a previous workflow
+            llm_provider: Main model (created if None)
+            cheap_llm_provider: Cheap model (created if None)
+            verbose: Print the conversation and report to stdout
+            
+        Returns:
+            Workflow ready to continue with process_turn()
+        """
+        header, records = CheckpointFile.load(checkpoint_path)
+        if not records:
+            raise ValueError(f"Checkpoint has no state records: {checkpoint_path}")
+        
+        workflow = cls(log_filepath=header['log_filepath'], llm_provider=llm_provider,
+                       cheap_llm_provider=cheap_llm_provider, verbose=verbose,
+                       checkpoint_path=checkpoint_path)
+        workflow.checkpoint.discard_torn_tail()
+        workflow._restore(records)
+        return workflow
+    
+    def _restore(self, records: List[dict]):
+        """Rebuild state, memory, report material and log from checkpoint records.
+        
+        Args:
+            records: Checkpoint records in write order
+        """
+        for record in records:
+            self._checkpointed.update(record['state'])
+        state = copy.deepcopy(self._checkpointed)
+        
+        self.entity_tracker.load_dict(state.pop('entities'))
+        reflection, slo = state.pop('reflection', None), state.pop('slo', None)
+        if self.reflection is not None and reflection is not None:
+            self.reflection.load_dict(reflection)
+        if self.slo is not None and slo is not None:
+            self.slo.load_dict(slo)
+        profile = CandidateProfile.model_validate(state['candidate_profile'])
+        state['candidate_profile'] = CompactProfile(profile.name, profile.position, profile.grade,
+                                                    profile.experience)
+        state['topics_covered'] = set(map(intern_text, state['topics_covered']))
+        if state.get('observer_result') is not None:
+            state['observer_result'] = CompactObserverResult.from_model(
+                ObserverResult.model_validate(state['observer_result'])
+            )
+        state['turns'] = self.turns
+        self.state = SessionState(**state)
+        
+        # Report material is derived from the turns
+        answered_question = ''
+        for record in records:
+            if 'turn' not in record:
+                continue
+            turn = CompactTurn.from_model(Turn.model_validate(record['turn']))
+            self.turns.append(turn)
+            if self.report_builder is not None:
+                self.report_builder.add_turn(turn, answered_question)
+            answered_question = turn.agent_visible_message
+        if self.stopping is not None:
+            for _ in replay_turns(self.stopping, self.turns, self.state['topics_to_cover']):
+                pass
+        
+        # Checkpoints of earlier versions kept the final report instead of being removed
+        final_feedback = next(
+            (record['final_feedback'] for record in reversed(records) if 'final_feedback' in record), None
+        )
+        self.logger.restore(
+            profile.name,
+            profile,
+            FinalFeedback.model_validate(final_feedback) if final_feedback else None
+        )
+        if final_feedback is None:
+            self._speculate()
     
     def _compile_internal_thoughts(self, observer_analysis: str, 
                                    evaluator_feedback: str,
@@ -295,26 +785,7 @@ class InterviewWorkflow:
         Returns:
             List of topics
         """
-        # Common topics for technical positions
-        common_topics = [
-            'programming basics',
-            'data structures',
-            'algorithms',
-            'oop',
-            'testing',
-            'debugging'
-        ]
-        
-        position_lower = position.lower()
-        
-        if 'backend' in position_lower or 'server' in position_lower:
-            common_topics.extend(['databases', 'api design', 'architecture'])
-        elif 'frontend' in position_lower:
-            common_topics.extend(['html/css', 'javascript', 'frameworks'])
-        elif 'fullstack' in position_lower or 'full stack' in position_lower:
-            common_topics.extend(['databases', 'api design', 'frontend frameworks'])
-        
-        return common_topics
+        return get_position_topics(position)
     
     def is_complete(self) -> bool:
         """Check if interview is complete.
@@ -1,6 +1,11 @@
 import sys
 from datetime import datetime
-from core.workflow import InterviewWorkflow
+from pathlib import Path
+from typing import Callable
+from core.warmup import DEFAULT_EXPERIENCE, WarmupPipeline
+
+# Application modules are imported inside the commands that need them,
+# so --help and argument errors return without loading pydantic or SDKs
 
 
 def print_banner():
@@ -11,7 +16,7 @@ def print_banner():
     print("="*60 + "\n")
 
 
-def get_candidate_info():
+def get_candidate_info(on_profile: Callable[[str, str, str], None] = None):
     print("Введите информацию о кандидате:\n")
     
     name = input("Имя кандидата: ").strip()
@@ -31,9 +36,13 @@ def get_candidate_info():
     grade_map = {'1': 'Junior', '2': 'Middle', '3': 'Senior'}
     grade = grade_map.get(grade_choice, 'Junior')
     
+    # The greeting can be prepared while the experience is typed
+    if on_profile is not None:
+        on_profile(name, position, grade)
+    
     experience = input("\nОпыт работы (кратко): ").strip()
     if not experience:
-        experience = "Начинающий разработчик"
+        experience = DEFAULT_EXPERIENCE
     
     return name, position, grade, experience
 
@@ -50,29 +59,37 @@ def print_help():
 def run_interactive_interview():
     print_banner()
     
-    # Get candidate information
-    name, position, grade, experience = get_candidate_info()
+    # Imports, provider clients and connections are prepared while the profile is typed
+    warmup = WarmupPipeline()
+    warmup.start()
     
     # Create log filename with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    # Clean name for filename - remove invalid characters
-    safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '_', '-')).replace(' ', '_')
-    log_filename = f"logs/interview_{timestamp}_{safe_name}.json"
+    log_filename = None
+    
+    def on_profile(name: str, position: str, grade: str):
+        nonlocal log_filename
+        # Clean name for filename - remove invalid characters
+        safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '_', '-')).replace(' ', '_')
+        log_filename = f"logs/interview_{timestamp}_{safe_name}.json"
+        warmup.profile_known(name, position, grade, log_filename)
+    
+    # Get candidate information
+    name, position, grade, experience = get_candidate_info(on_profile=on_profile)
     
     # Initialize workflow
     print("\n" + "-"*60)
     print("Инициализация системы...")
     print("-"*60)
     
-    workflow = InterviewWorkflow(log_filepath=log_filename)
-    workflow.initialize_interview(name, position, grade, experience)
+    workflow, prepared_greeting = warmup.finish(experience)
     
     # Start interview
     print("\n" + "-"*60)
     print("Начало интервью")
     print("-"*60)
     
-    greeting = workflow.start_interview()
+    greeting = workflow.start_interview(greeting=prepared_greeting)
     
     print_help()
     
@@ -151,6 +168,8 @@ def run_batch_interview(name: str, position: str, grade: str,
     safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '_', '-')).replace(' ', '_')
     log_filename = f"logs/interview_{timestamp}_{safe_name}.json"
     
+    from core.workflow import InterviewWorkflow
+    
     workflow = InterviewWorkflow(log_filepath=log_filename)
     workflow.initialize_interview(name, position, grade, experience)
     
@@ -176,14 +195,187 @@ def run_batch_interview(name: str, position: str, grade: str,
     return log_filename
 
 
+def build_question_bank(per_cell: int = 3):
+    from config import settings
+    from core.topics import COMMON_TOPICS, FAMILY_TOPICS
+    from models.llm_factory import LLMFactory
+    from storage.question_bank import QuestionBank
+    
+    print(f"Построение банка вопросов: {settings.QUESTION_BANK_PATH}")
+    
+    bank = QuestionBank(settings.QUESTION_BANK_PATH)
+    topics_by_family = {
+        family: COMMON_TOPICS + [topic for topic in topics if topic not in COMMON_TOPICS]
+        for family, topics in FAMILY_TOPICS.items()
+    }
+    added = bank.build(LLMFactory.create_provider(), topics_by_family, per_cell=per_cell)
+    
+    print(f"\nДобавлено вопросов: {added}, всего в банке: {bank.count()}")
+    bank.close()
+
+
+def get_option(name: str, default: str = None) -> str:
+    if name in sys.argv[:-1]:
+        return sys.argv[sys.argv.index(name) + 1]
+    return default
+
+
+def run_batch_file(input_path: str, concurrency: int = 4, output_dir: str = None):
+    from core.batch import BatchRunner
+    
+    output_dir = output_dir or f"logs/batch_{Path(input_path).stem}"
+    print(f"[Batch Mode] {input_path} -> {output_dir} (concurrency {concurrency})")
+    
+    counts = BatchRunner(output_dir, concurrency=concurrency).run(input_path)
+    
+    print(f"\n[Batch Mode] Готово: {counts['ok']}, ошибок: {counts['error']}, "
+          f"пропущено (уже завершены): {counts['skipped']}")
+    print(f"Сводка: {Path(output_dir) / 'summary.csv'}")
+
+
+def show_stats(group_by: str = 'position', since: str = None, position: str = None, logs_dir: str = None):
+    from datetime import date, timedelta
+    from config import settings
+    from storage.log_index import LogIndex
+    
+    # "7d" = the last seven days, otherwise an ISO date
+    if since and since.endswith('d') and since[:-1].isdigit():
+        since = (datetime.now() - timedelta(days=int(since[:-1]))).strftime('%Y-%m-%d')
+    elif since:
+        try:
+            date.fromisoformat(since)
+        except ValueError:
+            print(f"Ошибка: неверное значение --since: {since} (ожидается 7d или YYYY-MM-DD)")
+            sys.exit(2)
+    
+    index = LogIndex(settings.LOG_INDEX_PATH)
+    counts = index.refresh(logs_dir or str(settings.LOGS_DIR))
+    print(f"Индекс {settings.LOG_INDEX_PATH}: новых {counts['added']}, изменено {counts['updated']}, "
+          f"без изменений {counts['unchanged']}, удалено {counts['removed']}, не логи {counts['invalid']}")
+    
+    try:
+        rows = index.aggregate(group_by, since=since, position=position)
+    except ValueError as e:
+        print(f"Ошибка: {e}")
+        sys.exit(2)
+    finally:
+        index.close()
+    
+    print(f"\n{group_by:<28}{'сессий':>8}{'ответов':>9}{'ср. балл':>10}{'hire':>7}")
+    for group, sessions, answers, avg_score, hire_rate in rows:
+        print(f"{str(group if group is not None else '-')[:27]:<28}{sessions:>8}{answers or 0:>9}"
+              f"{f'{avg_score:.2f}' if avg_score is not None else '-':>10}"
+              f"{f'{hire_rate:.0%}' if hire_rate is not None else '-':>7}")
+
+
+def migrate_logs(logs_dir: str = None, archive_dir: str = None, codec: str = None, remove: bool = False):
+    from config import settings
+    from utils.archive import migrate_logs as migrate
+    
+    # Archives sit next to the logs they were migrated from unless given explicitly
+    if archive_dir is None:
+        archive_dir = str(Path(logs_dir) / 'archive') if logs_dir else str(settings.ARCHIVE_DIR)
+    logs_dir = logs_dir or str(settings.LOGS_DIR)
+    try:
+        counts = migrate(logs_dir, archive_dir, codec=codec, remove=remove)
+    except ValueError as e:
+        print(f"Ошибка: {e}")
+        return
+    
+    print(f"Архивы {archive_dir}: перенесено {counts['archived']}, уже в архиве {counts['skipped']}, "
+          f"не завершены {counts['unfinished']}, не логи {counts['invalid']}, удалено исходных {counts['removed']}")
+    if counts['bytes_after']:
+        print(f"Размер: {counts['bytes_before'] / 1024:.0f} КБ -> {counts['bytes_after'] / 1024:.0f} КБ "
+              f"(в {counts['bytes_before'] / counts['bytes_after']:.1f} раза меньше)")
+
+
+def run_regrade(logs_dir: str = None, output_dir: str = None, concurrency: int = 8,
+                offline: bool = False, latency: float = 0.0):
+    from config import settings
+    from core.regrade import LocalEvaluatorProvider, RegradeRunner
+    
+    logs_dir = logs_dir or str(settings.LOGS_DIR)
+    output_dir = output_dir or f"data/regrade_{datetime.now().strftime('%Y%m%d')}"
+    llm = LocalEvaluatorProvider(latency=latency) if offline else None
+    runner = RegradeRunner(output_dir, concurrency=concurrency, llm_provider=llm)
+    print(f"[Regrade] {logs_dir} -> {output_dir} (модель {runner.model}, concurrency {concurrency})")
+    
+    counts = runner.run(logs_dir, on_progress=lambda c: print(f"[Regrade] оценено {c['ok']}, ошибок {c['error']}"))
+    print(f"\n[Regrade] Готово: {counts['ok']}, ошибок: {counts['error']}, уже оценены: {counts['resumed']}, "
+          f"без оценки: {counts['skipped']}, не логи: {counts['invalid']}")
+    
+    drift = runner.drift()
+    if not drift['answers']:
+        return
+    print(f"Ответов {drift['answers']} в {drift['sessions']} сессиях: средний балл {drift['mean_old']:.2f} -> "
+          f"{drift['mean_new']:.2f} ({drift['mean_delta']:+.2f}), среднее |Δ| {drift['mean_abs_delta']:.2f}, "
+          f"|Δ| >= 0.25 у {drift['large_share']:.0%}")
+    agreement = drift['correctness_agreement']
+    print(f"Совпадение correctness: {f'{agreement:.0%}' if agreement is not None else '-'}, "
+          f"смена диапазона балла: ответов {drift['band_changes']}, сессий {drift['sessions_band_changed']}")
+    print(f"\n{'тема':<28}{'ответов':>9}{'было':>7}{'стало':>7}{'Δ':>7}")
+    for topic, group in list(drift['by_topic'].items())[:10]:
+        print(f"{topic[:27]:<28}{group['answers']:>9}{group['mean_old']:>7.2f}{group['mean_new']:>7.2f}"
+              f"{group['mean_delta']:>+7.2f}")
+    print(f"Полный отчет: {Path(output_dir) / 'drift.json'}")
+
+
 def main():
     if len(sys.argv) > 1:
         if sys.argv[1] == '--help':
             print("Usage:")
             print("  python main.py              - Interactive mode")
+            print("  python main.py --build-bank [N] - Build the question bank (N questions per cell)")
+            print("  python main.py --serve [PORT]   - Run the multi-session HTTP/WebSocket server")
+            print("  python main.py --batch FILE.jsonl [--concurrency N] [--output DIR]")
+            print("                                  - Run scripted interviews concurrently (resumable)")
+            print("  python main.py --stats [GROUP] [--since 7d|YYYY-MM-DD] [--position TEXT] [--logs DIR]")
+            print("                                  - Index logs/ and show aggregates by position, grade,")
+            print("                                    recommendation, week, day, topic or difficulty")
+            print("  python main.py --migrate-logs [--logs DIR] [--archive DIR] [--codec zlib|lzma] [--remove]")
+            print("                                  - Move logs/*.json into compressed monthly archives")
+            print("  python main.py --regrade [--logs DIR] [--output DIR] [--concurrency N] [--offline [--latency S]]")
+            print("                                  - Re-score logged answers with the current Evaluator")
+            print("                                    (resumable) and report score drift")
             print("  python main.py --help       - Show this help")
             print()
             return
+        
+        if sys.argv[1] == '--build-bank':
+            per_cell = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+            build_question_bank(per_cell)
+            return
+        
+        if sys.argv[1] == '--serve':
+            from server import run_server
+            port = int(sys.argv[2]) if len(sys.argv) > 2 else None
+            run_server(port=port)
+            return
+        
+        if sys.argv[1] == '--stats':
+            group_by = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith('--') else 'position'
+            show_stats(group_by, since=get_option('--since'), position=get_option('--position'),
+                       logs_dir=get_option('--logs'))
+            return
+        
+        if sys.argv[1] == '--migrate-logs':
+            migrate_logs(get_option('--logs'), get_option('--archive'), codec=get_option('--codec'),
+                         remove='--remove' in sys.argv)
+            return
+        
+        if sys.argv[1] == '--regrade':
+            run_regrade(get_option('--logs'), get_option('--output'),
+                        concurrency=int(get_option('--concurrency', '8')),
+                        offline='--offline' in sys.argv, latency=float(get_option('--latency', '0')))
+            return
+        
+        if sys.argv[1] == '--batch':
+            if len(sys.argv) < 3 or sys.argv[2].startswith('--'):
+                print("Usage: python main.py --batch FILE.jsonl [--concurrency N] [--output DIR]")
+                sys.exit(2)
+            run_batch_file(sys.argv[2], concurrency=int(get_option('--concurrency', '4')),
+                           output_dir=get_option('--output'))
+            return
     
     # Run interactive interview
     try:
@@ -1,4 +1,6 @@
 from .conversation_memory import ConversationMemory
 from .entity_tracker import EntityTracker
+from .report_builder import ReportBuilder
+from .turn_store import TurnStore
 
-__all__ = ['ConversationMemory', 'EntityTracker']
+__all__ = ['ConversationMemory', 'EntityTracker', 'ReportBuilder', 'TurnStore']
@@ -1,20 +1,24 @@
-from typing import List, Dict
+from typing import List, Dict, Union
 from models.schemas import Turn
+from models.compact import CompactTurn
+from memory.turn_store import TurnStore
 
 
 class ConversationMemory:
-    def __init__(self, window_size: int = 5):
+    def __init__(self, window_size: int = 5, turn_store: TurnStore = None):
         self.window_size = window_size
-        self.all_turns: List[Turn] = []
+        # Shared with the workflow state and the logger when provided
+        self.all_turns = turn_store if turn_store is not None else TurnStore()
     
-    def add_turn(self, turn: Turn):
+    def add_turn(self, turn: Union[Turn, CompactTurn]):
         self.all_turns.append(turn)
     
-    def get_recent_context(self, n: int = None) -> List[Turn]:
+    def get_recent_context(self, n: int = None) -> List[CompactTurn]:
         n = n or self.window_size
         return self.all_turns[-n:] if self.all_turns else []
     
-    def get_all_turns(self) -> List[Turn]:
+    def get_all_turns(self) -> TurnStore:
+        """Get all turns; spilled turns are read lazily while iterating."""
         return self.all_turns
     
     def get_conversation_summary(self) -> str:
@@ -38,14 +42,14 @@ class ConversationMemory:
         
         return "\n".join(summary_parts)
     
-    def search_turns_by_keyword(self, keyword: str) -> List[Turn]:
+    def search_turns_by_keyword(self, keyword: str) -> List[CompactTurn]:
         """Search turns containing a specific keyword.
         
         Args:
             keyword: Keyword to search for
             
         Returns:
-            List of matching Turn objects
+            List of matching turns
         """
         keyword_lower = keyword.lower()
         matching_turns = []
@@ -92,4 +96,4 @@ class ConversationMemory:
     
     def clear(self):
         """Clear all conversation history."""
-        self.all_turns = []
+        self.all_turns.clear()
@@ -1,4 +1,5 @@
 from typing import Set, Dict, List
+from models.compact import intern_text
 
 
 class EntityTracker:
@@ -10,16 +11,16 @@ class EntityTracker:
         self.candidate_attributes: Dict[str, any] = {}
     
     def claim_skill(self, skill: str):
-        self.skills_claimed.add(skill.lower())
+        self.skills_claimed.add(intern_text(skill.lower()))
     
     def verify_skill(self, skill: str, status: str):
-        self.skills_verified[skill.lower()] = status
+        self.skills_verified[intern_text(skill.lower())] = intern_text(status)
     
     def add_topic(self, topic: str):
-        self.topics_covered.add(topic.lower())
+        self.topics_covered.add(intern_text(topic.lower()))
     
     def add_topics_to_cover(self, topics: List[str]):
-        self.topics_to_cover.extend([t.lower() for t in topics])
+        self.topics_to_cover.extend([intern_text(t.lower()) for t in topics])
     
     def is_topic_covered(self, topic: str) -> bool:
         """Check if a topic has been covered.
@@ -160,3 +161,30 @@ class EntityTracker:
             'topics_remaining': len([t for t in self.topics_to_cover 
                                     if t not in self.topics_covered])
         }
+    
+    def to_dict(self) -> Dict[str, any]:
+        """Serialise the tracker for a checkpoint.
+        
+        Returns:
+            JSON-compatible dictionary
+        """
+        return {
+            'skills_claimed': sorted(self.skills_claimed),
+            'skills_verified': dict(self.skills_verified),
+            'topics_covered': sorted(self.topics_covered),
+            'topics_to_cover': list(self.topics_to_cover),
+            'candidate_attributes': dict(self.candidate_attributes)
+        }
+    
+    def load_dict(self, data: Dict[str, any]):
+        """Restore the tracker from a checkpoint.
+        
+        Args:
+            data: Result of to_dict()
+        """
+        self.skills_claimed = set(map(intern_text, data.get('skills_claimed', [])))
+        self.skills_verified = {intern_text(skill): intern_text(status)
+                                for skill, status in data.get('skills_verified', {}).items()}
+        self.topics_covered = set(map(intern_text, data.get('topics_covered', [])))
+        self.topics_to_cover = list(map(intern_text, data.get('topics_to_cover', [])))
+        self.candidate_attributes = dict(data.get('candidate_attributes', {}))
@@ -0,0 +1,154 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+from models.schemas import Turn, KnowledgeGap
+from memory.entity_tracker import EntityTracker
+from config import settings
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    # Updates are short and CPU-bound: one worker serves the builders of all sessions
+    # and keeps each builder's updates in order
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='report-builder')
+    return _executor
+
+
+class ReportBuilder:
+    """Accumulates final report material turn by turn.
+    
+    Updates run on a background worker shared by all sessions, so they
+    never delay the next question; get_summary() waits for pending
+    updates. Only the incremental report (FEEDBACK_MODE=incremental)
+    uses it.
+    """
+    
+    def __init__(self, entity_tracker: EntityTracker = None):
+        self.entity_tracker = entity_tracker or EntityTracker()
+        self.topic_scores: Dict[str, List[float]] = {}
+        self.confirmed_skills: List[str] = []
+        self.knowledge_gaps: List[KnowledgeGap] = []
+        self.correctness_counts: Dict[str, int] = {'correct': 0, 'partial': 0, 'incorrect': 0}
+        self.recent_answers: List[str] = []
+        
+        self._next_topic = ""
+        self._lock = threading.Lock()
+        self._pending: List[Future] = []
+    
+    def add_turn(self, turn: Turn, question: str):
+        """Queue a saved turn for aggregation.
+        
+        Args:
+            turn: Saved turn
+            question: Question the candidate answered in this turn
+        """
+        self._pending.append(_shared_executor().submit(self._update, turn, question))
+    
+    def _update(self, turn: Turn, question: str):
+        # The Observer's next_topic from the previous turn names the question answered now
+        topics = self.entity_tracker.extract_topics_from_text(turn.user_message + " " + question)
+        if not topics and self._next_topic:
+            topics = [self._next_topic.lower()]
+        if turn.observer_result is not None:
+            self._next_topic = turn.observer_result.next_topic
+        
+        result = turn.evaluator_result
+        if result is None:
+            return
+        
+        with self._lock:
+            for topic in topics or ['общие']:
+                self.topic_scores.setdefault(topic, []).append(result.score)
+            self.correctness_counts[result.correctness] += 1
+            self.recent_answers = (self.recent_answers + [turn.user_message[:150]])[-3:]
+            
+            if result.correctness == 'correct' and result.score >= settings.PERFORMANCE_THRESHOLD_HIGH:
+                for topic in topics:
+                    if topic not in self.confirmed_skills:
+                        self.confirmed_skills.append(topic)
+            elif result.correctness in ('incorrect', 'partial') and result.correct_answer:
+                self.knowledge_gaps.append(KnowledgeGap(
+                    topic=topics[0] if topics else question[:80],
+                    user_answer=turn.user_message,
+                    correct_answer=result.correct_answer
+                ))
+    
+    def wait(self):
+        """Block until all queued turns are aggregated."""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+    
+    def close(self):
+        """Finish pending updates; the shared worker keeps running for other sessions."""
+        pending, self._pending = self._pending, []
+        wait(pending)
+    
+    def get_roadmap_candidates(self) -> List[str]:
+        """Get weak topics ordered from weakest to strongest.
+        
+        Returns:
+            Topic names scoring below the high performance threshold
+        """
+        with self._lock:
+            averages = [(sum(scores) / len(scores), topic) for topic, scores in self.topic_scores.items()]
+            gap_topics = [gap.topic for gap in self.knowledge_gaps]
+        
+        weak = [topic for avg, topic in sorted(averages) if avg < settings.PERFORMANCE_THRESHOLD_HIGH]
+        return weak + [topic for topic in gap_topics if topic not in weak]
+    
+    def get_summary(self) -> dict:
+        """Get the pre-aggregated report material.
+        
+        Returns:
+            Dict with per-topic scores, confirmed skills, gaps and roadmap candidates
+        """
+        self.wait()
+        roadmap_candidates = self.get_roadmap_candidates()
+        
+        with self._lock:
+            return {
+                'topic_scores': {
+                    topic: {'average': round(sum(scores) / len(scores), 2), 'count': len(scores)}
+                    for topic, scores in self.topic_scores.items()
+                },
+                'correctness': dict(self.correctness_counts),
+                'confirmed_skills': list(self.confirmed_skills),
+                'knowledge_gaps': [gap.model_dump() for gap in self.knowledge_gaps],
+                'roadmap_candidates': roadmap_candidates,
+                'recent_answers': list(self.recent_answers)
+            }
+    
+    def format_summary(self, summary: dict) -> str:
+        """Format a summary as compact prompt text.
+        
+        Args:
+            summary: Result of get_summary()
+        
+        Returns:
+            Formatted summary string
+        """
+        parts = ["Оценки по темам:"]
+        for topic, stats in summary['topic_scores'].items():
+            parts.append(f"- {topic}: {stats['average']:.2f} ({stats['count']} отв.)")
+        
+        counts = summary['correctness']
+        parts.append(
+            f"Ответы: верно {counts['correct']}, частично {counts['partial']}, неверно {counts['incorrect']}"
+        )
+        parts.append(f"Подтвержденные навыки: {', '.join(summary['confirmed_skills']) or 'Нет'}")
+        parts.append(f"Пробелы: {', '.join(gap['topic'] for gap in summary['knowledge_gaps']) or 'Нет'}")
+        parts.append(f"Кандидаты в roadmap: {', '.join(summary['roadmap_candidates']) or 'Нет'}")
+        
+        if summary['recent_answers']:
+            parts.append("Последние ответы кандидата:")
+            parts.extend(f"- {answer}" for answer in summary['recent_answers'])
+        
+        return "\n".join(parts)
@@ -0,0 +1,111 @@
+import json
+import mmap
+import tempfile
+from array import array
+from collections import deque
+from typing import Deque, Iterator, List, Optional, Union
+from models.schemas import Turn
+from models.compact import CompactTurn
+
+
+class TurnStore:
+    """Single store of interview turns shared by state, memory and logger.
+    
+    The last hot_size turns stay in memory; older turns are spilled as
+    JSON lines to an anonymous temporary file and read back through mmap
+    on demand, so memory per session stays bounded however long the
+    interview runs. Supports len(), indexing, slicing and lazy iteration.
+    
+    Turns are held as CompactTurn; pydantic Turns are converted on append.
+    """
+    
+    def __init__(self, hot_size: Optional[int] = None, spill_dir: Optional[str] = None):
+        """Initialize the store.
+        
+        Args:
+            hot_size: Turns kept in memory; None keeps every turn in memory
+            spill_dir: Directory for the spill file (system temp dir by default)
+        """
+        self.hot_size = hot_size
+        self.spill_dir = spill_dir
+        self.hot: Deque[CompactTurn] = deque()
+        # Byte offset of every spilled turn, plus the end offset of the last one
+        self._offsets = array('q', [0])
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._closed = False
+    
+    @property
+    def spilled_count(self) -> int:
+        return len(self._offsets) - 1
+    
+    def __len__(self) -> int:
+        return self.spilled_count + len(self.hot)
+    
+    def append(self, turn: Union[Turn, CompactTurn]):
+        self.hot.append(CompactTurn.from_model(turn))
+        if self.hot_size is not None:
+            while len(self.hot) > self.hot_size:
+                self._spill(self.hot.popleft())
+    
+    def _check_open(self):
+        if self._closed:
+            raise ValueError("Turn store is closed; its spilled turns were discarded")
+    
+    def _spill(self, turn: CompactTurn):
+        self._check_open()
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(dir=self.spill_dir, prefix='turns-', suffix='.jsonl')
+        
+        line = json.dumps(turn.to_row(), ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        self._file.seek(self._offsets[-1])
+        self._file.write(line)
+        self._file.flush()
+        self._offsets.append(self._offsets[-1] + len(line))
+    
+    def _read_spilled(self, index: int) -> CompactTurn:
+        self._check_open()
+        # Remap only when the file has grown past the current mapping
+        if self._mmap is None or len(self._mmap) < self._offsets[-1]:
+            if self._mmap is not None:
+                self._mmap.close()
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return CompactTurn.from_row(json.loads(self._mmap[self._offsets[index]:self._offsets[index + 1] - 1]))
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[CompactTurn, List[CompactTurn]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("turn index out of range")
+        
+        if index < self.spilled_count:
+            return self._read_spilled(index)
+        return self.hot[index - self.spilled_count]
+    
+    def __iter__(self) -> Iterator[CompactTurn]:
+        for index in range(self.spilled_count):
+            yield self._read_spilled(index)
+        yield from list(self.hot)
+    
+    def clear(self):
+        self.close()
+        self.hot.clear()
+        self._offsets = array('q', [0])
+        self._closed = False
+    
+    def close(self):
+        """Release the spill file; spilled turns are discarded.
+        
+        Reading a spilled turn or spilling another one afterwards raises
+        ValueError; clear() makes the store usable again.
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._closed = True
@@ -1,17 +1,23 @@
 from .schemas import (
     Turn,
+    ObserverResult,
+    EvaluatorResult,
     CandidateProfile,
     PerformanceMetrics,
     FinalFeedback,
+    BankQuestion,
     InterviewLog,
     InterviewState
 )
 
 __all__ = [
     'Turn',
+    'ObserverResult',
+    'EvaluatorResult',
     'CandidateProfile',
     'PerformanceMetrics',
     'FinalFeedback',
+    'BankQuestion',
     'InterviewLog',
     'InterviewState'
 ]
@@ -0,0 +1,204 @@
+"""Compact in-memory representation of a running interview.
+
+Pydantic models carry a per-instance __dict__, field-set tracking and
+default containers, which adds up when one process holds thousands of
+sessions. The hot path keeps turns, the candidate profile and the
+workflow state in slotted dataclasses with interned short strings, and
+converts to the pydantic schemas only at the logger and API boundary.
+"""
+
+import sys
+from array import array
+from dataclasses import astuple, dataclass
+from typing import Any, Iterator, Optional, Tuple, Union
+from models.schemas import CandidateProfile, EvaluatorResult, InterviewState, ObserverResult, Turn
+
+
+def intern_text(value: str) -> str:
+    """Intern a short repeated string (topic, skill, grade, verdict)."""
+    return sys.intern(value) if value else ''
+
+
+@dataclass(slots=True)
+class CompactObserverResult:
+    analysis: str
+    difficulty_change: int
+    strategy_decision: str
+    next_topic: str
+    off_topic: bool
+    hallucination: bool
+    
+    @classmethod
+    def from_model(cls, result: ObserverResult) -> 'CompactObserverResult':
+        return cls(result.analysis, result.difficulty_change, result.strategy_decision,
+                   intern_text(result.next_topic), result.off_topic, result.hallucination)
+    
+    def to_model(self) -> ObserverResult:
+        return ObserverResult(analysis=self.analysis, difficulty_change=self.difficulty_change,
+                              strategy_decision=self.strategy_decision, next_topic=self.next_topic,
+                              off_topic=self.off_topic, hallucination=self.hallucination)
+
+
+@dataclass(slots=True)
+class CompactEvaluatorResult:
+    correctness: str
+    score: float
+    comment: str
+    correct_answer: str
+    reused_from: Optional[int] = None
+    similarity: Optional[float] = None
+    
+    @classmethod
+    def from_model(cls, result: EvaluatorResult) -> 'CompactEvaluatorResult':
+        return cls(intern_text(result.correctness), result.score, result.comment, result.correct_answer,
+                   result.reused_from, result.similarity)
+    
+    def to_model(self) -> EvaluatorResult:
+        return EvaluatorResult(correctness=self.correctness, score=self.score, comment=self.comment,
+                               correct_answer=self.correct_answer, reused_from=self.reused_from,
+                               similarity=self.similarity)
+
+
+def _compact(result, compact_cls):
+    if result is None or isinstance(result, compact_cls):
+        return result
+    return compact_cls.from_model(result)
+
+
+@dataclass(slots=True)
+class CompactTurn:
+    """Turn with the same attribute names as models.schemas.Turn.
+    
+    performance_metrics is always {'score': ...} in this repo (plus
+    'degrade_level' on turns run in SLO degrade mode), so only those are
+    stored; a NaN score stands for a turn without metrics.
+    """
+    
+    turn_id: int
+    agent_visible_message: str
+    user_message: str
+    internal_thoughts: str
+    score: float = float('nan')
+    observer_result: Optional[CompactObserverResult] = None
+    evaluator_result: Optional[CompactEvaluatorResult] = None
+    degrade_level: int = 0
+    
+    @property
+    def performance_metrics(self) -> Optional[dict]:
+        if self.score != self.score:
+            return None
+        if self.degrade_level:
+            return {'score': self.score, 'degrade_level': float(self.degrade_level)}
+        return {'score': self.score}
+    
+    @classmethod
+    def from_model(cls, turn: Union[Turn, 'CompactTurn']) -> 'CompactTurn':
+        if isinstance(turn, cls):
+            return turn
+        metrics = turn.performance_metrics
+        return cls(
+            turn.turn_id, turn.agent_visible_message, turn.user_message, turn.internal_thoughts,
+            float(metrics['score']) if metrics and 'score' in metrics else float('nan'),
+            _compact(turn.observer_result, CompactObserverResult),
+            _compact(turn.evaluator_result, CompactEvaluatorResult),
+            int(metrics.get('degrade_level', 0)) if metrics else 0
+        )
+    
+    def to_model(self) -> Turn:
+        return Turn(
+            turn_id=self.turn_id,
+            agent_visible_message=self.agent_visible_message,
+            user_message=self.user_message,
+            internal_thoughts=self.internal_thoughts,
+            performance_metrics=self.performance_metrics,
+            observer_result=self.observer_result.to_model() if self.observer_result else None,
+            evaluator_result=self.evaluator_result.to_model() if self.evaluator_result else None
+        )
+    
+    def to_row(self) -> list:
+        """Positional JSON-ready form used by the turn store's spill file."""
+        return [self.turn_id, self.agent_visible_message, self.user_message, self.internal_thoughts,
+                self.score, astuple(self.observer_result) if self.observer_result else None,
+                astuple(self.evaluator_result) if self.evaluator_result else None, self.degrade_level]
+    
+    @classmethod
+    def from_row(cls, row: list) -> 'CompactTurn':
+        observer, evaluator = row[5], row[6]
+        return cls(*row[:5],
+                   CompactObserverResult(*observer[:3], intern_text(observer[3]), *observer[4:]) if observer else None,
+                   CompactEvaluatorResult(intern_text(evaluator[0]), *evaluator[1:]) if evaluator else None,
+                   *row[7:])
+
+
+@dataclass(slots=True)
+class CompactProfile:
+    """Candidate profile without the per-instance skill and topic containers.
+    
+    Skills and topics are tracked by EntityTracker during the interview.
+    """
+    
+    name: str
+    position: str
+    grade: str
+    experience: str
+    
+    def __post_init__(self):
+        self.position = intern_text(self.position)
+        self.grade = intern_text(self.grade)
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CompactProfile':
+        return cls(data['name'], data['position'], data['grade'], data['experience'])
+    
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'position': self.position, 'grade': self.grade,
+                'experience': self.experience}
+    
+    def to_model(self) -> CandidateProfile:
+        return CandidateProfile(**self.to_dict())
+
+
+class SessionState:
+    """Slotted stand-in for the InterviewState dict.
+    
+    Supports the mapping operations the agents use (state['key'],
+    state.get, in, items), restricted to the InterviewState keys; unset
+    keys behave like missing dict keys. performance_history is an
+    array('d') rather than a list of float objects.
+    """
+    
+    __slots__ = tuple(InterviewState.__annotations__)
+    
+    def __init__(self, **values: Any):
+        for key, value in values.items():
+            self[key] = value
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.__slots__:
+            raise KeyError(f"Unknown interview state key: {key}")
+        if key == 'performance_history' and not isinstance(value, array):
+            value = array('d', value)
+        setattr(self, key, value)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and hasattr(self, key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in self.__slots__ else default
+    
+    def keys(self) -> Iterator[str]:
+        return (key for key in self.__slots__ if hasattr(self, key))
+    
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return ((key, getattr(self, key)) for key in self.keys())
+    
+    __iter__ = keys
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self.keys())
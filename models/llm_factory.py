@@ -1,71 +1,529 @@
+import asyncio
+import json
+import re
+import threading
 from abc import ABC, abstractmethod
-from typing import Optional
-import requests
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from models.usage import record_usage, usage_meter
 from config import settings
 
 
+JSON_INSTRUCTION = "\n\nОтветьте ТОЛЬКО валидным JSON-объектом, без пояснений и markdown."
+
+# Last run of lines with Cyrillic (blank lines allowed between them): reasoning models
+# think in English and write the Russian answer at the end
+FINAL_ANSWER_BLOCK = re.compile(r'(?:^[^\n]*[\u0400-\u04FF][^\n]*(?:\n|\Z)(?:[ \t]*\n)*)+', re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class ReasoningOptions:
+    """Reasoning controls passed to the provider API for one agent's calls.
+    
+    effort is "low", "medium" or "high"; max_tokens caps the hidden
+    reasoning; exclude drops the reasoning text from the response.
+    """
+    
+    effort: Optional[str] = None
+    max_tokens: Optional[int] = None
+    exclude: bool = False
+
+
+def reasoning_options(agent: Optional[str]) -> Optional[ReasoningOptions]:
+    """Reasoning settings configured for an agent.
+    
+    Args:
+        agent: Agent name as used in routing hints ('observer', 'evaluator', ...)
+        
+    Returns:
+        ReasoningOptions, or None if nothing is configured for the agent
+    """
+    effort = settings.REASONING_EFFORT.get(agent)
+    max_tokens = settings.REASONING_MAX_TOKENS.get(agent)
+    if effort is None and max_tokens is None and not settings.REASONING_EXCLUDE:
+        return None
+    return ReasoningOptions(effort, max_tokens, settings.REASONING_EXCLUDE)
+
+
+def extract_final_answer(reasoning: str) -> str:
+    """Recover the answer from the reasoning text when a model left content empty.
+    
+    Args:
+        reasoning: Reasoning text of the response
+        
+    Returns:
+        The last block of Russian lines, else the last sentence
+    """
+    block = None
+    for block in FINAL_ANSWER_BLOCK.finditer(reasoning):
+        pass
+    if block is not None:
+        return ' '.join(line.strip() for line in block.group().splitlines() if line.strip())
+    
+    sentence = reasoning.rstrip().rstrip('.').rsplit('.', 1)[-1].strip()
+    return sentence + '.' if sentence else reasoning[:200]
+
+
+def parse_json_object(text: str) -> dict:
+    """Parse the outermost JSON object from an LLM response.
+    
+    Args:
+        text: Raw response text
+        
+    Returns:
+        Parsed dictionary
+        
+    Raises:
+        ValueError: If no valid JSON object is found
+    """
+    start = text.find('{')
+    end = text.rfind('}') + 1
+    if start == -1 or end <= start:
+        raise ValueError("No JSON object in response")
+    
+    try:
+        data = json.loads(text[start:end])
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in response: {e}") from e
+    
+    if not isinstance(data, dict):
+        raise ValueError("JSON response is not an object")
+    return data
+
+
+def chat_messages(prompt: str, system_prompt: Optional[str] = None) -> List[dict]:
+    """Chat-completions message list for a prompt and an optional system prompt."""
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
 class LLMProvider(ABC):
+    _client: Any = None
+    _aclient: Any = None
+    _client_lock = threading.Lock()
+    
+    @property
+    def client(self) -> Any:
+        """SDK client, created on first use so the SDK is imported only when a call is made."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+    
+    def _create_client(self) -> Any:
+        raise NotImplementedError(f"{type(self).__name__} has no SDK client")
+    
+    @property
+    def aclient(self) -> Any:
+        """Async SDK client for the a-prefixed methods, created on first use like client."""
+        if self._aclient is None:
+            with self._client_lock:
+                if self._aclient is None:
+                    self._aclient = self._create_async_client()
+        return self._aclient
+    
+    def _create_async_client(self) -> Any:
+        raise NotImplementedError(f"{type(self).__name__} has no async SDK client")
+    
+    def warm_up(self):
+        """Get ready for the first request while the user is still busy.
+        
+        Imports the SDK and builds the client; providers that can also
+        open their HTTP connection ahead of time override this.
+        """
+        try:
+            self.client
+        except NotImplementedError:
+            pass
+    
+    def resolve(self, prompt: str, max_tokens: int, hints: Dict[str, Any], session: str = '') -> 'LLMProvider':
+        """Provider that serves one call; routers pick one of their models here.
+        
+        Args:
+            prompt: Full prompt text (system prompt included), for size estimates
+            max_tokens: Output token limit of the call
+            hints: Agent hints such as 'agent', 'call' and 'difficulty'
+            session: Session the call belongs to
+            
+        Returns:
+            Provider to send the call to
+        """
+        return self
+    
     @abstractmethod
     def generate(self, prompt: str, system_prompt: Optional[str] = None, 
-                 temperature: float = 0.7, max_tokens: int = 1000) -> str:
+                 temperature: float = 0.7, max_tokens: int = 1000,
+                 reasoning: Optional[ReasoningOptions] = None) -> str:
         pass
+    
+    def generate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                      temperature: float = 0.3, max_tokens: int = 500,
+                      reasoning: Optional[ReasoningOptions] = None) -> dict:
+        """Generate a JSON object matching the given schema.
+        
+        Providers with a native JSON mode or tool calling override this;
+        the default asks for JSON in the prompt and parses the text.
+        
+        Args:
+            prompt: User prompt
+            schema: JSON schema of the expected object
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature
+            max_tokens: Output token limit
+            reasoning: Reasoning controls for reasoning models
+            
+        Returns:
+            Parsed JSON object
+            
+        Raises:
+            ValueError: If the response is not a valid JSON object
+        """
+        response = self.generate(
+            prompt=prompt + JSON_INSTRUCTION,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            reasoning=reasoning
+        )
+        return parse_json_object(response or "")
+    
+    def stream(self, prompt: str, system_prompt: Optional[str] = None,
+               temperature: float = 0.7, max_tokens: int = 1000,
+               reasoning: Optional[ReasoningOptions] = None) -> Iterator[str]:
+        """Stream the response text chunk by chunk.
+        
+        Providers without streaming support yield the whole response at once.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature
+            max_tokens: Output token limit
+            reasoning: Reasoning controls for reasoning models
+            
+        Yields:
+            Response text chunks
+        """
+        yield self.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            reasoning=reasoning
+        )
+
+    
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        temperature: float = 0.7, max_tokens: int = 1000,
+                        reasoning: Optional[ReasoningOptions] = None) -> str:
+        """Async generate().
+        
+        Providers with an async SDK client override the a-prefixed methods;
+        the defaults run the blocking ones on the event loop's worker threads.
+        """
+        return await asyncio.to_thread(self.generate, prompt=prompt, system_prompt=system_prompt,
+                                       temperature=temperature, max_tokens=max_tokens, reasoning=reasoning)
+    
+    async def agenerate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                             temperature: float = 0.3, max_tokens: int = 500,
+                             reasoning: Optional[ReasoningOptions] = None) -> dict:
+        """Async generate_json().
+        
+        Raises:
+            ValueError: If the response is not a valid JSON object
+        """
+        return await asyncio.to_thread(self.generate_json, prompt=prompt, schema=schema,
+                                       system_prompt=system_prompt, temperature=temperature,
+                                       max_tokens=max_tokens, reasoning=reasoning)
+    
+    async def astream(self, prompt: str, system_prompt: Optional[str] = None,
+                      temperature: float = 0.7, max_tokens: int = 1000,
+                      reasoning: Optional[ReasoningOptions] = None) -> AsyncIterator[str]:
+        """Async stream(); the default passes on the chunks of stream() run on a worker thread.
+        
+        Yields:
+            Response text chunks
+        """
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        stopped = threading.Event()
+        
+        def produce():
+            try:
+                with closing(self.stream(prompt=prompt, system_prompt=system_prompt, temperature=temperature,
+                                         max_tokens=max_tokens, reasoning=reasoning)) as stream:
+                    for chunk in stream:
+                        if stopped.is_set():
+                            return
+                        loop.call_soon_threadsafe(chunks.put_nowait, (chunk, None))
+            except Exception as e:
+                loop.call_soon_threadsafe(chunks.put_nowait, (None, e))
+            else:
+                loop.call_soon_threadsafe(chunks.put_nowait, (None, None))
+        
+        # Runs on in the background if the consumer stops early, until the next chunk ends it
+        asyncio.ensure_future(asyncio.to_thread(produce))
+        try:
+            while True:
+                chunk, error = await chunks.get()
+                if error is not None:
+                    raise error
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            stopped.set()
 
 
 class OpenAIProvider(LLMProvider):
     def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None):
-        from openai import OpenAI
         self.api_key = api_key or settings.OPENAI_API_KEY
         self.model = model or settings.OPENAI_MODEL
-        self.client = OpenAI(api_key=self.api_key)
+    
+    def _create_client(self):
+        from openai import OpenAI
+        return OpenAI(api_key=self.api_key)
+    
+    def _create_async_client(self):
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(api_key=self.api_key)
+    
+    def _sampling_kwargs(self, temperature: float, max_tokens: int,
+                         reasoning: Optional[ReasoningOptions]) -> dict:
+        # Reasoning models reject max_tokens and a non-default temperature; only they accept
+        # reasoning_effort, and the reasoning itself is never returned
+        if not self.model.startswith(('o1', 'o3', 'o4', 'gpt-5')):
+            return {"temperature": temperature, "max_tokens": max_tokens}
+        kwargs = {"max_completion_tokens": max_tokens}
+        if reasoning is not None and reasoning.effort:
+            kwargs["reasoning_effort"] = reasoning.effort
+        return kwargs
     
     def generate(self, prompt: str, system_prompt: Optional[str] = None,
-                 temperature: float = 0.7, max_tokens: int = 1000) -> str:
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+                 temperature: float = 0.7, max_tokens: int = 1000,
+                 reasoning: Optional[ReasoningOptions] = None) -> str:
+        messages = chat_messages(prompt, system_prompt)
         
         response = self.client.chat.completions.create(
             model=self.model,
             messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens
+            **self._sampling_kwargs(temperature, max_tokens, reasoning)
         )
+        record_usage(self.model, response.usage)
         return response.choices[0].message.content
+    
+    def generate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                      temperature: float = 0.3, max_tokens: int = 500,
+                      reasoning: Optional[ReasoningOptions] = None) -> dict:
+        messages = chat_messages(prompt + JSON_INSTRUCTION, system_prompt)
+        
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            response_format={"type": "json_object"},
+            **self._sampling_kwargs(temperature, max_tokens, reasoning)
+        )
+        record_usage(self.model, response.usage)
+        return parse_json_object(response.choices[0].message.content or "")
+    
+    def stream(self, prompt: str, system_prompt: Optional[str] = None,
+               temperature: float = 0.7, max_tokens: int = 1000,
+               reasoning: Optional[ReasoningOptions] = None) -> Iterator[str]:
+        messages = chat_messages(prompt, system_prompt)
+        
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **self._sampling_kwargs(temperature, max_tokens, reasoning)
+        )
+        for chunk in response:
+            if chunk.usage:
+                record_usage(self.model, chunk.usage)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        temperature: float = 0.7, max_tokens: int = 1000,
+                        reasoning: Optional[ReasoningOptions] = None) -> str:
+        response = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=chat_messages(prompt, system_prompt),
+            **self._sampling_kwargs(temperature, max_tokens, reasoning)
+        )
+        record_usage(self.model, response.usage)
+        return response.choices[0].message.content
+    
+    async def agenerate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                             temperature: float = 0.3, max_tokens: int = 500,
+                             reasoning: Optional[ReasoningOptions] = None) -> dict:
+        response = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=chat_messages(prompt + JSON_INSTRUCTION, system_prompt),
+            response_format={"type": "json_object"},
+            **self._sampling_kwargs(temperature, max_tokens, reasoning)
+        )
+        record_usage(self.model, response.usage)
+        return parse_json_object(response.choices[0].message.content or "")
+    
+    async def astream(self, prompt: str, system_prompt: Optional[str] = None,
+                      temperature: float = 0.7, max_tokens: int = 1000,
+                      reasoning: Optional[ReasoningOptions] = None) -> AsyncIterator[str]:
+        response = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=chat_messages(prompt, system_prompt),
+            stream=True,
+            stream_options={"include_usage": True},
+            **self._sampling_kwargs(temperature, max_tokens, reasoning)
+        )
+        async for chunk in response:
+            if chunk.usage:
+                record_usage(self.model, chunk.usage)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
 
 class AnthropicProvider(LLMProvider):
+    # Claude models only think when extended thinking is requested, so reasoning options are not sent
+    
     def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None):
-        from anthropic import Anthropic
         self.api_key = api_key or settings.ANTHROPIC_API_KEY
         self.model = model or settings.ANTHROPIC_MODEL
-        self.client = Anthropic(api_key=self.api_key)
+    
+    def _create_client(self):
+        from anthropic import Anthropic
+        return Anthropic(api_key=self.api_key)
+    
+    def _create_async_client(self):
+        from anthropic import AsyncAnthropic
+        return AsyncAnthropic(api_key=self.api_key)
+    
+    @staticmethod
+    def _tool_kwargs(schema: dict) -> dict:
+        # Forced tool call: the tool input is the structured result
+        return {
+            "tools": [{
+                "name": "submit_result",
+                "description": "Submit the structured result",
+                "input_schema": schema
+            }],
+            "tool_choice": {"type": "tool", "name": "submit_result"}
+        }
+    
+    @staticmethod
+    def _tool_input(message: Any) -> dict:
+        for block in message.content:
+            if block.type == "tool_use":
+                return dict(block.input)
+        raise ValueError("Anthropic response has no tool_use block")
     
     def generate(self, prompt: str, system_prompt: Optional[str] = None,
-                 temperature: float = 0.7, max_tokens: int = 1000) -> str:
+                 temperature: float = 0.7, max_tokens: int = 1000,
+                 reasoning: Optional[ReasoningOptions] = None) -> str:
+        message = self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system_prompt or "",
+            messages=[{"role": "user", "content": prompt}]
+        )
+        usage_meter.record(self.model, message.usage.input_tokens, message.usage.output_tokens)
+        return message.content[0].text
+    
+    def generate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                      temperature: float = 0.3, max_tokens: int = 500,
+                      reasoning: Optional[ReasoningOptions] = None) -> dict:
         message = self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system_prompt or "",
+            messages=[{"role": "user", "content": prompt}],
+            **self._tool_kwargs(schema)
+        )
+        usage_meter.record(self.model, message.usage.input_tokens, message.usage.output_tokens)
+        return self._tool_input(message)
+    
+    def stream(self, prompt: str, system_prompt: Optional[str] = None,
+               temperature: float = 0.7, max_tokens: int = 1000,
+               reasoning: Optional[ReasoningOptions] = None) -> Iterator[str]:
+        with self.client.messages.stream(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system_prompt or "",
+            messages=[{"role": "user", "content": prompt}]
+        ) as response:
+            for text in response.text_stream:
+                yield text
+            usage = response.get_final_message().usage
+            usage_meter.record(self.model, usage.input_tokens, usage.output_tokens)
+    
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        temperature: float = 0.7, max_tokens: int = 1000,
+                        reasoning: Optional[ReasoningOptions] = None) -> str:
+        message = await self.aclient.messages.create(
             model=self.model,
             max_tokens=max_tokens,
             temperature=temperature,
             system=system_prompt or "",
             messages=[{"role": "user", "content": prompt}]
         )
+        usage_meter.record(self.model, message.usage.input_tokens, message.usage.output_tokens)
         return message.content[0].text
+    
+    async def agenerate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                             temperature: float = 0.3, max_tokens: int = 500,
+                             reasoning: Optional[ReasoningOptions] = None) -> dict:
+        message = await self.aclient.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system_prompt or "",
+            messages=[{"role": "user", "content": prompt}],
+            **self._tool_kwargs(schema)
+        )
+        usage_meter.record(self.model, message.usage.input_tokens, message.usage.output_tokens)
+        return self._tool_input(message)
+    
+    async def astream(self, prompt: str, system_prompt: Optional[str] = None,
+                      temperature: float = 0.7, max_tokens: int = 1000,
+                      reasoning: Optional[ReasoningOptions] = None) -> AsyncIterator[str]:
+        async with self.aclient.messages.stream(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system_prompt or "",
+            messages=[{"role": "user", "content": prompt}]
+        ) as response:
+            async for text in response.text_stream:
+                yield text
+            usage = (await response.get_final_message()).usage
+            usage_meter.record(self.model, usage.input_tokens, usage.output_tokens)
 
 
 class MistralProvider(LLMProvider):
+    # The configured Mistral models do not reason, so reasoning options are not sent
+    
     def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None):
-        from mistralai import Mistral
         self.api_key = api_key or settings.MISTRAL_API_KEY
         self.model = model or settings.MISTRAL_MODEL
-        self.client = Mistral(api_key=self.api_key)
+    
+    def _create_client(self):
+        from mistralai import Mistral
+        return Mistral(api_key=self.api_key)
     
     def generate(self, prompt: str, system_prompt: Optional[str] = None,
-                 temperature: float = 0.7, max_tokens: int = 1000) -> str:
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+                 temperature: float = 0.7, max_tokens: int = 1000,
+                 reasoning: Optional[ReasoningOptions] = None) -> str:
+        messages = chat_messages(prompt, system_prompt)
         
         response = self.client.chat.complete(
             model=self.model,
@@ -73,107 +531,301 @@ class MistralProvider(LLMProvider):
             temperature=temperature,
             max_tokens=max_tokens
         )
+        record_usage(self.model, response.usage)
         return response.choices[0].message.content
+    
+    def generate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                      temperature: float = 0.3, max_tokens: int = 500,
+                      reasoning: Optional[ReasoningOptions] = None) -> dict:
+        messages = chat_messages(prompt + JSON_INSTRUCTION, system_prompt)
+        
+        response = self.client.chat.complete(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"}
+        )
+        record_usage(self.model, response.usage)
+        return parse_json_object(response.choices[0].message.content or "")
+    
+    def stream(self, prompt: str, system_prompt: Optional[str] = None,
+               temperature: float = 0.7, max_tokens: int = 1000,
+               reasoning: Optional[ReasoningOptions] = None) -> Iterator[str]:
+        messages = chat_messages(prompt, system_prompt)
+        
+        response = self.client.chat.stream(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        for event in response:
+            if event.data.usage:
+                record_usage(self.model, event.data.usage)
+            content = event.data.choices[0].delta.content
+            if content:
+                yield content
+    
+    # The Mistral client has async variants of its methods, so no separate async client is needed
+    
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        temperature: float = 0.7, max_tokens: int = 1000,
+                        reasoning: Optional[ReasoningOptions] = None) -> str:
+        response = await self.client.chat.complete_async(
+            model=self.model,
+            messages=chat_messages(prompt, system_prompt),
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        record_usage(self.model, response.usage)
+        return response.choices[0].message.content
+    
+    async def agenerate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                             temperature: float = 0.3, max_tokens: int = 500,
+                             reasoning: Optional[ReasoningOptions] = None) -> dict:
+        response = await self.client.chat.complete_async(
+            model=self.model,
+            messages=chat_messages(prompt + JSON_INSTRUCTION, system_prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"}
+        )
+        record_usage(self.model, response.usage)
+        return parse_json_object(response.choices[0].message.content or "")
+    
+    async def astream(self, prompt: str, system_prompt: Optional[str] = None,
+                      temperature: float = 0.7, max_tokens: int = 1000,
+                      reasoning: Optional[ReasoningOptions] = None) -> AsyncIterator[str]:
+        response = await self.client.chat.stream_async(
+            model=self.model,
+            messages=chat_messages(prompt, system_prompt),
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        async for event in response:
+            if event.data.usage:
+                record_usage(self.model, event.data.usage)
+            content = event.data.choices[0].delta.content
+            if content:
+                yield content
 
 
 class OpenRouterProvider(LLMProvider):
     def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None):
         self.api_key = api_key or settings.OPENROUTER_API_KEY
         self.model = model or settings.OPENROUTER_MODEL
-        self.api_url = "https://openrouter.ai/api/v1/chat/completions"
+        self.api_url = settings.OPENROUTER_API_URL
     
-    def generate(self, prompt: str, system_prompt: Optional[str] = None,
-                 temperature: float = 0.7, max_tokens: int = 1000) -> str:
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
-        headers = {
+    def _create_client(self):
+        import requests
+        return requests.Session()
+    
+    def _create_async_client(self):
+        import httpx
+        return httpx.AsyncClient(timeout=30)
+    
+    @staticmethod
+    def _reasoning_payload(reasoning: Optional[ReasoningOptions]) -> Optional[dict]:
+        # OpenRouter accepts either an effort or a token budget; the budget is more precise
+        if reasoning is None:
+            return None
+        payload = {}
+        if reasoning.max_tokens:
+            payload["max_tokens"] = reasoning.max_tokens
+        elif reasoning.effort:
+            payload["effort"] = reasoning.effort
+        if reasoning.exclude:
+            payload["exclude"] = True
+        return payload or None
+    
+    def _headers(self) -> dict:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        
+    
+    def _payload(self, messages: List[dict], temperature: float, max_tokens: int,
+                 reasoning: Optional[ReasoningOptions], **extra: Any) -> dict:
         data = {
             "model": self.model,
             "messages": messages,
             "temperature": temperature,
-            "max_tokens": max_tokens
+            "max_tokens": max_tokens,
+            **extra
         }
+        reasoning_payload = self._reasoning_payload(reasoning)
+        if reasoning_payload:
+            data["reasoning"] = reasoning_payload
+        return data
+    
+    def _text(self, result: dict) -> str:
+        if "choices" not in result or not result["choices"]:
+            raise ValueError(f"OpenRouter API Error: {result}")
+        
+        record_usage(self.model, result.get("usage"))
+        message = result["choices"][0]["message"]
+        content = message.get("content", "")
+        
+        # Reasoning models may leave content empty and put the answer at the end of reasoning
+        if not content or not content.strip():
+            content = extract_final_answer(message.get("reasoning") or "")
+        
+        if not content or not content.strip():
+            raise ValueError(f"OpenRouter returned empty response: {result}")
+        
+        return content.strip()
+    
+    def _json(self, result: dict) -> dict:
+        if "choices" not in result or not result["choices"]:
+            raise ValueError(f"OpenRouter API Error: {result}")
+        
+        record_usage(self.model, result.get("usage"))
+        message = result["choices"][0]["message"]
+        # Reasoning models may leave content empty and put the answer in reasoning
+        return parse_json_object(message.get("content") or message.get("reasoning") or "")
+    
+    def _stream_event(self, line: str) -> Tuple[bool, Optional[str]]:
+        """Parse one server-sent event line: "data: {...}", or a ": ..." keep-alive comment.
         
+        Args:
+            line: Decoded line of the response body
+            
+        Returns:
+            (end of stream, text chunk or None); usage carried by the event is recorded
+        """
+        if not line or not line.startswith("data: "):
+            return False, None
+        payload = line[len("data: "):]
+        if payload == "[DONE]":
+            return True, None
         try:
-            response = requests.post(self.api_url, headers=headers, json=data, timeout=30)
+            chunk = json.loads(payload)
+        except json.JSONDecodeError:
+            return False, None
+        if chunk.get("usage"):
+            record_usage(self.model, chunk["usage"])
+        choices = chunk.get("choices") or []
+        if choices:
+            return False, choices[0].get("delta", {}).get("content") or None
+        return False, None
+    
+    def warm_up(self):
+        """Open the TLS connection to OpenRouter; the session keeps it for the first call."""
+        from requests.exceptions import RequestException
+        
+        try:
+            self.client.head("https://openrouter.ai/api/v1/models", timeout=5)
+        except RequestException:
+            pass
+    
+    def _post(self, data: dict) -> dict:
+        from requests.exceptions import RequestException
+        
+        # Failures raise like the SDK providers do, so callers and the router can tell them from answers
+        try:
+            response = self.client.post(self.api_url, headers=self._headers(), json=data, timeout=30)
             response.raise_for_status()
-            result = response.json()
-            
-            if "choices" not in result or not result["choices"]:
-                print(f"OpenRouter API Error: {result}")
-                return "Извините, произошла техническая ошибка. Попробуйте еще раз."
-            
-            message = result["choices"][0]["message"]
-            content = message.get("content", "")
-            
-            # Некоторые модели (например, reasoning models) возвращают текст в поле reasoning
-            if not content or not content.strip():
-                reasoning = message.get("reasoning", "")
-                if reasoning and reasoning.strip():
-                    # Reasoning модели пишут размышления на английском, а финальный ответ в конце
-                    # Ищем финальный русский текст после фраз типа "Let's produce:", "Better:", "Ok."
-                    
-                    # Разбиваем на абзацы
-                    lines = reasoning.split('\n')
-                    
-                    # Ищем последние строки на русском (после английских рассуждений)
-                    russian_lines = []
-                    for line in reversed(lines):
-                        line = line.strip()
-                        if not line:
-                            continue
-                        # Проверяем, есть ли кириллица
-                        if any('\u0400' <= char <= '\u04FF' for char in line):
-                            russian_lines.insert(0, line)
-                        elif russian_lines:  # Если уже нашли русский текст, останавливаемся
-                            break
-                    
-                    if russian_lines:
-                        content = ' '.join(russian_lines)
-                    else:
-                        # Если русского не нашли, берем последнее предложение
-                        sentences = [s.strip() for s in reasoning.split('.') if s.strip()]
-                        if sentences:
-                            content = sentences[-1] + '.'
-                        else:
-                            content = reasoning[:200]  # Первые 200 символов
-            
-            if not content or not content.strip():
-                print(f"OpenRouter returned empty response: {result}")
-                return "Извините, получен пустой ответ. Попробуйте еще раз."
-            
-            return content.strip()
-        except requests.exceptions.RequestException as e:
-            print(f"OpenRouter Request Error: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response: {e.response.text}")
-            return "Извините, не удалось связаться с сервером. Проверьте интернет-соединение."
+            return response.json()
+        except RequestException as e:
+            detail = f" ({e.response.text})" if getattr(e, 'response', None) is not None else ""
+            raise ValueError(f"OpenRouter request failed: {e}{detail}") from e
+    
+    async def _apost(self, data: dict) -> dict:
+        import httpx
+        
+        try:
+            response = await self.aclient.post(self.api_url, headers=self._headers(), json=data)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            detail = f" ({e.response.text})" if isinstance(e, httpx.HTTPStatusError) else ""
+            raise ValueError(f"OpenRouter request failed: {e}{detail}") from e
+    
+    def generate(self, prompt: str, system_prompt: Optional[str] = None,
+                 temperature: float = 0.7, max_tokens: int = 1000,
+                 reasoning: Optional[ReasoningOptions] = None) -> str:
+        data = self._payload(chat_messages(prompt, system_prompt), temperature, max_tokens, reasoning)
+        return self._text(self._post(data))
+    
+    def generate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                      temperature: float = 0.3, max_tokens: int = 500,
+                      reasoning: Optional[ReasoningOptions] = None) -> dict:
+        data = self._payload(chat_messages(prompt + JSON_INSTRUCTION, system_prompt), temperature, max_tokens,
+                             reasoning, response_format={"type": "json_object"})
+        return self._json(self._post(data))
+    
+    def stream(self, prompt: str, system_prompt: Optional[str] = None,
+               temperature: float = 0.7, max_tokens: int = 1000,
+               reasoning: Optional[ReasoningOptions] = None) -> Iterator[str]:
+        from requests.exceptions import RequestException
+        
+        data = self._payload(chat_messages(prompt, system_prompt), temperature, max_tokens, reasoning,
+                             stream=True, usage={"include": True})
+        try:
+            with self.client.post(self.api_url, headers=self._headers(), json=data,
+                                  timeout=30, stream=True) as response:
+                response.raise_for_status()
+                response.encoding = 'utf-8'
+                for line in response.iter_lines(decode_unicode=True):
+                    done, content = self._stream_event(line)
+                    if done:
+                        break
+                    if content:
+                        yield content
+        except RequestException as e:
+            raise ValueError(f"OpenRouter stream failed: {e}") from e
+    
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        temperature: float = 0.7, max_tokens: int = 1000,
+                        reasoning: Optional[ReasoningOptions] = None) -> str:
+        data = self._payload(chat_messages(prompt, system_prompt), temperature, max_tokens, reasoning)
+        return self._text(await self._apost(data))
+    
+    async def agenerate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                             temperature: float = 0.3, max_tokens: int = 500,
+                             reasoning: Optional[ReasoningOptions] = None) -> dict:
+        data = self._payload(chat_messages(prompt + JSON_INSTRUCTION, system_prompt), temperature, max_tokens,
+                             reasoning, response_format={"type": "json_object"})
+        return self._json(await self._apost(data))
+    
+    async def astream(self, prompt: str, system_prompt: Optional[str] = None,
+                      temperature: float = 0.7, max_tokens: int = 1000,
+                      reasoning: Optional[ReasoningOptions] = None) -> AsyncIterator[str]:
+        import httpx
+        
+        data = self._payload(chat_messages(prompt, system_prompt), temperature, max_tokens, reasoning,
+                             stream=True, usage={"include": True})
+        try:
+            async with self.aclient.stream("POST", self.api_url, headers=self._headers(), json=data) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    done, content = self._stream_event(line)
+                    if done:
+                        break
+                    if content:
+                        yield content
+        except httpx.HTTPError as e:
+            raise ValueError(f"OpenRouter stream failed: {e}") from e
 
 
 class LLMFactory:
     @staticmethod
     def create_provider(provider_type: Optional[str] = None, 
-                       use_cheap: bool = False) -> LLMProvider:
+                       use_cheap: bool = False, model: Optional[str] = None) -> LLMProvider:
         provider_type = provider_type or settings.LLM_PROVIDER
         
         if provider_type == "openai":
-            model = settings.OPENAI_CHEAP_MODEL if use_cheap else settings.OPENAI_MODEL
+            model = model or (settings.OPENAI_CHEAP_MODEL if use_cheap else settings.OPENAI_MODEL)
             return OpenAIProvider(model=model)
         elif provider_type == "anthropic":
-            model = settings.ANTHROPIC_CHEAP_MODEL if use_cheap else settings.ANTHROPIC_MODEL
+            model = model or (settings.ANTHROPIC_CHEAP_MODEL if use_cheap else settings.ANTHROPIC_MODEL)
             return AnthropicProvider(model=model)
         elif provider_type == "mistral":
-            model = settings.MISTRAL_CHEAP_MODEL if use_cheap else settings.MISTRAL_MODEL
+            model = model or (settings.MISTRAL_CHEAP_MODEL if use_cheap else settings.MISTRAL_MODEL)
             return MistralProvider(model=model)
         elif provider_type == "openrouter":
-            model = settings.OPENROUTER_CHEAP_MODEL if use_cheap else settings.OPENROUTER_MODEL
+            model = model or (settings.OPENROUTER_CHEAP_MODEL if use_cheap else settings.OPENROUTER_MODEL)
             return OpenRouterProvider(model=model)
         else:
             raise ValueError(f"Unknown provider type: {provider_type}")
@@ -181,3 +833,26 @@ class LLMFactory:
     @staticmethod
     def create_cheap_provider(provider_type: Optional[str] = None) -> LLMProvider:
         return LLMFactory.create_provider(provider_type, use_cheap=True)
+    
+    @staticmethod
+    def create_pair(llm_provider: LLMProvider = None,
+                    cheap_llm_provider: LLMProvider = None) -> Tuple[LLMProvider, LLMProvider]:
+        """Main and cheap provider, creating whichever is not given.
+        
+        With ROUTER_ENABLED and neither given, both are views of one
+        RouterProvider that picks the model per call.
+        
+        Args:
+            llm_provider: Main model, if already created
+            cheap_llm_provider: Cheap model, if already created
+            
+        Returns:
+            (main provider, cheap provider)
+        """
+        if llm_provider is None and cheap_llm_provider is None and settings.ROUTER_ENABLED:
+            from models.router import RouterProvider, MAIN, CHEAP
+            
+            router = RouterProvider(LLMFactory.create_provider(), LLMFactory.create_cheap_provider())
+            return router.view(MAIN), router.view(CHEAP)
+        return (llm_provider or LLMFactory.create_provider(),
+                cheap_llm_provider or LLMFactory.create_cheap_provider())
@@ -0,0 +1,345 @@
+"""Per-call choice between the main and cheap model."""
+
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional, Tuple
+from models.llm_factory import LLMProvider, ReasoningOptions
+from config import settings
+
+
+MAIN = 'main'
+CHEAP = 'cheap'
+
+
+def approx_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+class _ModelStats:
+    __slots__ = ('calls', 'errors', 'latency', 'error_rate', 'cost', 'avoided')
+    
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.cost = 0.0
+        # Calls routed away from this model since it last served one
+        self.avoided = 0
+
+
+class RoutingState:
+    """Latency, error and spend statistics shared by every view of a router."""
+    
+    def __init__(self, names, window: int = 200):
+        self.lock = threading.Lock()
+        self.models: Dict[str, _ModelStats] = {name: _ModelStats() for name in names}
+        self.session_cost: Dict[str, float] = {}
+        self.session_decisions: Dict[str, Counter] = {}
+        self.decisions: Counter = Counter()
+        self.recent: Deque[dict] = deque(maxlen=window)
+
+
+class RouterProvider(LLMProvider):
+    """Chooses the main or cheap model for every call.
+    
+    The agent's tier (main for Interviewer and FeedbackGenerator, cheap
+    for Observer and Evaluator) is the starting point; then, in order:
+    
+      hints      greeting goes to the cheap model; Evaluator at difficulty
+                 >= ROUTER_HARD_DIFFICULTY and the final report need the
+                 main model and are never downgraded for speed
+      cost cap   a session over ROUTER_SESSION_COST_CAP uses the cheap model
+      errors     a model whose EWMA error rate exceeds ROUTER_MAX_ERROR_RATE
+                 is avoided while the other one is healthier (not for main
+                 model hints)
+      latency    the main model is skipped while its EWMA latency is more
+                 than ROUTER_LATENCY_RATIO times the cheap model's
+      size       prompts over ROUTER_LARGE_PROMPT_TOKENS go to the cheap model
+    
+    Statistics only change when a model serves a call, so every
+    ROUTER_PROBE_EVERY-th call avoided for errors or latency is sent to the
+    avoided model anyway (reason 'probe') to let it recover.
+    
+    Each decision is counted by (agent, model, reason) for get_report().
+    """
+    
+    def __init__(self, main: LLMProvider, cheap: LLMProvider, tier: str = MAIN,
+                 state: RoutingState = None):
+        self.providers = {MAIN: main, CHEAP: cheap}
+        self.tier = tier
+        self.state = state or RoutingState(self.providers)
+        self.prices = {MAIN: settings.ROUTER_MAIN_PRICE, CHEAP: settings.ROUTER_CHEAP_PRICE}
+        self.model = getattr(self.providers[tier], 'model', '')
+    
+    def view(self, tier: str) -> 'RouterProvider':
+        """Router with another default tier sharing this router's statistics."""
+        return RouterProvider(self.providers[MAIN], self.providers[CHEAP], tier, self.state)
+    
+    def warm_up(self):
+        for provider in self.providers.values():
+            provider.warm_up()
+    
+    def resolve(self, prompt: str, max_tokens: int, hints: Dict[str, Any], session: str = '') -> LLMProvider:
+        prompt_tokens = approx_tokens(prompt)
+        name, reason = self.choose(prompt_tokens, hints, session)
+        agent = hints.get('agent', '')
+        with self.state.lock:
+            self.state.decisions[(agent, name, reason)] += 1
+            self.state.session_decisions.setdefault(session, Counter())[(agent, name)] += 1
+            self.state.recent.append({'session': session, 'agent': agent, 'model': name, 'reason': reason,
+                                      'prompt_tokens': prompt_tokens})
+        return _RoutedCall(self, name, prompt_tokens, session)
+    
+    def choose(self, prompt_tokens: int, hints: Dict[str, Any], session: str = '') -> Tuple[str, str]:
+        """Pick a model for one call.
+        
+        Args:
+            prompt_tokens: Estimated prompt size
+            hints: Agent hints ('agent', 'call', 'difficulty')
+            session: Session the call belongs to
+        
+        Returns:
+            (model tier, reason)
+        """
+        tier, reason, strict = self.tier, 'tier', False
+        if hints.get('call') == 'greeting':
+            tier, reason = CHEAP, 'greeting'
+        elif hints.get('agent') == 'evaluator' and hints.get('difficulty', 0) >= settings.ROUTER_HARD_DIFFICULTY:
+            tier, reason, strict = MAIN, 'hard_question', True
+        elif hints.get('agent') == 'feedback' and tier == MAIN:
+            strict = True
+        
+        with self.state.lock:
+            spent = self.state.session_cost.get(session, 0.0)
+            main, cheap = self.state.models[MAIN], self.state.models[CHEAP]
+            main_latency, cheap_latency = main.latency, cheap.latency
+            main_errors, cheap_errors = main.error_rate, cheap.error_rate
+        
+        if tier == MAIN and settings.ROUTER_SESSION_COST_CAP > 0 and spent >= settings.ROUTER_SESSION_COST_CAP:
+            return CHEAP, 'cost_cap'
+        
+        if strict:
+            return tier, reason
+        
+        other = CHEAP if tier == MAIN else MAIN
+        errors = {MAIN: main_errors, CHEAP: cheap_errors}
+        if errors[tier] > settings.ROUTER_MAX_ERROR_RATE and errors[other] < errors[tier]:
+            return self._avoid(tier, other, 'errors')
+        
+        if tier == MAIN:
+            if main_latency is not None and cheap_latency is not None and \
+                    main_latency > cheap_latency * settings.ROUTER_LATENCY_RATIO:
+                return self._avoid(MAIN, CHEAP, 'latency')
+            if settings.ROUTER_LARGE_PROMPT_TOKENS and prompt_tokens > settings.ROUTER_LARGE_PROMPT_TOKENS:
+                return CHEAP, 'prompt_size'
+        return tier, reason
+    
+    def _avoid(self, tier: str, other: str, reason: str) -> Tuple[str, str]:
+        # Route away from an unhealthy model, but probe it now and then so its statistics can recover
+        with self.state.lock:
+            stats = self.state.models[tier]
+            stats.avoided += 1
+            if settings.ROUTER_PROBE_EVERY > 0 and stats.avoided >= settings.ROUTER_PROBE_EVERY:
+                stats.avoided = 0
+                return tier, 'probe'
+        return other, reason
+    
+    def record(self, name: str, latency: float, ok: bool, tokens: int, session: str = ''):
+        """Update the EWMA statistics and the session's spend after a call.
+        
+        Args:
+            name: Model tier that served the call
+            latency: Call wall time in seconds
+            ok: False if the call raised
+            tokens: Estimated prompt plus output tokens
+            session: Session the call belongs to
+        """
+        alpha = settings.ROUTER_EWMA_ALPHA
+        cost = tokens / 1000 * self.prices[name]
+        with self.state.lock:
+            stats = self.state.models[name]
+            stats.calls += 1
+            stats.avoided = 0
+            stats.cost += cost
+            stats.error_rate = (1 - alpha) * stats.error_rate + alpha * (0.0 if ok else 1.0)
+            if ok:
+                stats.latency = latency if stats.latency is None else (1 - alpha) * stats.latency + alpha * latency
+            else:
+                stats.errors += 1
+            self.state.session_cost[session] = self.state.session_cost.get(session, 0.0) + cost
+    
+    def forget(self, session: str):
+        """Drop a finished session's spend and decision counts."""
+        with self.state.lock:
+            self.state.session_cost.pop(session, None)
+            self.state.session_decisions.pop(session, None)
+    
+    def generate(self, prompt: str, system_prompt: Optional[str] = None,
+                 temperature: float = 0.7, max_tokens: int = 1000,
+                 reasoning: Optional[ReasoningOptions] = None) -> str:
+        return self.resolve(prompt + (system_prompt or ''), max_tokens, {}).generate(
+            prompt=prompt, system_prompt=system_prompt, temperature=temperature, max_tokens=max_tokens,
+            reasoning=reasoning)
+    
+    def generate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                      temperature: float = 0.3, max_tokens: int = 500,
+                      reasoning: Optional[ReasoningOptions] = None) -> dict:
+        return self.resolve(prompt + (system_prompt or ''), max_tokens, {}).generate_json(
+            prompt=prompt, schema=schema, system_prompt=system_prompt, temperature=temperature,
+            max_tokens=max_tokens, reasoning=reasoning)
+    
+    def stream(self, prompt: str, system_prompt: Optional[str] = None,
+               temperature: float = 0.7, max_tokens: int = 1000,
+               reasoning: Optional[ReasoningOptions] = None) -> Iterator[str]:
+        return self.resolve(prompt + (system_prompt or ''), max_tokens, {}).stream(
+            prompt=prompt, system_prompt=system_prompt, temperature=temperature, max_tokens=max_tokens,
+            reasoning=reasoning)
+    
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        temperature: float = 0.7, max_tokens: int = 1000,
+                        reasoning: Optional[ReasoningOptions] = None) -> str:
+        return await self.resolve(prompt + (system_prompt or ''), max_tokens, {}).agenerate(
+            prompt=prompt, system_prompt=system_prompt, temperature=temperature, max_tokens=max_tokens,
+            reasoning=reasoning)
+    
+    async def agenerate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                             temperature: float = 0.3, max_tokens: int = 500,
+                             reasoning: Optional[ReasoningOptions] = None) -> dict:
+        return await self.resolve(prompt + (system_prompt or ''), max_tokens, {}).agenerate_json(
+            prompt=prompt, schema=schema, system_prompt=system_prompt, temperature=temperature,
+            max_tokens=max_tokens, reasoning=reasoning)
+    
+    def astream(self, prompt: str, system_prompt: Optional[str] = None,
+                temperature: float = 0.7, max_tokens: int = 1000,
+                reasoning: Optional[ReasoningOptions] = None) -> AsyncIterator[str]:
+        return self.resolve(prompt + (system_prompt or ''), max_tokens, {}).astream(
+            prompt=prompt, system_prompt=system_prompt, temperature=temperature, max_tokens=max_tokens,
+            reasoning=reasoning)
+    
+    def get_report(self, session: str = None) -> dict:
+        """Routing decisions and per-model statistics.
+        
+        Args:
+            session: Also report this session's spend and choices
+        
+        Returns:
+            Dict with 'models' (calls, errors, EWMA latency and error rate, cost),
+            'decisions' ({agent: {model: {reason: count}}}), 'recent' decisions,
+            and 'session' ({'cost', 'decisions': {agent: {model: count}}}) if requested
+        """
+        with self.state.lock:
+            models = {name: {'model': getattr(self.providers[name], 'model', ''), 'calls': stats.calls,
+                             'errors': stats.errors, 'ewma_latency': round(stats.latency or 0.0, 3),
+                             'ewma_error_rate': round(stats.error_rate, 3), 'cost': round(stats.cost, 5)}
+                      for name, stats in self.state.models.items()}
+            decisions: Dict[str, Dict[str, Dict[str, int]]] = {}
+            for (agent, name, reason), count in self.state.decisions.items():
+                decisions.setdefault(agent or '-', {}).setdefault(name, {})[reason] = count
+            report = {'models': models, 'decisions': decisions, 'recent': list(self.state.recent)}
+            if session is not None:
+                chosen: Dict[str, Dict[str, int]] = {}
+                for (agent, name), count in self.state.session_decisions.get(session, {}).items():
+                    chosen.setdefault(agent or '-', {})[name] = count
+                report['session'] = {'cost': round(self.state.session_cost.get(session, 0.0), 5),
+                                     'decisions': chosen}
+        return report
+
+
+class _RoutedCall(LLMProvider):
+    """The model chosen for one call; reports latency and errors back to the router."""
+    
+    def __init__(self, router: RouterProvider, name: str, prompt_tokens: int, session: str):
+        self.router = router
+        self.name = name
+        self.provider = router.providers[name]
+        self.model = getattr(self.provider, 'model', '')
+        self.lane_key = (type(self.provider).__name__, str(self.model))
+        self.prompt_tokens = prompt_tokens
+        self.session = session
+    
+    def _measure(self, call, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = call(*args, **kwargs)
+        except Exception:
+            self._record_failure(started)
+            raise
+        self._record_success(started, result if isinstance(result, str) else str(result))
+        return result
+    
+    async def _ameasure(self, call, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = await call(*args, **kwargs)
+        except Exception:
+            self._record_failure(started)
+            raise
+        self._record_success(started, result if isinstance(result, str) else str(result))
+        return result
+    
+    def _record_success(self, started: float, output: str):
+        self.router.record(self.name, time.perf_counter() - started, True,
+                           self.prompt_tokens + approx_tokens(output), self.session)
+    
+    def _record_failure(self, started: float):
+        self.router.record(self.name, time.perf_counter() - started, False, self.prompt_tokens, self.session)
+    
+    def generate(self, prompt: str, system_prompt: Optional[str] = None,
+                 temperature: float = 0.7, max_tokens: int = 1000,
+                 reasoning: Optional[ReasoningOptions] = None) -> str:
+        return self._measure(self.provider.generate, prompt=prompt, system_prompt=system_prompt,
+                             temperature=temperature, max_tokens=max_tokens, reasoning=reasoning)
+    
+    def generate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                      temperature: float = 0.3, max_tokens: int = 500,
+                      reasoning: Optional[ReasoningOptions] = None) -> dict:
+        return self._measure(self.provider.generate_json, prompt=prompt, schema=schema,
+                             system_prompt=system_prompt, temperature=temperature, max_tokens=max_tokens,
+                             reasoning=reasoning)
+    
+    def stream(self, prompt: str, system_prompt: Optional[str] = None,
+               temperature: float = 0.7, max_tokens: int = 1000,
+               reasoning: Optional[ReasoningOptions] = None) -> Iterator[str]:
+        started = time.perf_counter()
+        chunks = []
+        try:
+            for chunk in self.provider.stream(prompt=prompt, system_prompt=system_prompt, temperature=temperature,
+                                              max_tokens=max_tokens, reasoning=reasoning):
+                chunks.append(chunk)
+                yield chunk
+        except Exception:
+            self._record_failure(started)
+            raise
+        self._record_success(started, ''.join(chunks))
+    
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        temperature: float = 0.7, max_tokens: int = 1000,
+                        reasoning: Optional[ReasoningOptions] = None) -> str:
+        return await self._ameasure(self.provider.agenerate, prompt=prompt, system_prompt=system_prompt,
+                                    temperature=temperature, max_tokens=max_tokens, reasoning=reasoning)
+    
+    async def agenerate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                             temperature: float = 0.3, max_tokens: int = 500,
+                             reasoning: Optional[ReasoningOptions] = None) -> dict:
+        return await self._ameasure(self.provider.agenerate_json, prompt=prompt, schema=schema,
+                                    system_prompt=system_prompt, temperature=temperature, max_tokens=max_tokens,
+                                    reasoning=reasoning)
+    
+    async def astream(self, prompt: str, system_prompt: Optional[str] = None,
+                      temperature: float = 0.7, max_tokens: int = 1000,
+                      reasoning: Optional[ReasoningOptions] = None) -> AsyncIterator[str]:
+        started = time.perf_counter()
+        chunks = []
+        try:
+            async for chunk in self.provider.astream(prompt=prompt, system_prompt=system_prompt,
+                                                     temperature=temperature, max_tokens=max_tokens,
+                                                     reasoning=reasoning):
+                chunks.append(chunk)
+                yield chunk
+        except Exception:
+            self._record_failure(started)
+            raise
+        self._record_success(started, ''.join(chunks))
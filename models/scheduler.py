@@ -0,0 +1,387 @@
+"""Central scheduler for LLM calls shared by all sessions in the process."""
+
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from enum import IntEnum
+from typing import Any, AsyncIterator, Deque, Dict, Hashable, Iterator, List, Optional, Tuple
+from models.llm_factory import LLMProvider, ReasoningOptions, reasoning_options
+from models.usage import usage_meter
+from config import settings
+
+
+class Priority(IntEnum):
+    """Scheduling class of an LLM call; lower values are served first."""
+    
+    INTERACTIVE = 0  # the candidate is waiting for the text: Interviewer questions, greeting
+    STANDARD = 1     # on the turn's critical path, not shown: Observer, Evaluator
+    BACKGROUND = 2   # nobody waits on it right now: final report, speculative questions
+
+
+class _Ticket:
+    __slots__ = ('priority', 'session', 'tag', 'seq', 'enqueued', 'owner', 'waiter')
+    
+    def __init__(self, priority: Priority, session: str, tag: int, seq: int, owner: Hashable,
+                 waiter: Optional[asyncio.Future] = None):
+        self.priority = priority
+        self.session = session
+        self.tag = tag
+        self.seq = seq
+        self.enqueued = time.perf_counter()
+        # Thread id of a blocking call, asyncio task of an async one
+        self.owner = owner
+        # Future an async call awaits; resolved by whichever thread frees its slot
+        self.waiter = waiter
+
+
+def _grant(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class _Lane:
+    """Waiting calls and running slots of one (provider, model) pair."""
+    
+    def __init__(self, limit: int, reserve: int = 0):
+        self.limit = limit
+        # Slots only INTERACTIVE calls may take, so background work never fills the lane
+        self.reserve = min(reserve, limit - 1) if limit > 0 else 0
+        self.running = 0
+        self.waiting: List[_Ticket] = []
+        # Start-time fair queueing: each session's last tag and the tag of the last dispatched call
+        self.session_tags: Dict[Tuple[Priority, str], int] = {}
+        self.virtual_time: Dict[Priority, int] = {}
+    
+    def has_room(self, priority: Priority) -> bool:
+        """Whether a call of this priority may take a slot now."""
+        if self.limit <= 0:
+            return True
+        return self.running < (self.limit if priority == Priority.INTERACTIVE else self.limit - self.reserve)
+
+
+class LLMScheduler:
+    """Orders LLM calls by priority class, then fairly across sessions.
+    
+    Every (provider, model) pair has its own concurrency limit. A call
+    waits until a slot is free and no waiting call is ahead of it:
+    lower priority classes first; within a class, sessions take turns
+    (a session with many queued calls cannot starve one with a single
+    call); within a session, arrival order. A limited lane keeps
+    interactive_reserve slots for INTERACTIVE calls, since running calls
+    are never preempted. Calls run on the caller's thread, so a free slot
+    costs nothing but a lock; async calls (aslot()) share the same queues
+    and wait on their event loop instead of blocking a thread.
+    """
+    
+    def __init__(self, max_concurrency: int = None, model_limits: Dict[str, int] = None,
+                 window: int = 1000, interactive_reserve: int = None):
+        """Initialize the scheduler.
+        
+        Args:
+            max_concurrency: Default concurrent calls per (provider, model), 0 = unlimited
+            model_limits: Per-model overrides of max_concurrency
+            window: Recent queue times kept per priority class for percentiles
+            interactive_reserve: Slots of a limited lane held back for INTERACTIVE calls
+                (at most limit - 1)
+        """
+        self.max_concurrency = settings.SCHEDULER_MAX_CONCURRENCY if max_concurrency is None else max_concurrency
+        self.model_limits = settings.SCHEDULER_MODEL_LIMITS if model_limits is None else model_limits
+        self.interactive_reserve = settings.SCHEDULER_INTERACTIVE_RESERVE if interactive_reserve is None \
+            else interactive_reserve
+        self._condition = threading.Condition()
+        self._lanes: Dict[Tuple[str, str], _Lane] = {}
+        self._seq = itertools.count()
+        self._waits: Dict[Priority, Deque[float]] = {p: deque(maxlen=window) for p in Priority}
+        self._totals: Dict[Priority, List[float]] = {p: [0, 0.0, 0.0] for p in Priority}
+    
+    def _lane(self, key: Tuple[str, str]) -> _Lane:
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = _Lane(self.model_limits.get(key[1], self.max_concurrency), self.interactive_reserve)
+            self._lanes[key] = lane
+        return lane
+    
+    @staticmethod
+    def _next(lane: _Lane) -> Optional[_Ticket]:
+        return min(lane.waiting, key=lambda t: (t.priority, t.tag, t.seq), default=None)
+    
+    def _enqueue(self, key: Tuple[str, str], priority: Priority, session: str, owner: Hashable,
+                 waiter: Optional[asyncio.Future] = None) -> Tuple[_Lane, _Ticket]:
+        # Called with the lock held
+        lane = self._lane(key)
+        tag_key = (priority, session)
+        tag = max(lane.virtual_time.get(priority, 0), lane.session_tags.get(tag_key, 0)) + 1
+        lane.session_tags[tag_key] = tag
+        ticket = _Ticket(priority, session, tag, next(self._seq), owner, waiter)
+        lane.waiting.append(ticket)
+        return lane, ticket
+    
+    def _dispatch(self, lane: _Lane, ticket: _Ticket):
+        # Called with the lock held: the ticket leaves the queue and takes a slot
+        lane.waiting.remove(ticket)
+        lane.running += 1
+        priority, tag_key = ticket.priority, (ticket.priority, ticket.session)
+        lane.virtual_time[priority] = max(ticket.tag, lane.virtual_time.get(priority, 0))
+        if lane.session_tags.get(tag_key) == ticket.tag:
+            # Nothing else queued for this session: its next call starts from the virtual time
+            del lane.session_tags[tag_key]
+        waited = time.perf_counter() - ticket.enqueued
+        self._waits[priority].append(waited)
+        totals = self._totals[priority]
+        totals[0] += 1
+        totals[1] += waited
+        totals[2] = max(totals[2], waited)
+    
+    def _wake(self, lane: _Lane):
+        # Called with the lock held after a slot was freed or taken: async calls at the head of the
+        # queue are dispatched here, blocking ones are notified and dispatch themselves
+        while True:
+            ticket = self._next(lane)
+            if ticket is None or ticket.waiter is None or not lane.has_room(ticket.priority):
+                break
+            self._dispatch(lane, ticket)
+            ticket.waiter.get_loop().call_soon_threadsafe(_grant, ticket.waiter)
+        self._condition.notify_all()
+    
+    def _release(self, lane: _Lane):
+        with self._condition:
+            lane.running -= 1
+            self._wake(lane)
+    
+    @contextmanager
+    def slot(self, key: Tuple[str, str], priority: Priority, session: str = ''):
+        """Hold a slot of the (provider, model) pair for the duration of the block.
+        
+        Args:
+            key: (provider name, model)
+            priority: Priority class of the call
+            session: Session the call belongs to
+        """
+        with self._condition:
+            lane, ticket = self._enqueue(key, priority, session, threading.get_ident())
+            while not (lane.has_room(priority) and self._next(lane) is ticket):
+                self._condition.wait()
+            self._dispatch(lane, ticket)
+            if lane.waiting:
+                # The next call in line may fit in a slot that is still free
+                self._wake(lane)
+        try:
+            yield
+        finally:
+            self._release(lane)
+    
+    @asynccontextmanager
+    async def aslot(self, key: Tuple[str, str], priority: Priority, session: str = ''):
+        """Async slot(): the event loop serves other sessions while the call waits.
+        
+        Args:
+            key: (provider name, model)
+            priority: Priority class of the call
+            session: Session the call belongs to
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        with self._condition:
+            lane, ticket = self._enqueue(key, priority, session, asyncio.current_task(), waiter)
+            ready = lane.has_room(priority) and self._next(lane) is ticket
+            if ready:
+                self._dispatch(lane, ticket)
+        if not ready:
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._condition:
+                    dispatched = ticket not in lane.waiting
+                    if not dispatched:
+                        lane.waiting.remove(ticket)
+                        self._wake(lane)
+                if dispatched:
+                    self._release(lane)
+                raise
+        try:
+            yield
+        finally:
+            self._release(lane)
+    
+    def is_queued(self, owner: Hashable) -> bool:
+        """Whether a call made by the given thread id or asyncio task is still waiting for a slot."""
+        with self._condition:
+            return any(ticket.owner == owner for lane in self._lanes.values() for ticket in lane.waiting)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue times per priority class and load per (provider, model).
+        
+        Returns:
+            Dict with 'classes' (calls, mean/p50/p95/max queue time in seconds)
+            and 'lanes' (limit, running, waiting)
+        """
+        with self._condition:
+            classes = {}
+            for priority in Priority:
+                calls, total, longest = self._totals[priority]
+                recent = sorted(self._waits[priority])
+                classes[priority.name.lower()] = {
+                    'calls': calls,
+                    'mean_wait': round(total / calls, 4) if calls else 0.0,
+                    'p50_wait': round(recent[len(recent) // 2], 4) if recent else 0.0,
+                    'p95_wait': round(recent[min(len(recent) - 1, int(len(recent) * 0.95))], 4) if recent else 0.0,
+                    'max_wait': round(longest, 4)
+                }
+            lanes = {f"{provider}:{model}": {'limit': lane.limit, 'reserve': lane.reserve,
+                                             'running': lane.running, 'waiting': len(lane.waiting)}
+                     for (provider, model), lane in self._lanes.items()}
+        return {'classes': classes, 'lanes': lanes}
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """Process-wide scheduler shared by every session."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
+
+
+def lane_key(provider: LLMProvider) -> Tuple[str, str]:
+    """(provider name, model) pair whose concurrency limit a call counts against."""
+    return getattr(provider, 'lane_key', None) or (type(provider).__name__, str(getattr(provider, 'model', '')))
+
+
+class ScheduledProvider(LLMProvider):
+    """Provider view that routes every call through the scheduler.
+    
+    Agents wrap the provider they are given with their priority class and
+    routing hints (see scheduled()); the workflow adds the session the
+    calls belong to. The wrapped provider resolves each call to the model
+    that serves it (a router picks one), and the call queues for that
+    model. The agent's reasoning settings are sent with every call, and
+    the tokens the call uses are counted under the agent. The
+    a-prefixed methods do the same without blocking the event loop.
+    Other attributes (model, api_key, ...) are those of the wrapped
+    provider.
+    """
+    
+    def __init__(self, provider: LLMProvider, priority: Priority = Priority.STANDARD, session: str = '',
+                 scheduler: LLMScheduler = None, hints: Dict[str, Any] = None):
+        self.provider = provider
+        self.priority = priority
+        self.session = session
+        self.scheduler = scheduler
+        self.hints = hints or {}
+        self.reasoning = reasoning_options(self.hints.get('agent'))
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.provider, name)
+    
+    @property
+    def client(self) -> Any:
+        return self.provider.client
+    
+    @property
+    def aclient(self) -> Any:
+        return self.provider.aclient
+    
+    def hinted(self, **hints: Any) -> 'ScheduledProvider':
+        """Same view with extra routing hints for the next calls (e.g. difficulty=4)."""
+        return ScheduledProvider(self.provider, self.priority, self.session, self.scheduler,
+                                 {**self.hints, **hints})
+    
+    def _resolve(self, prompt: str, system_prompt: Optional[str], max_tokens: int) -> LLMProvider:
+        return self.provider.resolve(prompt + (system_prompt or ''), max_tokens, self.hints, self.session)
+    
+    def _slot(self, target: LLMProvider):
+        return (self.scheduler or get_scheduler()).slot(lane_key(target), self.priority, self.session)
+    
+    def _aslot(self, target: LLMProvider):
+        return (self.scheduler or get_scheduler()).aslot(lane_key(target), self.priority, self.session)
+    
+    def warm_up(self):
+        self.provider.warm_up()
+    
+    def generate(self, prompt: str, system_prompt: Optional[str] = None,
+                 temperature: float = 0.7, max_tokens: int = 1000,
+                 reasoning: Optional[ReasoningOptions] = None) -> str:
+        target = self._resolve(prompt, system_prompt, max_tokens)
+        with self._slot(target), usage_meter.agent_scope(self.hints.get('agent')):
+            return target.generate(prompt=prompt, system_prompt=system_prompt, temperature=temperature,
+                                   max_tokens=max_tokens, reasoning=reasoning or self.reasoning)
+    
+    def generate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                      temperature: float = 0.3, max_tokens: int = 500,
+                      reasoning: Optional[ReasoningOptions] = None) -> dict:
+        target = self._resolve(prompt, system_prompt, max_tokens)
+        with self._slot(target), usage_meter.agent_scope(self.hints.get('agent')):
+            return target.generate_json(prompt=prompt, schema=schema, system_prompt=system_prompt,
+                                        temperature=temperature, max_tokens=max_tokens,
+                                        reasoning=reasoning or self.reasoning)
+    
+    def stream(self, prompt: str, system_prompt: Optional[str] = None,
+               temperature: float = 0.7, max_tokens: int = 1000,
+               reasoning: Optional[ReasoningOptions] = None) -> Iterator[str]:
+        target = self._resolve(prompt, system_prompt, max_tokens)
+        # The slot is held until the stream is exhausted or closed
+        with self._slot(target), usage_meter.agent_scope(self.hints.get('agent')):
+            yield from target.stream(prompt=prompt, system_prompt=system_prompt, temperature=temperature,
+                                     max_tokens=max_tokens, reasoning=reasoning or self.reasoning)
+    
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        temperature: float = 0.7, max_tokens: int = 1000,
+                        reasoning: Optional[ReasoningOptions] = None) -> str:
+        target = self._resolve(prompt, system_prompt, max_tokens)
+        async with self._aslot(target):
+            with usage_meter.agent_scope(self.hints.get('agent')):
+                return await target.agenerate(prompt=prompt, system_prompt=system_prompt, temperature=temperature,
+                                              max_tokens=max_tokens, reasoning=reasoning or self.reasoning)
+    
+    async def agenerate_json(self, prompt: str, schema: dict, system_prompt: Optional[str] = None,
+                             temperature: float = 0.3, max_tokens: int = 500,
+                             reasoning: Optional[ReasoningOptions] = None) -> dict:
+        target = self._resolve(prompt, system_prompt, max_tokens)
+        async with self._aslot(target):
+            with usage_meter.agent_scope(self.hints.get('agent')):
+                return await target.agenerate_json(prompt=prompt, schema=schema, system_prompt=system_prompt,
+                                                   temperature=temperature, max_tokens=max_tokens,
+                                                   reasoning=reasoning or self.reasoning)
+    
+    async def astream(self, prompt: str, system_prompt: Optional[str] = None,
+                      temperature: float = 0.7, max_tokens: int = 1000,
+                      reasoning: Optional[ReasoningOptions] = None) -> AsyncIterator[str]:
+        target = self._resolve(prompt, system_prompt, max_tokens)
+        async with self._aslot(target):
+            with usage_meter.agent_scope(self.hints.get('agent')):
+                async for chunk in target.astream(prompt=prompt, system_prompt=system_prompt,
+                                                  temperature=temperature, max_tokens=max_tokens,
+                                                  reasoning=reasoning or self.reasoning):
+                    yield chunk
+
+
+def scheduled(provider: LLMProvider, priority: Priority = None, session: str = None,
+              hints: Dict[str, Any] = None) -> ScheduledProvider:
+    """Wrap a provider for the scheduler, or re-tag an already wrapped one.
+    
+    Args:
+        provider: Raw or already scheduled provider
+        priority: Priority class (kept from the wrapped view if None)
+        session: Session id (kept from the wrapped view if None)
+        hints: Routing hints merged into the wrapped view's hints
+    
+    Returns:
+        ScheduledProvider over the raw provider
+    """
+    if isinstance(provider, ScheduledProvider):
+        return ScheduledProvider(
+            provider.provider,
+            provider.priority if priority is None else priority,
+            provider.session if session is None else session,
+            provider.scheduler,
+            {**provider.hints, **(hints or {})}
+        )
+    return ScheduledProvider(provider, Priority.STANDARD if priority is None else priority, session or '',
+                             hints=hints)
@@ -1,14 +1,35 @@
-from typing import List, Dict, Optional, Set, Any
+from typing import List, Dict, Optional, Set, Any, Literal
 from pydantic import BaseModel, Field
 from typing_extensions import TypedDict
 
 
+class ObserverResult(BaseModel):
+    analysis: str
+    difficulty_change: int = Field(default=0, ge=-1, le=1)
+    strategy_decision: str
+    next_topic: str = ""
+    off_topic: bool = False
+    hallucination: bool = False
+
+
+class EvaluatorResult(BaseModel):
+    correctness: Literal['correct', 'partial', 'incorrect'] = 'partial'
+    score: float = Field(default=0.5, ge=0.0, le=1.0)
+    comment: str = ""
+    correct_answer: str = ""
+    # Set when the result was copied from a near-duplicate answer instead of an LLM call
+    reused_from: Optional[int] = None
+    similarity: Optional[float] = None
+
+
 class Turn(BaseModel):
     turn_id: int
     agent_visible_message: str
     user_message: str
     internal_thoughts: str
     performance_metrics: Optional[Dict[str, float]] = None
+    observer_result: Optional[ObserverResult] = None
+    evaluator_result: Optional[EvaluatorResult] = None
 
 
 class CandidateProfile(BaseModel):
@@ -44,6 +65,15 @@ class FinalFeedback(BaseModel):
     roadmap: List[str] = Field(default_factory=list)
 
 
+class BankQuestion(BaseModel):
+    id: Optional[int] = None
+    position_family: str
+    topic: str
+    difficulty: int = Field(ge=1, le=5)
+    question: str
+    reference_answer: str
+
+
 class InterviewLog(BaseModel):
     participant_name: str
     candidate_profile: Optional[CandidateProfile] = None
@@ -69,3 +99,6 @@ class InterviewState(TypedDict, total=False):
     observer_analysis: str
     evaluator_feedback: str
     strategy_decision: str
+    observer_result: ObserverResult
+    reference_answer: str
+    asked_bank_questions: List[int]
@@ -0,0 +1,110 @@
+"""Token usage reported by the provider APIs, including hidden reasoning tokens."""
+
+import threading
+from contextvars import ContextVar
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+class UsageMeter:
+    """Process-wide token counters per (agent, model).
+    
+    Providers call record() with the usage block of each response; the
+    agent is the one whose scheduled provider view made the call (see
+    agent_scope()). Calls made outside any agent are counted under '-'.
+    Scopes are context variables, so they follow a thread or an asyncio
+    task, whichever makes the call.
+    """
+    
+    FIELDS = ('calls', 'prompt_tokens', 'completion_tokens', 'reasoning_tokens')
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._agent: ContextVar[Optional[str]] = ContextVar('usage_agent', default=None)
+        self._captures: ContextVar[Tuple[Dict[str, int], ...]] = ContextVar('usage_captures', default=())
+        self._counters: Dict[Tuple[str, str], Dict[str, int]] = {}
+    
+    @contextmanager
+    def agent_scope(self, agent: Optional[str]):
+        """Attribute the calls made in this context inside the block to an agent."""
+        token = self._agent.set(agent)
+        try:
+            yield
+        finally:
+            self._agent.reset(token)
+    
+    @contextmanager
+    def capture(self) -> Iterator[Dict[str, int]]:
+        """Also count the calls made in this context inside the block on their own.
+        
+        Yields:
+            Counters (FIELDS) of the calls recorded inside the block so far
+        """
+        captured = dict.fromkeys(self.FIELDS, 0)
+        token = self._captures.set(self._captures.get() + (captured,))
+        try:
+            yield captured
+        finally:
+            self._captures.reset(token)
+    
+    def record(self, model: str, prompt_tokens: int = 0, completion_tokens: int = 0,
+               reasoning_tokens: int = 0):
+        """Add one response's usage.
+        
+        Args:
+            model: Model that served the call
+            prompt_tokens: Input tokens
+            completion_tokens: Output tokens (reasoning included, as the APIs bill them)
+            reasoning_tokens: Hidden reasoning part of completion_tokens
+        """
+        key = (self._agent.get() or '-', model)
+        with self._lock:
+            counters = self._counters.setdefault(key, dict.fromkeys(self.FIELDS, 0))
+            counters['calls'] += 1
+            counters['prompt_tokens'] += prompt_tokens or 0
+            counters['completion_tokens'] += completion_tokens or 0
+            counters['reasoning_tokens'] += reasoning_tokens or 0
+        for captured in self._captures.get():
+            captured['calls'] += 1
+            captured['prompt_tokens'] += prompt_tokens or 0
+            captured['completion_tokens'] += completion_tokens or 0
+            captured['reasoning_tokens'] += reasoning_tokens or 0
+    
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """Counters as {agent: {model: {calls, prompt_tokens, completion_tokens, reasoning_tokens}}}."""
+        with self._lock:
+            result: Dict[str, Dict[str, Dict[str, int]]] = {}
+            for (agent, model), counters in self._counters.items():
+                result.setdefault(agent, {})[model] = dict(counters)
+        return result
+    
+    def totals(self) -> Dict[str, int]:
+        """Counters summed over all agents and models."""
+        with self._lock:
+            return {field: sum(counters[field] for counters in self._counters.values()) for field in self.FIELDS}
+
+
+def _field(usage: Any, name: str) -> int:
+    if usage is None:
+        return 0
+    value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+    return value if isinstance(value, int) else 0
+
+
+def record_usage(model: str, usage: Any):
+    """Record an OpenAI-style usage block (dict or SDK object) into usage_meter.
+    
+    Args:
+        model: Model that served the call
+        usage: Object with prompt_tokens, completion_tokens and optionally
+            completion_tokens_details.reasoning_tokens; None is ignored
+    """
+    if usage is None:
+        return
+    details = usage.get('completion_tokens_details') if isinstance(usage, dict) \
+        else getattr(usage, 'completion_tokens_details', None)
+    usage_meter.record(model, _field(usage, 'prompt_tokens'), _field(usage, 'completion_tokens'),
+                       _field(details, 'reasoning_tokens'))
+
+
+usage_meter = UsageMeter()
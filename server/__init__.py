@@ -0,0 +1,4 @@
+from .session_manager import Session, SessionManager
+from .app import InterviewServer, run_server
+
+__all__ = ['Session', 'SessionManager', 'InterviewServer', 'run_server']
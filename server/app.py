@@ -0,0 +1,297 @@
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+from typing import Optional, Tuple
+from models.router import RouterProvider
+from models.scheduler import get_scheduler
+from models.usage import usage_meter
+from server.session_manager import SessionManager
+from config import settings
+
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_BODY_SIZE = 1 << 20
+
+HTTP_REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error'
+}
+
+
+class InterviewServer:
+    """HTTP/JSON and WebSocket front end for the session manager.
+    
+    HTTP:
+        POST /sessions                  {name, position, grade, experience}
+        POST /sessions/<id>/turn        {message}
+        GET  /sessions/<id>
+        POST /sessions/<id>/finish
+        GET  /health                     (LLM scheduler queue metrics, routing report)
+    
+    WebSocket (GET /ws), JSON messages with a "type" of init, turn, status
+    or finish; interviewer text is streamed as {"type": "token"} messages
+    before the final {"type": "message"}.
+    """
+    
+    def __init__(self, manager: SessionManager, host: str = None, port: int = None):
+        self.manager = manager
+        self.host = host or settings.SERVER_HOST
+        self.port = port or settings.SERVER_PORT
+    
+    async def serve_forever(self):
+        await self.manager.start()
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        print(f"Сервер интервью запущен: http://{self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.manager.stop()
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                
+                if path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+                    await self._handle_websocket(reader, writer, headers)
+                    break
+                
+                status, payload = await self._dispatch(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:
+            await self._write_response(writer, 400, {'error': str(e)}, keep_alive=False)
+        finally:
+            writer.close()
+    
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, dict, bytes]]:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, path, _ = request_line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise ValueError("Malformed request line")
+        
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        
+        length = int(headers.get('content-length', '0') or 0)
+        if length > MAX_BODY_SIZE:
+            raise ValueError("Request body too large")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), path.split('?', 1)[0], headers, body
+    
+    async def _write_response(self, writer: asyncio.StreamWriter, status: int, payload: dict,
+                              keep_alive: bool = True):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'OK')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+    
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, dict]:
+        """Route an HTTP request to the session manager.
+        
+        Args:
+            method: HTTP method
+            path: Request path without the query string
+            body: Raw request body
+        
+        Returns:
+            (status code, JSON payload)
+        """
+        parts = [part for part in path.split('/') if part]
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise ValueError("JSON object expected")
+            
+            if parts == ['health']:
+                health = {'status': 'ok', 'sessions': len(self.manager.sessions),
+                          'scheduler': get_scheduler().get_metrics(), 'usage': usage_meter.snapshot()}
+                if isinstance(self.manager.llm, RouterProvider):
+                    health['router'] = self.manager.llm.get_report()
+                return 200, health
+            if parts == ['sessions'] and method == 'POST':
+                return 200, await self._create_session(data)
+            if len(parts) == 2 and parts[0] == 'sessions' and method == 'GET':
+                return 200, await self.manager.get_status(parts[1])
+            if len(parts) == 3 and parts[0] == 'sessions' and method == 'POST':
+                if parts[2] == 'turn':
+                    return 200, await self.manager.process_turn(parts[1], self._require(data, 'message'))
+                if parts[2] == 'finish':
+                    return 200, await self.manager.finish(parts[1])
+            if parts and parts[0] in ('sessions', 'health'):
+                return 405, {'error': f"Method {method} not allowed for {path}"}
+            return 404, {'error': f"Not found: {path}"}
+        except KeyError as e:
+            return 404, {'error': str(e.args[0]) if e.args else 'Not found'}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': str(e)}
+    
+    async def _create_session(self, data: dict, on_token=None) -> dict:
+        return await self.manager.create_session(
+            name=str(data.get('name') or 'Кандидат'),
+            position=str(data.get('position') or 'Developer'),
+            grade=str(data.get('grade') or 'Junior'),
+            experience=str(data.get('experience') or 'Начинающий разработчик'),
+            on_token=on_token
+        )
+    
+    @staticmethod
+    def _require(data: dict, field: str) -> str:
+        value = str(data.get(field, '')).strip()
+        if not value:
+            raise ValueError(f"Field '{field}' is required")
+        return value
+    
+    async def _handle_websocket(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                                headers: dict):
+        key = headers.get('sec-websocket-key', '')
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode('ascii')).digest()).decode('ascii')
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode('latin-1'))
+        await writer.drain()
+        
+        send = lambda payload: self._ws_send(writer, json.dumps(payload, ensure_ascii=False))
+        session_id = None
+        
+        while True:
+            text = await self._ws_receive(reader, writer)
+            if text is None:
+                break
+            try:
+                message = json.loads(text)
+                if not isinstance(message, dict):
+                    raise ValueError("JSON object expected")
+                kind = message.get('type')
+                session_id = message.get('session_id') or session_id
+                on_token = lambda token: send({'type': 'token', 'text': token})
+                
+                if kind == 'init':
+                    result = await self._create_session(message, on_token=on_token)
+                    session_id = result['session_id']
+                    await send({'type': 'message', 'session_id': session_id,
+                                'text': result['greeting'], 'complete': False})
+                elif session_id is None:
+                    raise ValueError("Send an init message first")
+                elif kind == 'turn':
+                    result = await self.manager.process_turn(
+                        session_id, self._require(message, 'message'), on_token=on_token
+                    )
+                    await send({'type': 'message', 'session_id': session_id,
+                                'text': result['response'], 'complete': result['complete']})
+                elif kind == 'status':
+                    await send({'type': 'status', **await self.manager.get_status(session_id)})
+                elif kind == 'finish':
+                    await send({'type': 'feedback', 'session_id': session_id,
+                                **await self.manager.finish(session_id)})
+                else:
+                    raise ValueError(f"Unknown message type: {kind}")
+            except KeyError as e:
+                await send({'type': 'error', 'error': str(e.args[0]) if e.args else 'Not found'})
+            except ValueError as e:
+                await send({'type': 'error', 'error': str(e)})
+            except (ConnectionError, OSError):
+                raise
+            except Exception as e:
+                await send({'type': 'error', 'error': str(e)})
+    
+    async def _ws_receive(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> Optional[str]:
+        """Read one text message, answering pings and reassembling fragments.
+        
+        Returns:
+            Message text, or None when the client closed the connection
+        """
+        fragments = []
+        while True:
+            try:
+                first, second = await reader.readexactly(2)
+            except asyncio.IncompleteReadError:
+                return None
+            fin, opcode = first & 0x80, first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack('!H', await reader.readexactly(2))[0]
+            elif length == 127:
+                length = struct.unpack('!Q', await reader.readexactly(8))[0]
+            if length > MAX_BODY_SIZE:
+                return None
+            mask = await reader.readexactly(4) if second & 0x80 else b''
+            payload = await reader.readexactly(length)
+            if mask:
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+            
+            if opcode == 0x8:
+                self._ws_write_frame(writer, 0x8, payload[:2])
+                await writer.drain()
+                return None
+            if opcode == 0x9:
+                self._ws_write_frame(writer, 0xA, payload)
+                await writer.drain()
+                continue
+            if opcode == 0xA:
+                continue
+            
+            fragments.append(payload)
+            if fin:
+                return b''.join(fragments).decode('utf-8', errors='replace')
+    
+    @staticmethod
+    def _ws_write_frame(writer: asyncio.StreamWriter, opcode: int, payload: bytes):
+        length = len(payload)
+        if length < 126:
+            header = struct.pack('!BB', 0x80 | opcode, length)
+        elif length < 1 << 16:
+            header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+        writer.write(header + payload)
+    
+    async def _ws_send(self, writer: asyncio.StreamWriter, text: str):
+        self._ws_write_frame(writer, 0x1, text.encode('utf-8'))
+        await writer.drain()
+
+
+def run_server(host: str = None, port: int = None):
+    """Run the interview server until interrupted.
+    
+    Args:
+        host: Bind address (defaults to SERVER_HOST)
+        port: Port (defaults to SERVER_PORT)
+    """
+    server = InterviewServer(SessionManager(), host=host, port=port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\nСервер остановлен.")
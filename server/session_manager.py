@@ -0,0 +1,221 @@
+import asyncio
+import functools
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+from core.workflow import InterviewWorkflow
+from models.llm_factory import LLMProvider, LLMFactory
+from config import settings
+
+
+TokenCallback = Callable[[str], Awaitable[None]]
+
+
+class Session:
+    """One interview held by the server."""
+    
+    def __init__(self, session_id: str, workflow: InterviewWorkflow):
+        self.session_id = session_id
+        self.workflow = workflow
+        # Serialises turns of one candidate; other sessions are not blocked
+        self.lock = asyncio.Lock()
+        self.last_active = time.monotonic()
+        self.feedback: Optional[dict] = None
+    
+    def touch(self):
+        self.last_active = time.monotonic()
+
+
+class SessionManager:
+    """Holds many interview sessions in one process.
+    
+    Greetings and turns run on the event loop through the providers'
+    async methods (InterviewWorkflow.astart_interview/aprocess_turn), so
+    a session waiting for its LLM calls holds no thread. All sessions
+    share the same provider clients and scheduler. Session setup, the
+    final report and closing are blocking and run on a worker pool of
+    max_workers threads.
+    """
+    
+    def __init__(self, llm_provider: LLMProvider = None, cheap_llm_provider: LLMProvider = None,
+                 idle_ttl: float = None, max_workers: int = None):
+        self.llm, self.cheap_llm = LLMFactory.create_pair(llm_provider, cheap_llm_provider)
+        self.idle_ttl = idle_ttl if idle_ttl is not None else settings.SERVER_SESSION_TTL
+        self.sessions: Dict[str, Session] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or settings.SERVER_MAX_WORKERS,
+                                            thread_name_prefix='session')
+        self._eviction_task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        self._eviction_task = asyncio.create_task(self._evict_idle_sessions())
+    
+    async def stop(self):
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+        for session_id in list(self.sessions):
+            await self._close_session(session_id)
+        self._executor.shutdown(wait=False)
+    
+    async def _run(self, func: Callable, *args) -> Any:
+        """Run a blocking workflow step on the worker pool.
+        
+        Args:
+            func: Blocking callable
+            *args: Positional arguments for func
+        
+        Returns:
+            Result of func
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(func, *args))
+    
+    @staticmethod
+    def _delivery(on_token: Optional[TokenCallback]) -> Optional[TokenCallback]:
+        """Wrap a token callback so a client that went away does not abort the turn.
+        
+        Args:
+            on_token: Async callback for streamed interviewer tokens
+        
+        Returns:
+            Callback that stops delivering after the first connection error
+        """
+        if on_token is None:
+            return None
+        connected = True
+        
+        async def deliver(token: str):
+            nonlocal connected
+            if not connected:
+                return
+            try:
+                await on_token(token)
+            except (ConnectionError, OSError):
+                # Client went away: finish the turn so the session state stays consistent
+                connected = False
+        
+        return deliver
+    
+    def get(self, session_id: str) -> Session:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise KeyError(f"Unknown session: {session_id}")
+        session.touch()
+        return session
+    
+    async def create_session(self, name: str, position: str, grade: str, experience: str,
+                             on_token: Optional[TokenCallback] = None) -> dict:
+        """Start a new interview.
+        
+        Args:
+            name: Candidate name
+            position: Position applying for
+            grade: Grade level
+            experience: Experience description
+            on_token: Async callback for streamed greeting tokens
+        
+        Returns:
+            Dict with session_id and greeting
+        """
+        session_id = uuid.uuid4().hex
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '_', '-')).replace(' ', '_')
+        log_filename = f"logs/interview_{timestamp}_{safe_name}_{session_id[:8]}.json"
+        
+        def init() -> InterviewWorkflow:
+            workflow = InterviewWorkflow(log_filepath=log_filename, llm_provider=self.llm,
+                                         cheap_llm_provider=self.cheap_llm, verbose=False)
+            try:
+                workflow.initialize_interview(name, position, grade, experience)
+            except Exception:
+                workflow.close()
+                raise
+            return workflow
+        
+        workflow = await self._run(init)
+        try:
+            greeting = await workflow.astart_interview(on_token=self._delivery(on_token))
+        except BaseException:
+            # Failed or cancelled: the client never learns the id, so release the log and checkpoint now
+            await self._run(workflow.close)
+            raise
+        
+        # Registered only once started, so no other request can reach a half-open session
+        self.sessions[session_id] = Session(session_id, workflow)
+        return {'session_id': session_id, 'greeting': greeting}
+    
+    async def process_turn(self, session_id: str, message: str,
+                           on_token: Optional[TokenCallback] = None) -> dict:
+        """Process a candidate message.
+        
+        Args:
+            session_id: Session id
+            message: Candidate message
+            on_token: Async callback for streamed interviewer tokens
+        
+        Returns:
+            Dict with the interviewer response and completion flag
+        """
+        session = self.get(session_id)
+        # Shielded: a request cancelled mid-turn still completes the turn, so the state stays consistent
+        return await asyncio.shield(self._process_turn(session, message, self._delivery(on_token)))
+    
+    async def _process_turn(self, session: Session, message: str, on_token: Optional[TokenCallback]) -> dict:
+        async with session.lock:
+            if session.workflow.is_complete() or session.feedback is not None:
+                raise ValueError("Interview is already complete")
+            response = await session.workflow.aprocess_turn(message, on_token=on_token)
+            session.touch()
+            return {'response': response, 'complete': session.workflow.is_complete()}
+    
+    async def get_status(self, session_id: str) -> dict:
+        session = self.get(session_id)
+        async with session.lock:
+            state = session.workflow.state
+            return {
+                'session_id': session_id,
+                'turns': len(state.get('turns', [])),
+                'difficulty': state.get('current_difficulty', 3),
+                'cumulative_score': round(state.get('cumulative_score', 0.0), 2),
+                'topics_covered': sorted(state.get('topics_covered', set())),
+                'complete': session.workflow.is_complete(),
+                'finished': session.feedback is not None
+            }
+    
+    async def finish(self, session_id: str) -> dict:
+        """Finish an interview and generate the final report.
+        
+        Args:
+            session_id: Session id
+        
+        Returns:
+            Dict with the final report and a short summary
+        """
+        session = self.get(session_id)
+        async with session.lock:
+            if session.feedback is None:
+                workflow = session.workflow
+                workflow.state['interview_complete'] = True
+                summary = await self._run(workflow.generate_final_feedback)
+                feedback = workflow.logger.get_log().final_feedback
+                session.feedback = {
+                    'feedback': feedback.model_dump(mode='json') if feedback else None,
+                    'summary': summary,
+                    'log': str(workflow.logger.filepath)
+                }
+            session.touch()
+            return session.feedback
+    
+    async def _close_session(self, session_id: str):
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            await self._run(session.workflow.close)
+    
+    async def _evict_idle_sessions(self):
+        interval = max(1.0, min(60.0, self.idle_ttl / 2))
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for session_id, session in list(self.sessions.items()):
+                if now - session.last_active > self.idle_ttl and not session.lock.locked():
+                    await self._close_session(session_id)
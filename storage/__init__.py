@@ -0,0 +1,6 @@
+from .question_bank import QuestionBank
+from .reference_answers import ReferenceAnswerStore
+from .answer_index import AnswerIndex
+from .log_index import LogIndex
+
+__all__ = ['QuestionBank', 'ReferenceAnswerStore', 'AnswerIndex', 'LogIndex']
@@ -0,0 +1,220 @@
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+from models.schemas import EvaluatorResult
+from utils.text_fingerprint import normalize_tokens, stable_hash, question_fingerprint, hamming_distance
+
+
+class AnswerIndex:
+    """MinHash/LSH index over graded answers for reusing evaluations.
+    
+    Answers are shingled into character 4-grams of the normalised text
+    (robust to word endings and small edits) and summarised by a MinHash
+    signature; LSH banding finds candidate answers without scanning the
+    whole table. A candidate is reused when its question is a near
+    duplicate (SimHash) and the estimated Jaccard similarity of the
+    answers passes the threshold.
+    """
+    
+    # Smallest prime above 2**32 for the universal hash family
+    PRIME = (1 << 32) + 15
+    MIN_QUESTION_TOKENS = 3
+    MIN_ANSWER_TOKENS = 5
+    SHINGLE_SIZE = 4
+    
+    def __init__(self, filepath: str, threshold: float = 0.75, num_perm: int = 64,
+                 bands: int = 16, question_max_distance: int = 6, seed: int = 1):
+        import numpy as np
+        self.np = np
+        
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        
+        self.filepath = Path(filepath)
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.question_max_distance = question_max_distance
+        
+        # Fixed seed: signatures must stay comparable across processes
+        rng = np.random.default_rng(seed)
+        self.perm_a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.perm_b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.prime = np.uint64(self.PRIME)
+        
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.filepath), check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS evaluations (
+                id INTEGER PRIMARY KEY,
+                question_fp TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                answer TEXT NOT NULL,
+                correctness TEXT NOT NULL,
+                score REAL NOT NULL,
+                comment TEXT NOT NULL,
+                correct_answer TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                band INTEGER NOT NULL,
+                bucket TEXT NOT NULL,
+                evaluation_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_lsh_bucket ON lsh_buckets (band, bucket);
+            CREATE TABLE IF NOT EXISTS verifications (
+                evaluation_id INTEGER NOT NULL,
+                reused_score REAL NOT NULL,
+                fresh_score REAL NOT NULL,
+                reused_correctness TEXT NOT NULL,
+                fresh_correctness TEXT NOT NULL
+            );
+        """)
+    
+    def _shingles(self, text: str) -> Set[str]:
+        tokens = normalize_tokens(text)
+        if len(tokens) < self.MIN_ANSWER_TOKENS:
+            return set()
+        text = ' '.join(tokens)
+        return {text[i:i + self.SHINGLE_SIZE] for i in range(len(text) - self.SHINGLE_SIZE + 1)}
+    
+    def signature(self, text: str):
+        """Compute the MinHash signature of an answer.
+        
+        Args:
+            text: Answer text
+        
+        Returns:
+            uint64 array of length num_perm, or None for too short answers
+        """
+        np = self.np
+        shingles = self._shingles(text)
+        if not shingles:
+            return None
+        
+        hashes = np.array([stable_hash(s) & 0xFFFFFFFF for s in shingles], dtype=np.uint64)
+        # (a * x + b) mod p for every (shingle, permutation) pair; fits in uint64
+        permuted = (hashes[:, None] * self.perm_a[None, :] + self.perm_b[None, :]) % self.prime
+        return permuted.min(axis=0)
+    
+    def _bucket_keys(self, signature) -> List[str]:
+        return [
+            hashlib.blake2b(signature[i * self.rows:(i + 1) * self.rows].tobytes(), digest_size=8).hexdigest()
+            for i in range(self.bands)
+        ]
+    
+    def find(self, question: str, answer: str) -> Optional[Tuple[int, EvaluatorResult, float]]:
+        """Find an already graded near-duplicate answer to the same question.
+        
+        Args:
+            question: Interviewer question
+            answer: Candidate answer
+        
+        Returns:
+            (evaluation id, stored result, estimated Jaccard) or None
+        """
+        if len(normalize_tokens(question)) < self.MIN_QUESTION_TOKENS:
+            return None
+        signature = self.signature(answer)
+        if signature is None:
+            return None
+        
+        question_fp = question_fingerprint(question)
+        keys = self._bucket_keys(signature)
+        
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT e.id, e.question_fp, e.signature, e.correctness, e.score, e.comment, e.correct_answer "
+                "FROM evaluations e WHERE e.id IN (SELECT evaluation_id FROM lsh_buckets WHERE "
+                + " OR ".join("(band = ? AND bucket = ?)" for _ in keys) + ")",
+                [value for band, key in enumerate(keys) for value in (band, key)]
+            ).fetchall()
+        
+        best = None
+        for row_id, stored_fp, stored_signature, correctness, score, comment, correct_answer in rows:
+            if hamming_distance(question_fp, int(stored_fp)) > self.question_max_distance:
+                continue
+            stored = self.np.frombuffer(stored_signature, dtype=self.np.uint64)
+            similarity = float((stored == signature).mean())
+            if similarity >= self.threshold and (best is None or similarity > best[2]):
+                result = EvaluatorResult(
+                    correctness=correctness,
+                    score=score,
+                    comment=comment,
+                    correct_answer=correct_answer
+                )
+                best = (row_id, result, similarity)
+        
+        return best
+    
+    def add(self, question: str, answer: str, result: EvaluatorResult) -> Optional[int]:
+        """Index a freshly graded answer.
+        
+        Args:
+            question: Interviewer question
+            answer: Candidate answer
+            result: Evaluator result
+        
+        Returns:
+            Evaluation id, or None if the answer is too short to index
+        """
+        if len(normalize_tokens(question)) < self.MIN_QUESTION_TOKENS:
+            return None
+        signature = self.signature(answer)
+        if signature is None:
+            return None
+        
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO evaluations "
+                "(question_fp, signature, answer, correctness, score, comment, correct_answer) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(question_fingerprint(question)), signature.tobytes(), answer,
+                 result.correctness, result.score, result.comment, result.correct_answer)
+            )
+            evaluation_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO lsh_buckets (band, bucket, evaluation_id) VALUES (?, ?, ?)",
+                [(band, key, evaluation_id) for band, key in enumerate(self._bucket_keys(signature))]
+            )
+            self.conn.commit()
+        return evaluation_id
+    
+    def record_verification(self, evaluation_id: int, reused: EvaluatorResult, fresh: EvaluatorResult):
+        """Record an LLM re-grade of an answer that would have been reused.
+        
+        Args:
+            evaluation_id: Evaluation that matched
+            reused: Stored result that would have been reused
+            fresh: Result of the verification call
+        """
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO verifications VALUES (?, ?, ?, ?, ?)",
+                (evaluation_id, reused.score, fresh.score, reused.correctness, fresh.correctness)
+            )
+            self.conn.commit()
+    
+    def get_verification_stats(self) -> dict:
+        """Summarise how reused scores compare with fresh LLM grades.
+        
+        Returns:
+            Dict with sample count, mean absolute score difference and correctness agreement
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*), AVG(ABS(reused_score - fresh_score)), "
+                "AVG(CASE WHEN reused_correctness = fresh_correctness THEN 1.0 ELSE 0.0 END) "
+                "FROM verifications"
+            ).fetchone()
+        return {
+            'samples': row[0],
+            'mean_abs_score_diff': round(row[1], 3) if row[1] is not None else None,
+            'correctness_agreement': round(row[2], 3) if row[2] is not None else None
+        }
+    
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,299 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from models.schemas import InterviewLog
+from core.stopping import scored_turns
+from core.topics import get_position_topics
+from utils.archive import ARCHIVE_SUFFIX, ArchiveReader, log_started_at
+
+
+class LogIndex:
+    """SQLite analytics index over interview logs.
+    
+    refresh() ingests new and changed log files: a file whose mtime and
+    size match the indexed ones is not read; a changed mtime is confirmed
+    by the SHA-256 of the content before the session is re-parsed. Files
+    that are not interview logs are remembered with their error so they
+    are not parsed again until they change. Sessions of archives are
+    indexed as "<archive>#<session>" and keyed by the CRC-32 of their
+    frame instead of a SHA-256; only the archive's index is read for
+    unchanged sessions. A session that is also present as a JSON log
+    (migrated without removing the original) is indexed once, from the log.
+    """
+    
+    # Aggregations exposed to the CLI: group key -> SQL expression
+    GROUPS = {
+        'position': "s.position",
+        'grade': "s.grade",
+        'recommendation': "COALESCE(f.hiring_recommendation, '-')",
+        'week': "strftime('%Y-W%W', s.started_at)",
+        'day': "date(s.started_at)",
+        'topic': "sc.topic",
+        'difficulty': "sc.difficulty"
+    }
+    
+    def __init__(self, filepath: str):
+        self.filepath = Path(filepath)
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.filepath), check_same_thread=False)
+        self.conn.executescript("""
+            PRAGMA foreign_keys = ON;
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                error TEXT
+            );
+            CREATE TABLE IF NOT EXISTS sessions (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE REFERENCES files (path) ON DELETE CASCADE,
+                participant TEXT NOT NULL,
+                position TEXT NOT NULL,
+                grade TEXT NOT NULL,
+                started_at TEXT NOT NULL,
+                turns INTEGER NOT NULL,
+                avg_score REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sessions_started ON sessions (started_at);
+            CREATE INDEX IF NOT EXISTS idx_sessions_position ON sessions (position);
+            CREATE TABLE IF NOT EXISTS turns (
+                session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+                turn_id INTEGER NOT NULL,
+                question TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                next_topic TEXT,
+                difficulty_change INTEGER,
+                degrade_level INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (session_id, turn_id)
+            );
+            CREATE TABLE IF NOT EXISTS scores (
+                session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+                turn_id INTEGER NOT NULL,
+                score REAL NOT NULL,
+                correctness TEXT,
+                difficulty INTEGER NOT NULL,
+                topic TEXT NOT NULL,
+                PRIMARY KEY (session_id, turn_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_scores_topic ON scores (topic);
+            CREATE TABLE IF NOT EXISTS topics (
+                session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+                topic TEXT NOT NULL,
+                answers INTEGER NOT NULL,
+                avg_score REAL NOT NULL,
+                PRIMARY KEY (session_id, topic)
+            );
+            CREATE TABLE IF NOT EXISTS final_feedback (
+                session_id INTEGER PRIMARY KEY REFERENCES sessions (id) ON DELETE CASCADE,
+                grade TEXT NOT NULL,
+                hiring_recommendation TEXT NOT NULL,
+                confidence_score REAL NOT NULL,
+                confirmed_skills TEXT NOT NULL,
+                knowledge_gaps INTEGER NOT NULL
+            );
+        """)
+    
+    def refresh(self, logs_dir: str) -> Dict[str, int]:
+        """Bring the index in line with the logs under a directory.
+        
+        Args:
+            logs_dir: Directory searched recursively for *.json logs and archives
+        
+        Returns:
+            Counts of 'added', 'updated', 'unchanged', 'removed' (deleted from the
+            directory since the last refresh) and 'invalid' files
+        """
+        counts = dict.fromkeys(('added', 'updated', 'unchanged', 'removed', 'invalid'), 0)
+        with self._lock:
+            known = {path: (mtime, size, sha256) for path, mtime, size, sha256 in
+                     self.conn.execute("SELECT path, mtime, size, sha256 FROM files")}
+            root = Path(logs_dir).resolve()
+            seen = set()
+            for path in sorted(root.rglob('*.json')):
+                key = str(path)
+                seen.add(key)
+                stat = path.stat()
+                indexed = known.get(key)
+                if indexed is not None and indexed[0] == stat.st_mtime and indexed[1] == stat.st_size:
+                    counts['unchanged'] += 1
+                    continue
+                
+                data = path.read_bytes()
+                sha256 = hashlib.sha256(data).hexdigest()
+                if indexed is not None and indexed[2] == sha256:
+                    # Touched but not changed
+                    self.conn.execute("UPDATE files SET mtime = ?, size = ? WHERE path = ?",
+                                      (stat.st_mtime, stat.st_size, key))
+                    counts['unchanged'] += 1
+                    continue
+                
+                error = self._ingest(key, path.stem, lambda: InterviewLog.model_validate(json.loads(data)),
+                                     stat.st_mtime, stat.st_size, sha256)
+                if error is not None:
+                    counts['invalid'] += 1
+                else:
+                    counts['updated' if indexed is not None else 'added'] += 1
+            
+            log_names = {Path(key).stem for key in seen}
+            for path in sorted(root.rglob(f'*{ARCHIVE_SUFFIX}')):
+                self._refresh_archive(path, known, seen, counts, log_names)
+            
+            # Logs indexed from other directories are left alone
+            for key in known.keys() - seen:
+                if not Path(key).is_relative_to(root):
+                    continue
+                self.conn.execute("DELETE FROM files WHERE path = ?", (key,))
+                counts['removed'] += 1
+            self.conn.commit()
+        return counts
+    
+    def _refresh_archive(self, path: Path, known: Dict[str, Tuple], seen: Set[str], counts: Dict[str, int],
+                         log_names: Set[str]):
+        stat = path.stat()
+        try:
+            reader = ArchiveReader(str(path))
+        except ValueError:
+            # Left unrecorded: opening an archive reads only its header and index
+            counts['invalid'] += 1
+            return
+        
+        for name, entry in reader.entries.items():
+            if name in log_names:
+                continue
+            key = f"{path}#{name}"
+            seen.add(key)
+            checksum = f"{entry['crc32']:08x}"
+            previous = known.get(key)
+            if previous is not None and previous[2] == checksum:
+                if previous[:2] != (stat.st_mtime, stat.st_size):
+                    self.conn.execute("UPDATE files SET mtime = ?, size = ? WHERE path = ?",
+                                      (stat.st_mtime, stat.st_size, key))
+                counts['unchanged'] += 1
+                continue
+            error = self._ingest(key, name, lambda: reader.load(name), stat.st_mtime, stat.st_size, checksum)
+            if error is not None:
+                counts['invalid'] += 1
+            else:
+                counts['updated' if previous is not None else 'added'] += 1
+    
+    def _ingest(self, path: str, name: str, load: Callable[[], InterviewLog],
+                mtime: float, size: int, sha256: str) -> Optional[str]:
+        # Replacing the file row drops the old session and its rows (ON DELETE CASCADE)
+        self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+        try:
+            log = load()
+        except ValueError as e:
+            error = str(e).splitlines()[0]
+            self.conn.execute("INSERT INTO files (path, mtime, size, sha256, error) VALUES (?, ?, ?, ?, ?)",
+                              (path, mtime, size, sha256, error))
+            return error
+        
+        self.conn.execute("INSERT INTO files (path, mtime, size, sha256) VALUES (?, ?, ?, ?)",
+                          (path, mtime, size, sha256))
+        profile = log.candidate_profile
+        position = profile.position if profile else ''
+        scored = list(scored_turns(log.turns, get_position_topics(position)))
+        avg_score = sum(score for _, score, _, _ in scored) / len(scored) if scored else None
+        started = log_started_at(name, mtime)
+        
+        session_id = self.conn.execute(
+            "INSERT INTO sessions (path, participant, position, grade, started_at, turns, avg_score) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, log.participant_name, position, profile.grade if profile else '',
+             started.isoformat(sep=' ', timespec='seconds'), len(log.turns), avg_score)
+        ).lastrowid
+        
+        question = ''
+        turn_rows = []
+        for turn in log.turns:
+            observer = turn.observer_result
+            turn_rows.append((session_id, turn.turn_id, question, turn.user_message,
+                              observer.next_topic if observer else None,
+                              observer.difficulty_change if observer else None,
+                              int((turn.performance_metrics or {}).get('degrade_level', 0))))
+            question = turn.agent_visible_message
+        self.conn.executemany("INSERT OR REPLACE INTO turns VALUES (?, ?, ?, ?, ?, ?, ?)", turn_rows)
+        
+        topic_scores: Dict[str, List[float]] = {}
+        score_rows = []
+        for turn, score, difficulty, topic in scored:
+            correctness = turn.evaluator_result.correctness if turn.evaluator_result else None
+            score_rows.append((session_id, turn.turn_id, score, correctness, difficulty, topic))
+            topic_scores.setdefault(topic, []).append(score)
+        self.conn.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?)", score_rows)
+        self.conn.executemany(
+            "INSERT INTO topics VALUES (?, ?, ?, ?)",
+            [(session_id, topic, len(scores), sum(scores) / len(scores)) for topic, scores in topic_scores.items()]
+        )
+        
+        feedback = log.final_feedback
+        if feedback is not None:
+            self.conn.execute(
+                "INSERT INTO final_feedback VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, feedback.grade, feedback.hiring_recommendation, feedback.confidence_score,
+                 json.dumps(feedback.confirmed_skills, ensure_ascii=False), len(feedback.knowledge_gaps))
+            )
+        return None
+    
+    def aggregate(self, group_by: str = 'position', since: Optional[str] = None,
+                  position: Optional[str] = None) -> List[Tuple]:
+        """Sessions and scores grouped by one key.
+        
+        Args:
+            group_by: One of GROUPS
+            since: Only sessions started at or after this ISO date
+            position: Only sessions for positions containing this text
+        
+        Returns:
+            Rows of (group, sessions, answers, avg score, hire rate); hire rate
+            is the share of reported sessions recommended Hire or Strong Hire
+        
+        Raises:
+            ValueError: Unknown group or since is not an ISO date
+        """
+        if group_by not in self.GROUPS:
+            raise ValueError(f"Unknown group: {group_by} (expected one of {', '.join(self.GROUPS)})")
+        where, params = [], []
+        if since:
+            # started_at is compared as text, so anything but a date would silently match nothing
+            try:
+                since = date.fromisoformat(since).isoformat()
+            except ValueError:
+                raise ValueError(f"Invalid date: {since} (expected YYYY-MM-DD)") from None
+            where.append("s.started_at >= ?")
+            params.append(since)
+        if position:
+            where.append("s.position LIKE ?")
+            params.append(f"%{position}%")
+        # Per (session, group) first, so each session counts once in its group's hire rate
+        query = f"""
+            WITH per_session AS (
+                SELECT s.id, {self.GROUPS[group_by]} AS grp, COUNT(sc.score) AS answers,
+                       SUM(sc.score) AS total,
+                       CASE WHEN f.hiring_recommendation IS NULL THEN NULL
+                            WHEN f.hiring_recommendation LIKE '%No Hire%' THEN 0.0 ELSE 1.0 END AS hired
+                FROM sessions s
+                LEFT JOIN scores sc ON sc.session_id = s.id
+                LEFT JOIN final_feedback f ON f.session_id = s.id
+                {'WHERE ' + ' AND '.join(where) if where else ''}
+                GROUP BY s.id, grp
+            )
+            SELECT grp, COUNT(DISTINCT id), SUM(answers), SUM(total) / NULLIF(SUM(answers), 0), AVG(hired)
+            FROM per_session
+            GROUP BY grp
+            ORDER BY grp
+        """
+        with self._lock:
+            return self.conn.execute(query, params).fetchall()
+    
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    
+    def close(self):
+        self.conn.close()
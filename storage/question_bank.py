@@ -0,0 +1,206 @@
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from models.schemas import BankQuestion
+from models.llm_factory import LLMProvider
+from core.prompts import QUESTION_BANK_PROMPT
+
+
+class QuestionBank:
+    """SQLite question bank indexed by (position family, topic, difficulty)."""
+    
+    def __init__(self, filepath: str):
+        self.filepath = Path(filepath)
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        # Read-mostly store shared by the workflow and the offline builder
+        self.conn = sqlite3.connect(str(self.filepath), check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS questions (
+                id INTEGER PRIMARY KEY,
+                position_family TEXT NOT NULL,
+                topic TEXT NOT NULL,
+                difficulty INTEGER NOT NULL,
+                question TEXT NOT NULL,
+                reference_answer TEXT NOT NULL,
+                UNIQUE (position_family, topic, difficulty, question)
+            );
+            CREATE INDEX IF NOT EXISTS idx_questions_cell
+                ON questions (position_family, topic, difficulty);
+        """)
+    
+    @classmethod
+    def open_existing(cls, filepath: str) -> Optional['QuestionBank']:
+        """Open a bank only if it has been built.
+        
+        Args:
+            filepath: Path to the bank file
+        
+        Returns:
+            QuestionBank or None if the file does not exist
+        """
+        if not Path(filepath).exists():
+            return None
+        return cls(filepath)
+    
+    def add_question(self, question: BankQuestion) -> bool:
+        """Add a question, ignoring exact duplicates.
+        
+        Args:
+            question: Question to store
+        
+        Returns:
+            True if the question was inserted
+        """
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO questions "
+            "(position_family, topic, difficulty, question, reference_answer) VALUES (?, ?, ?, ?, ?)",
+            (question.position_family, question.topic, question.difficulty,
+             question.question, question.reference_answer)
+        )
+        self.conn.commit()
+        return cursor.rowcount > 0
+    
+    def get_question(self, position_family: str, topic: str, difficulty: int,
+                     exclude_ids: Iterable[int] = ()) -> Optional[BankQuestion]:
+        """Get an unused question for a cell.
+        
+        Args:
+            position_family: Position family
+            topic: Bank topic
+            difficulty: Difficulty level 1-5
+            exclude_ids: Question ids already asked in this session
+        
+        Returns:
+            BankQuestion or None if the cell is exhausted
+        """
+        exclude = list(exclude_ids)
+        query = ("SELECT id, position_family, topic, difficulty, question, reference_answer "
+                 "FROM questions WHERE position_family = ? AND topic = ? AND difficulty = ?")
+        params: List = [position_family, topic, difficulty]
+        if exclude:
+            query += f" AND id NOT IN ({', '.join('?' * len(exclude))})"
+            params.extend(exclude)
+        query += " ORDER BY RANDOM() LIMIT 1"
+        
+        row = self.conn.execute(query, params).fetchone()
+        return self._to_question(row) if row is not None else None
+    
+    def get_question_by_id(self, question_id: int) -> Optional[BankQuestion]:
+        """Get a question by id, e.g. one named in a log's internal thoughts.
+        
+        Args:
+            question_id: Question id
+        
+        Returns:
+            BankQuestion or None if the bank has no such question
+        """
+        row = self.conn.execute(
+            "SELECT id, position_family, topic, difficulty, question, reference_answer FROM questions WHERE id = ?",
+            (question_id,)
+        ).fetchone()
+        return self._to_question(row) if row is not None else None
+    
+    @staticmethod
+    def _to_question(row: tuple) -> BankQuestion:
+        return BankQuestion(
+            id=row[0],
+            position_family=row[1],
+            topic=row[2],
+            difficulty=row[3],
+            question=row[4],
+            reference_answer=row[5]
+        )
+    
+    def get_topics(self, position_family: str) -> List[str]:
+        """Get topics available for a position family.
+        
+        Args:
+            position_family: Position family
+        
+        Returns:
+            List of topic names
+        """
+        rows = self.conn.execute(
+            "SELECT DISTINCT topic FROM questions WHERE position_family = ?",
+            (position_family,)
+        ).fetchall()
+        return [row[0] for row in rows]
+    
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+    
+    def build(self, llm: LLMProvider, topics_by_family: Dict[str, List[str]],
+              per_cell: int = 3, difficulties: Iterable[int] = range(1, 6)) -> int:
+        """Generate questions offline for every (family, topic, difficulty) cell.
+        
+        Cells that already hold per_cell questions are skipped, so an
+        interrupted build can be resumed.
+        
+        Args:
+            llm: Provider used to write questions and reference answers
+            topics_by_family: Topics to cover for each position family
+            per_cell: Questions per cell
+            difficulties: Difficulty levels to generate
+        
+        Returns:
+            Number of questions added
+        """
+        schema = {
+            'type': 'object',
+            'properties': {
+                'questions': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'question': {'type': 'string'},
+                            'reference_answer': {'type': 'string'}
+                        },
+                        'required': ['question', 'reference_answer']
+                    }
+                }
+            },
+            'required': ['questions']
+        }
+        
+        added = 0
+        for family, topics in topics_by_family.items():
+            for topic in topics:
+                for difficulty in difficulties:
+                    existing = self.conn.execute(
+                        "SELECT COUNT(*) FROM questions "
+                        "WHERE position_family = ? AND topic = ? AND difficulty = ?",
+                        (family, topic, difficulty)
+                    ).fetchone()[0]
+                    if existing >= per_cell:
+                        continue
+                    
+                    prompt = QUESTION_BANK_PROMPT.format(
+                        count=per_cell - existing,
+                        position_family=family,
+                        topic=topic,
+                        difficulty=difficulty
+                    )
+                    try:
+                        data = llm.generate_json(prompt=prompt, schema=schema,
+                                                 temperature=0.7, max_tokens=1500)
+                    except ValueError as e:
+                        print(f"  {family}/{topic}/{difficulty}: пропущено ({e})")
+                        continue
+                    
+                    for item in data.get('questions', []):
+                        if not isinstance(item, dict) or not item.get('question'):
+                            continue
+                        added += self.add_question(BankQuestion(
+                            position_family=family,
+                            topic=topic,
+                            difficulty=difficulty,
+                            question=str(item['question']).strip(),
+                            reference_answer=str(item.get('reference_answer', '')).strip()
+                        ))
+                    print(f"  {family}/{topic}/{difficulty}: готово")
+        
+        return added
+    
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,113 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+from utils.text_fingerprint import normalize_tokens, question_fingerprint, hamming_distance
+
+
+class ReferenceAnswerStore:
+    """Persistent reference answers keyed on a SimHash of the normalised question.
+    
+    The 64-bit fingerprint is split into eight 8-bit bands stored in
+    indexed columns: two fingerprints within Hamming distance 7 share at
+    least one band, so a lookup only scans rows matching some band.
+    """
+    
+    BANDS = 8
+    BAND_BITS = 8
+    MIN_TOKENS = 3
+    
+    def __init__(self, filepath: str, max_distance: int = 6):
+        self.filepath = Path(filepath)
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.filepath), check_same_thread=False)
+        band_columns = ''.join(f"band{i} INTEGER NOT NULL, " for i in range(self.BANDS))
+        band_indexes = ''.join(
+            f"CREATE INDEX IF NOT EXISTS idx_ref_band{i} ON reference_answers (band{i}); "
+            for i in range(self.BANDS)
+        )
+        self.conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS reference_answers (
+                fingerprint TEXT PRIMARY KEY,
+                {band_columns}
+                question TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            );
+            {band_indexes}
+        """)
+    
+    def _bands(self, fingerprint: int) -> list:
+        mask = (1 << self.BAND_BITS) - 1
+        return [(fingerprint >> (i * self.BAND_BITS)) & mask for i in range(self.BANDS)]
+    
+    def _fingerprint(self, question: str) -> Optional[int]:
+        # Very short questions carry too little signal to match safely
+        if len(normalize_tokens(question)) < self.MIN_TOKENS:
+            return None
+        return question_fingerprint(question)
+    
+    def lookup(self, question: str) -> Optional[str]:
+        """Find the reference answer of a near-identical question.
+        
+        Args:
+            question: Interviewer question
+        
+        Returns:
+            Reference answer or None
+        """
+        fingerprint = self._fingerprint(question)
+        if fingerprint is None:
+            return None
+        
+        bands = self._bands(fingerprint)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT fingerprint, answer FROM reference_answers WHERE "
+                + " OR ".join(f"band{i} = ?" for i in range(self.BANDS)),
+                bands
+            ).fetchall()
+            
+            best = None
+            for stored, answer in rows:
+                distance = hamming_distance(fingerprint, int(stored))
+                if distance <= self.max_distance and (best is None or distance < best[0]):
+                    best = (distance, stored, answer)
+            
+            if best is None:
+                return None
+            self.conn.execute(
+                "UPDATE reference_answers SET hits = hits + 1 WHERE fingerprint = ?", (best[1],)
+            )
+            self.conn.commit()
+        return best[2]
+    
+    def save(self, question: str, answer: str):
+        """Store the reference answer for a question.
+        
+        Args:
+            question: Interviewer question
+            answer: Correct answer produced by the Evaluator
+        """
+        fingerprint = self._fingerprint(question)
+        if fingerprint is None or not answer.strip():
+            return
+        
+        with self._lock:
+            columns = ', '.join(f"band{i}" for i in range(self.BANDS))
+            self.conn.execute(
+                f"INSERT OR IGNORE INTO reference_answers (fingerprint, {columns}, question, answer) "
+                f"VALUES ({', '.join('?' * (self.BANDS + 3))})",
+                # Stored as text: SQLite integers are signed 64-bit
+                [str(fingerprint)] + self._bands(fingerprint) + [question, answer.strip()]
+            )
+            self.conn.commit()
+    
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM reference_answers").fetchone()[0]
+    
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,72 @@
+import zlib
+import pytest
+from pathlib import Path
+from models.schemas import InterviewLog
+from utils.archive import ArchiveReader, migrate_logs
+
+
+SAMPLE_LOG = next((Path(__file__).parents[1] / 'logs').glob('interview_*.json'))
+
+
+def _write_logs(directory: Path, count: int) -> int:
+    # Sessions of one month that share prompts and topics, like a real month of interviews
+    log = InterviewLog.model_validate_json(SAMPLE_LOG.read_bytes())
+    directory.mkdir()
+    total = 0
+    for i in range(count):
+        turns = log.turns[i % len(log.turns):] + log.turns[:i % len(log.turns)]
+        variant = log.model_copy(update={'participant_name': f"Кандидат {i}", 'turns': turns})
+        data = variant.model_dump_json(indent=2).encode('utf-8')
+        (directory / f"interview_20260130_{i:06d}_c{i}.json").write_bytes(data)
+        total += len(zlib.compress(data, 9))
+    return total
+
+
+def test_archive_smaller_than_zlib_per_file(tmp_path):
+    zlib_total = _write_logs(tmp_path / 'logs', 20)
+    counts = migrate_logs(str(tmp_path / 'logs'), str(tmp_path / 'archive'))
+    archive = tmp_path / 'archive' / '2026-01.ila'
+    
+    assert counts['archived'] == 20
+    assert counts['bytes_after'] == archive.stat().st_size
+    assert archive.stat().st_size < zlib_total
+    assert len(ArchiveReader(str(archive)).names()) == 20
+
+
+def test_single_session_has_no_dictionary(tmp_path):
+    _write_logs(tmp_path / 'logs', 1)
+    counts = migrate_logs(str(tmp_path / 'logs'), str(tmp_path / 'archive'))
+    archive = tmp_path / 'archive' / '2026-01.ila'
+    
+    assert ArchiveReader(str(archive)).zdict == b''
+    assert counts['bytes_after'] == archive.stat().st_size
+
+
+def test_unfinished_interview_waits_for_its_report(tmp_path):
+    _write_logs(tmp_path / 'logs', 1)
+    path = next((tmp_path / 'logs').glob('*.json'))
+    log = InterviewLog.model_validate_json(path.read_bytes())
+    path.write_text(log.model_copy(update={'final_feedback': None}).model_dump_json(), encoding='utf-8')
+    path.with_suffix('.checkpoint.jsonl').write_text('{}\n', encoding='utf-8')
+    counts = migrate_logs(str(tmp_path / 'logs'), str(tmp_path / 'archive'), remove=True)
+    
+    assert counts['unfinished'] == 1 and counts['archived'] == 0
+    assert path.exists()
+    
+    path.write_bytes(log.model_dump_json().encode('utf-8'))
+    counts = migrate_logs(str(tmp_path / 'logs'), str(tmp_path / 'archive'), remove=True)
+    assert counts['archived'] == 1
+    assert not path.exists() and not path.with_suffix('.checkpoint.jsonl').exists()
+
+
+def test_streamed_turns_check_the_frame_crc(tmp_path):
+    _write_logs(tmp_path / 'logs', 1)
+    migrate_logs(str(tmp_path / 'logs'), str(tmp_path / 'archive'))
+    reader = ArchiveReader(str(tmp_path / 'archive' / '2026-01.ila'))
+    name = reader.names()[0]
+    turns = list(reader.iter_turns(name))
+    
+    assert turns == reader.load(name).turns
+    reader.entries[name]['crc32'] ^= 1
+    with pytest.raises(ValueError, match="Corrupt frame"):
+        list(reader.iter_turns(name))
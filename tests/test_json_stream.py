@@ -0,0 +1,20 @@
+from utils.json_stream import StreamingJSONParser, repair_json
+
+
+def test_brace_in_prose_before_object():
+    text = 'Итог {кратко} ниже: {"grade": "Middle", "hiring_recommendation": "Hire"}'
+    parser = StreamingJSONParser()
+    for i in range(0, len(text), 5):
+        parser.feed(text[i:i + 5])
+    
+    assert parser.finish() == {'grade': 'Middle', 'hiring_recommendation': 'Hire'}
+    assert repair_json(text) == {'grade': 'Middle', 'hiring_recommendation': 'Hire'}
+
+
+def test_object_start_split_across_chunks():
+    parser = StreamingJSONParser()
+    parser.feed('Отчет: {  ')
+    parser.feed('\n"grade": "Junior"}')
+    
+    assert parser.complete
+    assert parser.finish() == {'grade': 'Junior'}
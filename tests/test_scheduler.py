@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+from models.scheduler import LLMScheduler, Priority
+
+KEY = ('Provider', 'model')
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def _lane(scheduler: LLMScheduler) -> dict:
+    return scheduler.get_metrics()['lanes'].get(f"{KEY[0]}:{KEY[1]}", {'running': 0, 'waiting': 0})
+
+
+def _start(scheduler: LLMScheduler, priority: Priority, session: str, label: str,
+           order: list, release: threading.Event) -> threading.Thread:
+    def call():
+        with scheduler.slot(KEY, priority, session):
+            order.append(label)
+            release.wait()
+    thread = threading.Thread(target=call)
+    thread.start()
+    return thread
+
+
+def test_interactive_overtakes_queued_background():
+    scheduler = LLMScheduler(max_concurrency=1, interactive_reserve=0)
+    order, gate, release = [], threading.Event(), threading.Event()
+    threads = [_start(scheduler, Priority.BACKGROUND, 'busy', 'running', order, gate)]
+    _wait_for(lambda: order == ['running'])
+    for i in range(3):
+        threads.append(_start(scheduler, Priority.BACKGROUND, f"b{i}", f"background {i}", order, release))
+    _wait_for(lambda: _lane(scheduler)['waiting'] == 3)
+    threads.append(_start(scheduler, Priority.INTERACTIVE, 'candidate', 'interactive', order, release))
+    _wait_for(lambda: _lane(scheduler)['waiting'] == 4)
+    
+    release.set()
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+    assert order == ['running', 'interactive', 'background 0', 'background 1', 'background 2']
+
+
+def test_sessions_take_turns_within_a_class():
+    scheduler = LLMScheduler(max_concurrency=1, interactive_reserve=0)
+    order, gate, release = [], threading.Event(), threading.Event()
+    threads = [_start(scheduler, Priority.STANDARD, 'busy', 'running', order, gate)]
+    _wait_for(lambda: order == ['running'])
+    for i in range(3):
+        threads.append(_start(scheduler, Priority.STANDARD, 'greedy', f"greedy {i}", order, release))
+        _wait_for(lambda: _lane(scheduler)['waiting'] == i + 1)
+    threads.append(_start(scheduler, Priority.STANDARD, 'single', 'single', order, release))
+    _wait_for(lambda: _lane(scheduler)['waiting'] == 4)
+    
+    release.set()
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+    assert order.index('single') < order.index('greedy 1')
+
+
+def test_reserved_slot_holds_for_interactive():
+    scheduler = LLMScheduler(max_concurrency=3, interactive_reserve=1)
+    order, release = [], threading.Event()
+    threads = [_start(scheduler, Priority.BACKGROUND, f"b{i}", f"background {i}", order, release) for i in range(4)]
+    _wait_for(lambda: _lane(scheduler)['running'] == 2 and _lane(scheduler)['waiting'] == 2)
+    
+    started = threading.Event()
+    def interactive():
+        with scheduler.slot(KEY, Priority.INTERACTIVE, 'candidate'):
+            started.set()
+    threads.append(threading.Thread(target=interactive))
+    threads[-1].start()
+    assert started.wait(5)
+    assert _lane(scheduler)['running'] == 2
+    
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(order) == 4
+
+
+def test_async_calls_queue_behind_blocking_ones():
+    scheduler = LLMScheduler(max_concurrency=1, interactive_reserve=0)
+    order, gate = [], threading.Event()
+    holder = _start(scheduler, Priority.BACKGROUND, 'busy', 'running', order, gate)
+    _wait_for(lambda: order == ['running'])
+    
+    async def call(priority: Priority, label: str):
+        async with scheduler.aslot(KEY, priority, label):
+            order.append(label)
+            await asyncio.sleep(0)
+    
+    async def main():
+        background = asyncio.create_task(call(Priority.BACKGROUND, 'background'))
+        cancelled = asyncio.create_task(call(Priority.STANDARD, 'cancelled'))
+        interactive = asyncio.create_task(call(Priority.INTERACTIVE, 'interactive'))
+        while _lane(scheduler)['waiting'] < 3:
+            await asyncio.sleep(0.005)
+        cancelled.cancel()
+        while _lane(scheduler)['waiting'] > 2:
+            await asyncio.sleep(0.005)
+        gate.set()
+        await asyncio.wait_for(asyncio.gather(background, interactive), 5)
+    
+    asyncio.run(main())
+    holder.join(5)
+    assert order == ['running', 'interactive', 'background']
+    assert _lane(scheduler) == {'limit': 1, 'reserve': 0, 'running': 0, 'waiting': 0}
@@ -0,0 +1,33 @@
+import asyncio
+from models.llm_factory import LLMProvider
+from core.steps import Emit, LLMCall, arun_steps, run_steps
+
+
+class _Provider(LLMProvider):
+    def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=1000, reasoning=None):
+        return f"ответ на {prompt}"
+    
+    def generate_json(self, prompt, schema, system_prompt=None, temperature=0.3, max_tokens=500, reasoning=None):
+        raise ValueError("invalid JSON")
+
+
+def _steps(llm: LLMProvider):
+    try:
+        data = yield LLMCall(llm, 'generate_json', prompt='оценка', schema={})
+    except ValueError:
+        data = None
+    yield Emit("Хорошо. ")
+    text = yield LLMCall(llm, 'stream', prompt='вопрос')
+    return data, text
+
+
+def test_blocking_and_async_drivers_agree():
+    blocking_tokens, async_tokens = [], []
+    
+    async def on_token(token: str):
+        async_tokens.append(token)
+    
+    expected = (None, "ответ на вопрос")
+    assert run_steps(_steps(_Provider()), blocking_tokens.append) == expected
+    assert asyncio.run(arun_steps(_steps(_Provider()), on_token)) == expected
+    assert ''.join(blocking_tokens) == ''.join(async_tokens) == "Хорошо. ответ на вопрос"
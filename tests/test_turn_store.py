@@ -0,0 +1,38 @@
+import pytest
+from models.schemas import Turn
+from memory.turn_store import TurnStore
+
+
+def _turn(turn_id: int) -> Turn:
+    return Turn(turn_id=turn_id, agent_visible_message=f"Вопрос {turn_id}", user_message=f"Ответ {turn_id}",
+                internal_thoughts='', performance_metrics={'score': turn_id / 10})
+
+
+def test_spilled_turns_read_back(tmp_path):
+    store = TurnStore(hot_size=2, spill_dir=str(tmp_path))
+    for turn_id in range(1, 6):
+        store.append(_turn(turn_id))
+    
+    assert store.spilled_count == 3
+    assert len(store) == 5
+    assert [turn.to_model() for turn in store] == [_turn(turn_id) for turn_id in range(1, 6)]
+    assert store[1].to_model() == _turn(2)
+    assert [turn.turn_id for turn in store[-3:]] == [3, 4, 5]
+    store.close()
+
+
+def test_closed_store_refuses_spilled_turns(tmp_path):
+    store = TurnStore(hot_size=2, spill_dir=str(tmp_path))
+    for turn_id in range(1, 4):
+        store.append(_turn(turn_id))
+    store.close()
+    
+    assert store[-1].turn_id == 3
+    with pytest.raises(ValueError, match="closed"):
+        store[0]
+    with pytest.raises(ValueError, match="closed"):
+        store.append(_turn(4))
+    
+    store.clear()
+    store.append(_turn(1))
+    assert len(store) == 1
@@ -0,0 +1,513 @@
+"""Compressed interview archive: many sessions in one seekable file.
+
+Layout of an archive (*.ila):
+    header  MAGIC, format version, codec, preset dictionary size, preset
+            dictionary (zlib-compressed since version 2)
+    frames  one compressed frame per session
+    index   compressed JSON list of session entries (name, offset, size, ...)
+    footer  index offset and size, END_MAGIC
+
+A frame is JSON Lines: the session header (participant, profile, turn
+count), one line per turn, then the final feedback. Strings are
+dictionary coded per session: a string of at least MIN_CODED_LENGTH
+characters is numbered the first time it is written and a repeat is
+written as {"@": [id]}; a long string that contains strings numbered on
+the same line (internal_thoughts repeats the Observer's analysis, the
+Evaluator's comment and the strategy) is written as {"@": [parts]} of
+literals and ids. Nested objects are written before the strings of their
+parent, so the decoder has numbered a string before it is referenced.
+"""
+
+import json
+import lzma
+import os
+import re
+import struct
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from models.schemas import InterviewLog, Turn
+from config import settings
+
+
+MAGIC = b'ILAR'
+END_MAGIC = b'ILAE'
+ARCHIVE_VERSION = 2
+ARCHIVE_SUFFIX = '.ila'
+CODECS = {'zlib': 1, 'lzma': 2}
+
+MIN_CODED_LENGTH = 8
+MIN_SPLICE_LENGTH = 24
+ZDICT_SIZE = 32 * 1024
+ZDICT_SAMPLE = 16
+CHUNK_SIZE = 64 * 1024
+
+_HEADER = struct.Struct('<4sBBI')
+_FOOTER = struct.Struct('<QQ4s')
+
+# interview_YYYYMMDD_HHMMSS_<name>.json, as written by main.py
+LOG_TIMESTAMP = re.compile(r'(\d{8}_\d{6})')
+
+
+def log_started_at(name: str, mtime: float) -> datetime:
+    """Start time of a session: the log name's timestamp, else the file's mtime."""
+    match = LOG_TIMESTAMP.search(name)
+    if match:
+        try:
+            return datetime.strptime(match.group(1), '%Y%m%d_%H%M%S')
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(mtime)
+
+
+def is_archive(filepath: str) -> bool:
+    with open(filepath, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class StringCoder:
+    """Per-session string table shared by the encoder and the decoder."""
+    
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+        self._line_start = 0
+    
+    def _add(self, value: str):
+        if len(value) >= MIN_CODED_LENGTH and value not in self.ids:
+            self.ids[value] = len(self.strings)
+            self.strings.append(value)
+    
+    def encode_line(self, value: Any) -> Any:
+        """Code one JSON line; strings numbered on it can be spliced into its longer strings."""
+        self._line_start = len(self.strings)
+        return self._encode(value)
+    
+    def _encode(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return self._encode_string(value)
+        if isinstance(value, dict):
+            if len(value) == 1 and isinstance(value.get('@'), list):
+                raise ValueError("Object with the reserved key '@' cannot be archived")
+            # False sorts first: nested values before strings, order kept otherwise
+            items = sorted(value.items(), key=lambda item: isinstance(item[1], str))
+            return {key: self._encode(item) for key, item in items}
+        if isinstance(value, list):
+            return [self._encode(item) for item in value]
+        return value
+    
+    def _encode_string(self, value: str) -> Any:
+        index = self.ids.get(value)
+        if index is not None:
+            return {'@': [index]}
+        
+        parts: List[Any] = [value]
+        if len(value) >= 2 * MIN_SPLICE_LENGTH:
+            candidates = sorted(range(self._line_start, len(self.strings)),
+                                key=lambda i: len(self.strings[i]), reverse=True)
+            for index in candidates:
+                known = self.strings[index]
+                if len(known) < MIN_SPLICE_LENGTH:
+                    break
+                parts = [piece for part in parts for piece in self._split(part, known, index)]
+        self._add(value)
+        if all(isinstance(part, str) for part in parts):
+            return value
+        return {'@': parts}
+    
+    @staticmethod
+    def _split(part: Any, known: str, index: int) -> List[Any]:
+        if not isinstance(part, str) or known not in part:
+            return [part]
+        pieces = []
+        for i, piece in enumerate(part.split(known)):
+            if i:
+                pieces.append(index)
+            if piece:
+                pieces.append(piece)
+        return pieces
+    
+    def decode(self, value: Any) -> Any:
+        if isinstance(value, str):
+            self._add(value)
+            return value
+        if isinstance(value, dict):
+            parts = value.get('@') if len(value) == 1 else None
+            if not isinstance(parts, list):
+                return {key: self.decode(item) for key, item in value.items()}
+            if len(parts) == 1 and isinstance(parts[0], int):
+                return self.strings[parts[0]]
+            text = ''.join(self.strings[part] if isinstance(part, int) else part for part in parts)
+            self._add(text)
+            return text
+        if isinstance(value, list):
+            return [self.decode(item) for item in value]
+        return value
+
+
+def encode_session(log: InterviewLog) -> bytes:
+    """Uncompressed frame payload of one session."""
+    data = log.model_dump(mode='json')
+    lines = [{'participant_name': data['participant_name'], 'candidate_profile': data['candidate_profile'],
+              'turns': len(data['turns'])}, *data['turns'], data['final_feedback']]
+    coder = StringCoder()
+    return ''.join(json.dumps(coder.encode_line(line), ensure_ascii=False, separators=(',', ':')) + '\n'
+                   for line in lines).encode('utf-8')
+
+
+def _deflate(payload: bytes, level: int, zdict: bytes = b'') -> bytes:
+    compressor = zlib.compressobj(level, zdict=zdict) if zdict else zlib.compressobj(level)
+    return compressor.compress(payload) + compressor.flush()
+
+
+def build_zdict(payloads: List[bytes], level: int = 9) -> bytes:
+    """Preset zlib dictionary from sample payloads (most recent bytes weigh most).
+    
+    The archive stores the dictionary, so it is kept only if the sample's
+    frames plus the compressed dictionary come out smaller than the frames
+    without one; a single session never pays for a dictionary built from it.
+    
+    Args:
+        payloads: encode_session() payloads of the first sessions of an archive
+        level: zlib level the frames will be written with
+    
+    Returns:
+        Dictionary, or b'' if it does not pay for itself
+    """
+    zdict = b''.join(payloads)[-ZDICT_SIZE:]
+    with_zdict = len(zlib.compress(zdict, 9)) + sum(len(_deflate(payload, level, zdict)) for payload in payloads)
+    without = sum(len(_deflate(payload, level)) for payload in payloads)
+    return zdict if with_zdict < without else b''
+
+
+class ArchiveReader:
+    """Random access to the sessions of an archive.
+    
+    Opening reads only the header, the footer and the index; a session's
+    frame is read and inflated in CHUNK_SIZE steps as its turns are
+    consumed, and its CRC is checked once it has been read to the end
+    (when streaming turns, once the last turn has been consumed).
+    """
+    
+    def __init__(self, filepath: str):
+        self.filepath = Path(filepath)
+        with open(self.filepath, 'rb') as f:
+            head = f.read(_HEADER.size)
+            if len(head) < _HEADER.size:
+                raise ValueError(f"Not an interview archive: {filepath}")
+            magic, version, codec, zdict_size = _HEADER.unpack(head)
+            if magic != MAGIC:
+                raise ValueError(f"Not an interview archive: {filepath}")
+            if version not in (1, ARCHIVE_VERSION):
+                raise ValueError(f"Unsupported archive version: {version}")
+            codecs = {number: name for name, number in CODECS.items()}
+            if codec not in codecs:
+                raise ValueError(f"Unknown archive codec: {codec}")
+            self.codec = codecs[codec]
+            self.zdict = f.read(zdict_size)
+            if version > 1 and self.zdict:
+                try:
+                    self.zdict = zlib.decompress(self.zdict)
+                except zlib.error as e:
+                    raise ValueError(f"Corrupt archive dictionary in {filepath}: {e}") from None
+            self.data_start = _HEADER.size + zdict_size
+            
+            f.seek(0, os.SEEK_END)
+            if f.tell() < self.data_start + _FOOTER.size:
+                raise ValueError(f"Archive has no index (unfinished write?): {filepath}")
+            f.seek(-_FOOTER.size, os.SEEK_END)
+            self.index_offset, index_size, end = _FOOTER.unpack(f.read(_FOOTER.size))
+            if end != END_MAGIC:
+                raise ValueError(f"Archive has no index (unfinished write?): {filepath}")
+            f.seek(self.index_offset)
+            try:
+                entries = json.loads(zlib.decompress(f.read(index_size)))
+            except zlib.error as e:
+                raise ValueError(f"Corrupt archive index in {filepath}: {e}") from None
+        self.entries: Dict[str, dict] = {entry['name']: entry for entry in entries}
+    
+    def names(self) -> List[str]:
+        return list(self.entries)
+    
+    def _decompressor(self):
+        if self.codec == 'lzma':
+            return lzma.LZMADecompressor()
+        return zlib.decompressobj(zdict=self.zdict) if self.zdict else zlib.decompressobj()
+    
+    def iter_lines(self, name: str) -> Iterator[Any]:
+        """Decoded JSON lines of one session's frame.
+        
+        Args:
+            name: Session name
+        
+        Yields:
+            Session header, turn dicts, then the final feedback (or None)
+        
+        Raises:
+            KeyError: If the archive has no such session
+            ValueError: If the frame is truncated or fails its CRC
+        """
+        entry = self.entries[name]
+        decompressor = self._decompressor()
+        coder = StringCoder()
+        remaining, buffer, crc = entry['size'], b'', 0
+        with open(self.filepath, 'rb') as f:
+            f.seek(entry['offset'])
+            while remaining:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ValueError(f"Truncated frame {name} in {self.filepath}")
+                remaining -= len(chunk)
+                try:
+                    data = decompressor.decompress(chunk)
+                    if not remaining and self.codec == 'zlib':
+                        data += decompressor.flush()
+                except (zlib.error, lzma.LZMAError) as e:
+                    raise ValueError(f"Corrupt frame {name} in {self.filepath}: {e}") from None
+                crc = zlib.crc32(data, crc)
+                *lines, buffer = (buffer + data).split(b'\n')
+                for line in lines:
+                    yield coder.decode(json.loads(line))
+        if buffer or crc != entry['crc32']:
+            raise ValueError(f"Corrupt frame {name} in {self.filepath}")
+    
+    def stream(self, name: str) -> Tuple[InterviewLog, Iterator[Turn]]:
+        """Open one session for streaming.
+        
+        Args:
+            name: Session name
+        
+        Returns:
+            (InterviewLog with the participant and profile but no turns or
+            final feedback, iterator over the turns in order)
+        """
+        lines = self.iter_lines(name)
+        header = next(lines)
+        log = InterviewLog(participant_name=header['participant_name'],
+                           candidate_profile=header['candidate_profile'])
+        return log, self._turns(lines, header['turns'])
+    
+    @staticmethod
+    def _turns(lines: Iterator[Any], count: int) -> Iterator[Turn]:
+        for _ in range(count):
+            yield Turn.model_validate(next(lines))
+        # Read on through the final feedback, so the frame's CRC is checked
+        for _ in lines:
+            pass
+    
+    def iter_turns(self, name: str) -> Iterator[Turn]:
+        """Stream the turns of one session without inflating the rest of it.
+        
+        Args:
+            name: Session name
+        
+        Yields:
+            Turn objects in order
+        """
+        yield from self.stream(name)[1]
+    
+    def load(self, name: str) -> InterviewLog:
+        """Materialise one session.
+        
+        Args:
+            name: Session name
+        
+        Returns:
+            InterviewLog equal to the one archived
+        """
+        header, *rest = self.iter_lines(name)
+        turns, final_feedback = rest[:header['turns']], rest[header['turns']]
+        return InterviewLog(participant_name=header['participant_name'],
+                            candidate_profile=header['candidate_profile'],
+                            turns=turns, final_feedback=final_feedback)
+
+
+class ArchiveWriter:
+    """Appends sessions to an archive, creating it if needed.
+    
+    New frames overwrite the old index, and the index and footer are
+    written by close(), so an archive is a single-writer file that is
+    unreadable between an interrupted append and the next one.
+    """
+    
+    def __init__(self, filepath: str, codec: str = None, zdict: bytes = b'', level: int = 9):
+        """Open an archive for appending.
+        
+        Args:
+            filepath: Archive path
+            codec: 'zlib' or 'lzma' for a new archive (an existing one keeps its codec)
+            zdict: Preset zlib dictionary for a new archive (see build_zdict())
+            level: Compression level (zlib 0-9, lzma preset 0-9)
+        """
+        self.filepath = Path(filepath)
+        self.level = level
+        if self.filepath.exists() and self.filepath.stat().st_size:
+            reader = ArchiveReader(str(self.filepath))
+            self.codec, self.zdict, self.entries = reader.codec, reader.zdict, reader.entries
+            self._file = open(self.filepath, 'r+b')
+            self._file.seek(reader.index_offset)
+            self._file.truncate()
+            return
+        
+        self.codec = codec or settings.ARCHIVE_CODEC
+        if self.codec not in CODECS:
+            raise ValueError(f"Unknown archive codec: {self.codec} (expected one of {', '.join(CODECS)})")
+        self.zdict = zdict if self.codec == 'zlib' else b''
+        self.entries: Dict[str, dict] = {}
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.filepath, 'wb')
+        packed = zlib.compress(self.zdict, 9) if self.zdict else b''
+        self._file.write(_HEADER.pack(MAGIC, ARCHIVE_VERSION, CODECS[self.codec], len(packed)))
+        self._file.write(packed)
+    
+    def __enter__(self) -> 'ArchiveWriter':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _compress(self, payload: bytes) -> bytes:
+        if self.codec == 'lzma':
+            return lzma.compress(payload, preset=self.level)
+        return _deflate(payload, self.level, self.zdict)
+    
+    def add(self, name: str, log: InterviewLog, payload: bytes = None) -> dict:
+        """Append one session.
+        
+        Args:
+            name: Session name, unique within the archive
+            log: Interview log
+            payload: encode_session(log), if already computed
+        
+        Returns:
+            Index entry of the session
+        """
+        if name in self.entries:
+            raise ValueError(f"Session already archived: {name}")
+        payload = payload if payload is not None else encode_session(log)
+        frame = self._compress(payload)
+        profile = log.candidate_profile
+        entry = {
+            'name': name,
+            'offset': self._file.tell(),
+            'size': len(frame),
+            'raw': len(payload),
+            'crc32': zlib.crc32(payload),
+            'turns': len(log.turns),
+            'participant': log.participant_name,
+            'position': profile.position if profile else '',
+            'grade': profile.grade if profile else '',
+            'recommendation': log.final_feedback.hiring_recommendation if log.final_feedback else None
+        }
+        self._file.write(frame)
+        self.entries[name] = entry
+        return entry
+    
+    def close(self):
+        if self._file.closed:
+            return
+        index = zlib.compress(json.dumps(list(self.entries.values()), ensure_ascii=False).encode('utf-8'), 9)
+        offset = self._file.tell()
+        self._file.write(index)
+        self._file.write(_FOOTER.pack(offset, len(index), END_MAGIC))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+
+def migrate_logs(logs_dir: str, archive_dir: str, codec: str = None,
+                 remove: bool = False) -> Dict[str, int]:
+    """Move JSON logs into monthly archives (<archive_dir>/YYYY-MM.ila).
+    
+    Each session is read back from its archive and compared with the
+    original before the original may be removed. A log whose name is
+    already in its month's archive is skipped, so the migration can be
+    rerun as new logs accumulate. A log without a final report that still
+    has a checkpoint is left alone: its interview may still be running or
+    waiting to be resumed, and an archived partial copy would never be
+    replaced.
+    
+    Args:
+        logs_dir: Directory with interview_*.json logs (not searched recursively)
+        archive_dir: Directory for the archives
+        codec: 'zlib' or 'lzma' for new archives (default ARCHIVE_CODEC)
+        remove: Delete each original once its archived copy is verified, and
+            the checkpoint of a finished interview
+    
+    Returns:
+        Counts of 'archived', 'skipped' (already archived), 'unfinished' (left
+        for a later run), 'invalid' (not logs) and 'removed' files, plus 'bytes_before' (the archived logs) and
+        'bytes_after' (what the archives grew by, header and index included)
+    """
+    counts = dict.fromkeys(('archived', 'skipped', 'unfinished', 'invalid', 'removed',
+                            'bytes_before', 'bytes_after'), 0)
+    months: Dict[str, List[Path]] = {}
+    for path in sorted(Path(logs_dir).glob('*.json')):
+        month = log_started_at(path.stem, path.stat().st_mtime).strftime('%Y-%m')
+        months.setdefault(month, []).append(path)
+    
+    for month, paths in months.items():
+        archive_path = Path(archive_dir) / f"{month}{ARCHIVE_SUFFIX}"
+        existing = ArchiveReader(str(archive_path)).entries if archive_path.exists() else {}
+        size = archive_path.stat().st_size if archive_path.exists() else 0
+        writer: Optional[ArchiveWriter] = None
+        sample: List[Tuple[str, InterviewLog, bytes]] = []
+        archived: List[Path] = []
+        try:
+            for path in paths:
+                if path.stem in existing:
+                    counts['skipped'] += 1
+                    continue
+                try:
+                    log = InterviewLog.model_validate_json(path.read_bytes())
+                    payload = encode_session(log)
+                except ValueError:
+                    counts['invalid'] += 1
+                    continue
+                if log.final_feedback is None and path.with_suffix('.checkpoint.jsonl').exists():
+                    counts['unfinished'] += 1
+                    continue
+                archived.append(path)
+                if writer is not None:
+                    writer.add(path.stem, log, payload)
+                    continue
+                # The first sessions of a new archive are held back to build its preset dictionary
+                sample.append((path.stem, log, payload))
+                if len(sample) == ZDICT_SAMPLE:
+                    writer = _flush_sample(archive_path, codec, sample)
+            if writer is None and sample:
+                writer = _flush_sample(archive_path, codec, sample)
+        finally:
+            if writer is not None:
+                writer.close()
+        if not archived:
+            continue
+        counts['bytes_after'] += archive_path.stat().st_size - size
+        
+        reader = ArchiveReader(str(archive_path))
+        for path in archived:
+            log = reader.load(path.stem)
+            if log != InterviewLog.model_validate_json(path.read_bytes()):
+                raise ValueError(f"Archived copy of {path.name} differs from the original")
+            counts['archived'] += 1
+            counts['bytes_before'] += path.stat().st_size
+            if remove:
+                path.unlink()
+                counts['removed'] += 1
+                # A finished interview needs no resume; an unfinished one keeps its checkpoint
+                if log.final_feedback is not None:
+                    path.with_suffix('.checkpoint.jsonl').unlink(missing_ok=True)
+    return counts
+
+
+def _flush_sample(archive_path: Path, codec: Optional[str],
+                  sample: List[Tuple[str, InterviewLog, bytes]]) -> ArchiveWriter:
+    zdict = b''
+    if (codec or settings.ARCHIVE_CODEC) == 'zlib':
+        zdict = build_zdict([payload for _, _, payload in sample])
+    writer = ArchiveWriter(str(archive_path), codec=codec, zdict=zdict)
+    for name, log, payload in sample:
+        writer.add(name, log, payload)
+    sample.clear()
+    return writer
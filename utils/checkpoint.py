@@ -0,0 +1,84 @@
+import json
+import os
+from pathlib import Path
+from typing import List, Tuple
+
+
+CHECKPOINT_VERSION = 1
+
+
+class CheckpointFile:
+    """Append-only JSON Lines snapshot of an interview.
+    
+    The first line is a versioned header; every later line is a record
+    with the scalar workflow state and, for turns, the new Turn only, so
+    each write stays small. Records are fsynced, and a torn last line
+    left by a crash is ignored when loading.
+    """
+    
+    def __init__(self, filepath: str):
+        self.filepath = Path(filepath)
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+    
+    def start(self, header: dict):
+        """Start a new checkpoint, replacing any previous one.
+        
+        Args:
+            header: Session metadata stored in the first line
+        """
+        self._write({'version': CHECKPOINT_VERSION, **header}, mode='w')
+    
+    def discard_torn_tail(self):
+        """Cut a partially written last line so appends start on a fresh line."""
+        with open(self.filepath, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+    
+    def append(self, record: dict):
+        self._write(record, mode='a')
+    
+    def remove(self):
+        """Delete the checkpoint once the interview is finished and fully logged."""
+        self.filepath.unlink(missing_ok=True)
+    
+    def _write(self, record: dict, mode: str):
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        with open(self.filepath, mode, encoding='utf-8') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+    
+    @staticmethod
+    def load(filepath: str) -> Tuple[dict, List[dict]]:
+        """Read a checkpoint.
+        
+        Args:
+            filepath: Checkpoint path
+        
+        Returns:
+            (header, records in write order)
+        
+        Raises:
+            ValueError: If the file is empty, corrupt or of an unsupported version
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            lines = f.read().split('\n')
+        
+        records = []
+        for index, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Only the last line can be torn by a crash mid-write
+                if any(rest.strip() for rest in lines[index + 1:]):
+                    raise ValueError(f"Corrupt checkpoint line {index + 1} in {filepath}")
+        
+        if not records:
+            raise ValueError(f"Empty checkpoint: {filepath}")
+        header = records[0]
+        if header.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {header.get('version')}")
+        return header, records[1:]
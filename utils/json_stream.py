@@ -0,0 +1,231 @@
+"""Tolerant incremental JSON parsing for streamed LLM responses."""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# A brace in prose ("Итог {кратко}") is not an object start; a key must follow
+OBJECT_START = re.compile(r'\{\s*"')
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """Remove commas that directly precede a closing bracket.
+    
+    Args:
+        text: JSON text
+    
+    Returns:
+        Text without trailing commas (string contents are left intact)
+    """
+    out = []
+    in_string = False
+    escape = False
+    
+    for ch in text:
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        
+        if ch == '"':
+            in_string = True
+        elif ch in '}]':
+            j = len(out) - 1
+            while j >= 0 and out[j].isspace():
+                j -= 1
+            if j >= 0 and out[j] == ',':
+                del out[j]
+        out.append(ch)
+    
+    return ''.join(out)
+
+
+def repair_json(text: str) -> dict:
+    """Parse a JSON object out of a possibly broken LLM response.
+    
+    Drops prose around the object, removes trailing commas and closes a
+    truncated object after its last complete element.
+    
+    Args:
+        text: Raw response text
+    
+    Returns:
+        Parsed dictionary
+    
+    Raises:
+        ValueError: If nothing parseable is found
+    """
+    match = OBJECT_START.search(text)
+    start = match.start() if match else text.find('{')
+    if start == -1:
+        raise ValueError("No JSON object in response")
+    
+    stack: List[str] = []
+    in_string = False
+    escape = False
+    end = None
+    # Last position where the text can be cut and closed safely. Cuts are
+    # only taken at the top level or inside a top-level container, so a
+    # half-written nested object is dropped rather than kept partially.
+    cut, cut_stack = start + 1, ['{']
+    
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        
+        if ch == '"':
+            in_string = True
+        elif ch in '{[':
+            stack.append(ch)
+        elif ch in '}]':
+            if stack:
+                stack.pop()
+            if not stack:
+                end = i + 1
+                break
+            if len(stack) <= 2:
+                cut, cut_stack = i + 1, list(stack)
+        elif ch == ',' and len(stack) <= 2:
+            cut, cut_stack = i, list(stack)
+    
+    if end is not None:
+        candidate = text[start:end]
+    else:
+        closing = ''.join('}' if bracket == '{' else ']' for bracket in reversed(cut_stack))
+        candidate = text[start:cut] + closing
+    
+    try:
+        data = json.loads(_strip_trailing_commas(candidate), strict=False)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Unrepairable JSON in response: {e}") from e
+    
+    if not isinstance(data, dict):
+        raise ValueError("JSON response is not an object")
+    return data
+
+
+class StreamingJSONParser:
+    """Incrementally parses the top-level fields of a streamed JSON object.
+    
+    Each field is reported as soon as its value closes, so callers can act
+    on the first fields while the rest of the response is still generating.
+    """
+    
+    def __init__(self, on_field: Optional[Callable[[str, Any], None]] = None):
+        self.on_field = on_field
+        self.buffer = ""
+        self.fields: Dict[str, Any] = {}
+        self.complete = False
+        
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = 0
+    
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk of the stream.
+        
+        Args:
+            chunk: Next piece of response text
+        
+        Returns:
+            Fields whose values closed within this chunk
+        """
+        self.buffer += chunk
+        closed = []
+        
+        while self._pos < len(self.buffer) and not self.complete:
+            i = self._pos
+            ch = self.buffer[i]
+            self._pos += 1
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            
+            # Prose before the object is skipped, braces in it included
+            if self._depth == 0:
+                if ch == '{':
+                    j = i + 1
+                    while j < len(self.buffer) and self.buffer[j].isspace():
+                        j += 1
+                    if j == len(self.buffer):
+                        # Wait for the next chunk to tell an object from prose
+                        self._pos = i
+                        break
+                    if self.buffer[j] == '"':
+                        self._depth = 1
+                        self._member_start = i + 1
+                continue
+            
+            if ch == '"':
+                self._in_string = True
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                if self._depth == 1:
+                    closed.extend(self._close_member(i))
+                    self.complete = True
+                self._depth -= 1
+            elif ch == ',' and self._depth == 1:
+                closed.extend(self._close_member(i))
+                self._member_start = i + 1
+        
+        return closed
+    
+    def finish(self) -> Dict[str, Any]:
+        """Finalize the stream, repairing a truncated or malformed tail.
+        
+        Returns:
+            All fields recovered from the response
+        """
+        # An object that closed without a single field was most likely prose
+        if not self.complete or not self.fields:
+            try:
+                repaired = repair_json(self.buffer)
+            except ValueError:
+                repaired = {}
+            for key, value in repaired.items():
+                if key not in self.fields:
+                    self._emit(key, value)
+        
+        return self.fields
+    
+    def _close_member(self, end: int) -> List[Tuple[str, Any]]:
+        member = self.buffer[self._member_start:end].strip()
+        if not member:
+            return []
+        
+        try:
+            data = json.loads('{' + _strip_trailing_commas(member) + '}', strict=False)
+        except json.JSONDecodeError:
+            return []
+        
+        closed = []
+        for key, value in data.items():
+            self._emit(key, value)
+            closed.append((key, value))
+        return closed
+    
+    def _emit(self, key: str, value: Any):
+        self.fields[key] = value
+        if self.on_field:
+            self.on_field(key, value)
@@ -1,24 +1,37 @@
 import json
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Iterator, Optional, Tuple, Union
 from models.schemas import Turn, InterviewLog, FinalFeedback, CandidateProfile
+from models.compact import CompactTurn
+from memory.turn_store import TurnStore
+from utils.archive import ARCHIVE_SUFFIX, ArchiveReader
 
 
 class InterviewLogger:
-    def __init__(self, filepath: str = "logs/interview_log.json"):
+    def __init__(self, filepath: str = "logs/interview_log.json", turn_store: TurnStore = None):
         self.filepath = Path(filepath)
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        # Turns live in the (possibly shared) store, not in self.log
+        self.turns = turn_store if turn_store is not None else TurnStore()
         self.log = InterviewLog(participant_name="", turns=[], final_feedback=None)
     
     def initialize(self, participant_name: str, candidate_profile: CandidateProfile):
         self.log.participant_name = participant_name
         self.log.candidate_profile = candidate_profile
-        self.log.turns = []
+        self.turns.clear()
         self.log.final_feedback = None
         self._save()
     
-    def add_turn(self, turn: Turn):
-        self.log.turns.append(turn)
+    def restore(self, participant_name: str, candidate_profile: CandidateProfile,
+                final_feedback: Optional[FinalFeedback] = None):
+        self.log.participant_name = participant_name
+        self.log.candidate_profile = candidate_profile
+        self.log.final_feedback = final_feedback
+        self._save()
+    
+    def add_turn(self, turn: Union[Turn, CompactTurn]):
+        self.turns.append(turn)
         self._save()
     
     def set_final_feedback(self, feedback: FinalFeedback):
@@ -26,15 +39,112 @@ class InterviewLogger:
         self._save()
     
     def _save(self):
+        # Same layout as json.dump(indent=2), but turns are streamed one at a time
+        log_dict = self.log.model_dump(mode='json', exclude={'turns'})
         with open(self.filepath, 'w', encoding='utf-8') as f:
-            log_dict = self.log.model_dump(mode='json')
-            json.dump(log_dict, f, indent=2, ensure_ascii=False)
+            f.write('{')
+            for i, key in enumerate(InterviewLog.model_fields):
+                f.write(',\n' if i else '\n')
+                f.write(f'  {json.dumps(key)}: ')
+                if key != 'turns':
+                    f.write(self._indent(log_dict[key], '  '))
+                    continue
+                if not self.turns:
+                    f.write('[]')
+                    continue
+                f.write('[')
+                for j, turn in enumerate(self.turns):
+                    f.write(',\n    ' if j else '\n    ')
+                    f.write(self._indent(turn.to_model().model_dump(mode='json'), '    '))
+                f.write('\n  ]')
+            f.write('\n}')
+    
+    @staticmethod
+    def _indent(value, prefix: str) -> str:
+        return json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n' + prefix)
     
     def get_log(self) -> InterviewLog:
-        return self.log
+        """Materialise the full log, including spilled turns.
+        
+        Returns:
+            InterviewLog
+        """
+        return self.log.model_copy(update={'turns': [turn.to_model() for turn in self.turns]})
     
     @classmethod
-    def load_log(cls, filepath: str) -> InterviewLog:
+    def load_log(cls, filepath: str, session: str = None) -> InterviewLog:
+        """Read a JSON log, or one session of an archive.
+        
+        Args:
+            filepath: JSON log or archive path
+            session: Session name within the archive
+        
+        Returns:
+            InterviewLog
+        """
+        if session is not None:
+            return ArchiveReader(filepath).load(session)
         with open(filepath, 'r', encoding='utf-8') as f:
             data = json.load(f)
             return InterviewLog(**data)
+    
+    @classmethod
+    def iter_turns(cls, filepath: str, session: str = None) -> Iterator[Turn]:
+        """Stream the turns of a log.
+        
+        An archived session is inflated chunk by chunk as its turns are
+        consumed, and only its own frame is read; a JSON log is parsed whole.
+        
+        Args:
+            filepath: JSON log or archive path
+            session: Session name within the archive
+        
+        Yields:
+            Turn objects in order
+        """
+        if session is not None:
+            yield from ArchiveReader(filepath).iter_turns(session)
+        else:
+            yield from cls.load_log(filepath).turns
+    
+    @classmethod
+    def iter_sessions(cls, directory: str, stream: bool = False) -> Iterator[Tuple[str, Callable[[], Any]]]:
+        """Logged sessions under a directory, opened lazily.
+        
+        JSON logs come first, then archived sessions. --migrate-logs keeps
+        the originals unless --remove is given, so a session present both as
+        a JSON log and in an archive is listed once, from the log.
+        
+        Args:
+            directory: Directory searched recursively for *.json logs and archives
+            stream: Openers return (log without its turns, iterator over the turns)
+                instead of the whole InterviewLog; archived turns are then
+                inflated as they are consumed
+        
+        Yields:
+            (session key, function opening the session; it raises ValueError
+            or OSError if the session cannot be read)
+        """
+        root = Path(directory)
+        log_names = set()
+        for path in sorted(root.rglob('*.json')):
+            log_names.add(path.stem)
+            yield str(path), partial(cls._open_json if stream else cls.load_log, str(path))
+        for path in sorted(root.rglob(f'*{ARCHIVE_SUFFIX}')):
+            try:
+                reader = ArchiveReader(str(path))
+            except ValueError as e:
+                yield str(path), partial(_raise, e)
+                continue
+            for name in reader.names():
+                if name not in log_names:
+                    yield f"{path}#{name}", partial(reader.stream if stream else reader.load, name)
+    
+    @classmethod
+    def _open_json(cls, filepath: str) -> Tuple[InterviewLog, Iterator[Turn]]:
+        log = cls.load_log(filepath)
+        return log, iter(log.turns)
+
+
+def _raise(error: Exception):
+    raise error
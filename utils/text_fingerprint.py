@@ -0,0 +1,92 @@
+"""Text normalisation and similarity fingerprints for questions and answers."""
+
+import hashlib
+import re
+from typing import List
+
+
+STOPWORDS = {
+    # Russian
+    'а', 'в', 'во', 'и', 'или', 'к', 'как', 'какие', 'какой', 'какая', 'каким', 'ли', 'на', 'не',
+    'но', 'о', 'об', 'от', 'по', 'при', 'с', 'со', 'у', 'что', 'чем', 'это', 'этот', 'эта', 'эти',
+    'для', 'из', 'за', 'до', 'же', 'бы', 'то', 'так', 'также', 'вы', 'вам', 'вас', 'ваш', 'ты',
+    'можете', 'можешь', 'расскажите', 'расскажи', 'объясните', 'объясни', 'опишите', 'скажите',
+    'пожалуйста', 'давайте', 'теперь', 'хорошо', 'отлично', 'спасибо', 'его', 'ее', 'их', 'он', 'она',
+    # English
+    'a', 'an', 'the', 'and', 'or', 'of', 'in', 'on', 'to', 'is', 'are', 'what', 'how', 'why',
+    'for', 'with', 'by', 'be', 'it', 'this', 'that', 'you', 'your', 'can', 'do', 'does'
+}
+
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# Crude stemming: word forms in Russian mostly differ in their endings
+STEM_LENGTH = 4
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase, tokenize, drop stopwords and stem.
+    
+    Args:
+        text: Question or answer text
+    
+    Returns:
+        List of normalised tokens
+    """
+    return [
+        token[:STEM_LENGTH]
+        for token in WORD_PATTERN.findall(text.lower())
+        if token not in STOPWORDS and not token.isdigit()
+    ]
+
+
+def stable_hash(feature: str) -> int:
+    """64-bit hash that is stable across processes (unlike hash()).
+    
+    Args:
+        feature: Feature string
+    
+    Returns:
+        Unsigned 64-bit integer
+    """
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(tokens: List[str], bits: int = 64) -> int:
+    """Compute the SimHash of a token list over unigrams and bigrams.
+    
+    Args:
+        tokens: Normalised tokens
+        bits: Fingerprint width
+    
+    Returns:
+        Unsigned fingerprint; near-duplicate texts differ in few bits
+    """
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    weights = [0] * bits
+    
+    for feature in features:
+        h = stable_hash(feature)
+        for i in range(bits):
+            weights[i] += 1 if (h >> i) & 1 else -1
+    
+    fingerprint = 0
+    for i, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << i
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def question_fingerprint(question: str) -> int:
+    """Fingerprint a question for near-duplicate lookup.
+    
+    Args:
+        question: Question text
+    
+    Returns:
+        64-bit SimHash of the normalised question
+    """
+    return simhash(normalize_tokens(question))